@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Resource blocking benchmark - engelleme profillerine göre aktarılan byte ve sayfa hazır olma süresi
+
+Kullanım:
+    python benchmarks/bench_resource_blocking.py [--url URL] [--repeat 3] [--output sonuc.json]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.selenium_manager import SeleniumManager, BLOCK_PRESETS  # noqa: E402
+
+DEFAULT_URL = "https://akademik.yok.gov.tr/AkademikArama/"
+
+
+async def measure_preset(manager: SeleniumManager, preset: str, url: str, repeat: int) -> dict:
+    """Bir profil için sayfayı tekrar tekrar yükleyip ölç"""
+    driver = await manager.get_driver(block_preset=preset)
+    bytes_samples = []
+    ready_samples = []
+    request_samples = []
+    try:
+        for _ in range(repeat):
+            # Önbellek ölçümü bozmasın
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            manager.clear_network_requests(driver)
+
+            started = time.perf_counter()
+            driver.get(url)
+            while driver.execute_script("return document.readyState") != "complete":
+                await asyncio.sleep(0.05)
+            ready_samples.append(time.perf_counter() - started)
+
+            requests = manager.get_network_requests(driver)
+            bytes_samples.append(sum(request.encoded_length for request in requests))
+            request_samples.append(len(requests))
+    finally:
+        await manager.close_driver(driver)
+
+    return {
+        "preset": preset,
+        "blocked_patterns": len(manager.get_blocked_urls(preset)),
+        "bytes_transferred_median": statistics.median(bytes_samples),
+        "requests_median": statistics.median(request_samples),
+        "page_ready_seconds_median": round(statistics.median(ready_samples), 3),
+        "page_ready_seconds_samples": [round(value, 3) for value in ready_samples],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Engelleme profili benchmark'ı")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Ölçülecek sayfa")
+    parser.add_argument("--repeat", type=int, default=3, help="Profil başına tekrar sayısı")
+    parser.add_argument("--presets", default=",".join(BLOCK_PRESETS), help="Virgülle ayrılmış profil listesi")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    manager = SeleniumManager()
+    results = []
+    for preset in [p.strip() for p in args.presets.split(",") if p.strip()]:
+        result = await measure_preset(manager, preset, args.url, args.repeat)
+        results.append(result)
+        print(f"{preset:>15}: {result['bytes_transferred_median']:>10} byte, "
+              f"{result['page_ready_seconds_median']:.3f} s, {result['requests_median']} istek")
+
+    report = {"url": args.url, "repeat": args.repeat, "results": results}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
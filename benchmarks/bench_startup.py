@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark - MCP server'ın soğuk açılış süresi
+
+Ölçülen değerler:
+- import: `import server` süresi (ayrı süreçte)
+- initialize: süreç başlatmadan initialize yanıtına kadar geçen süre
+- tools_list: süreç başlatmadan ilk tools/list yanıtına kadar geçen süre
+
+Kullanım:
+    python benchmarks/bench_startup.py [--repeat 10] [--output sonuc.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+SRC_DIR = REPO_DIR / "src"
+
+IMPORT_SNIPPET = "import time; started = time.perf_counter(); import server; print(time.perf_counter() - started)"
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(SRC_DIR)
+    # Pre-warm ölçümü bozmasın
+    env.pop("YOK_PREWARM_DRIVER", None)
+    return env
+
+
+def _send(process: subprocess.Popen, message: dict):
+    process.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+    process.stdin.flush()
+
+
+def _read_response(process: subprocess.Popen, request_id: int) -> dict:
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("Server yanıt vermeden kapandı")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def measure_import() -> float:
+    """Ayrı bir süreçte import server süresini ölç"""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=REPO_DIR, env=_env(),
+        capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_handshake() -> dict:
+    """Server'ı stdio ile başlatıp initialize ve tools/list sürelerini ölç"""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(SRC_DIR / "server.py")], cwd=REPO_DIR, env=_env(),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    try:
+        _send(process, {
+            "jsonrpc": "2.0", "id": 1, "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "bench-startup", "version": "1.0"}
+            }
+        })
+        _read_response(process, 1)
+        initialized = time.perf_counter() - started
+
+        _send(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        _send(process, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools = _read_response(process, 2)["result"]["tools"]
+        tools_listed = time.perf_counter() - started
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    return {"initialize": initialized, "tools_list": tools_listed, "tool_count": len(tools)}
+
+
+def _summary(samples: list) -> dict:
+    return {
+        "min": round(min(samples), 4),
+        "p50": round(statistics.median(samples), 4),
+        "max": round(max(samples), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP server açılış benchmark'ı")
+    parser.add_argument("--repeat", type=int, default=10, help="Tekrar sayısı")
+    parser.add_argument("--output", help="JSON rapor yolu (varsayılan: benchmarks/results/startup_<zaman>.json)")
+    args = parser.parse_args()
+
+    imports, initializes, tool_lists = [], [], []
+    tool_count = 0
+    for _ in range(args.repeat):
+        imports.append(measure_import())
+        handshake = measure_handshake()
+        initializes.append(handshake["initialize"])
+        tool_lists.append(handshake["tools_list"])
+        tool_count = handshake["tool_count"]
+
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "repeat": args.repeat,
+        "tool_count": tool_count,
+        "import_seconds": _summary(imports),
+        "initialize_seconds": _summary(initializes),
+        "tools_list_seconds": _summary(tool_lists),
+    }
+
+    output = Path(args.output) if args.output else BENCH_DIR / "results" / f"startup_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
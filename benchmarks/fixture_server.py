@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+YÖK fixture server - kayıtlı arama, sayfalama, profil ve işbirlikçi grafiği sayfalarını yerelde sunar
+
+Sayfalar fixtures/ altındaki şablonlardan deterministik olarak üretilir, böylece
+scraper'lar internete çıkmadan uçtan uca çalıştırılıp ölçülebilir.
+
+Kullanım:
+    python benchmarks/fixture_server.py --port 8765 --pages 5 --page-size 20
+"""
+
+import argparse
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from string import Template
+from urllib.parse import urlparse, parse_qs, quote
+from html import escape
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+TITLES = ["PROFESÖR", "DOÇENT", "DOKTOR ÖĞRETİM ÜYESİ", "ARAŞTIRMA GÖREVLİSİ"]
+UNIVERSITIES = ["ORTA DOĞU TEKNİK ÜNİVERSİTESİ", "HACETTEPE ÜNİVERSİTESİ", "EGE ÜNİVERSİTESİ", "İSTANBUL TEKNİK ÜNİVERSİTESİ"]
+SPECIALTIES = ["Bilgisayar Bilimleri ve Mühendisliği", "Yapay Zeka", "Yazılım Mühendisliği", "Veri Bilimi"]
+KEYWORDS = ["Makine Öğrenmesi", "Derin Öğrenme", "Doğal Dil İşleme", "Veri Madenciliği", "Bilgisayarlı Görü", "Optimizasyon"]
+
+
+def _load(name: str) -> Template:
+    return Template((FIXTURES_DIR / name).read_text(encoding="utf-8"))
+
+
+class FixtureCatalog:
+    """Sıra numarasına göre deterministik akademisyen verisi üretir"""
+
+    def __init__(self, pages: int = 5, page_size: int = 20, collaborators: int = 15):
+        self.pages = pages
+        self.page_size = page_size
+        self.collaborators = collaborators
+        self.templates = {name: _load(f"{name}.html") for name in ("search", "search_tabs", "results", "row", "profile", "graph")}
+
+    def person(self, sira: int) -> dict:
+        return {
+            "sira": sira,
+            "title": TITLES[sira % len(TITLES)],
+            "name": f"AKADEMİSYEN {sira:05d}",
+            "university": UNIVERSITIES[sira % len(UNIVERSITIES)],
+            "field": "Mühendislik Temel Alanı",
+            "specialty": SPECIALTIES[sira % len(SPECIALTIES)],
+            "keywords": " ; ".join(KEYWORDS[(sira + offset) % len(KEYWORDS)] for offset in range(3)),
+        }
+
+    def search_page(self) -> str:
+        return self.templates["search"].substitute()
+
+    def tabs_page(self, query: str) -> str:
+        return self.templates["search_tabs"].substitute(query=escape(quote(query)))
+
+    def results_page(self, query: str, page: int) -> str:
+        first = (page - 1) * self.page_size + 1
+        rows = "".join(
+            self.templates["row"].substitute(self.person(sira))
+            for sira in range(first, first + self.page_size)
+        )
+        items = []
+        for number in range(1, self.pages + 1):
+            css = ' class="active"' if number == page else ""
+            href = f"/AkademikArama/AkademisyenArama?aramaTerim={escape(quote(query))}&amp;page={number}"
+            items.append(f'  <li{css}><a href="{href}">{number}</a></li>')
+        return self.templates["results"].substitute(rows=rows, pagination="\n".join(items))
+
+    def profile_page(self, sira: int) -> str:
+        return self.templates["profile"].substitute(self.person(sira))
+
+    def graph_page(self, sira: int) -> str:
+        profile_url = f"/AkademikArama/AkademisyenGorevOgrenimBilgileri?sira={sira}"
+        nodes = [{"name": self.person(sira)["name"], "url": profile_url}]
+        links = []
+        for offset in range(1, self.collaborators + 1):
+            other = 100000 + sira * 100 + offset
+            nodes.append({
+                "name": self.person(other)["name"],
+                "url": f"/AkademikArama/AkademisyenGorevOgrenimBilgileri?sira={other}"
+            })
+            links.append({"source": 0, "target": offset, "value": offset % 4 + 1})
+        graph = json.dumps({"nodes": nodes, "links": links}, ensure_ascii=False)
+        return self.templates["graph"].substitute(graph=graph)
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Fixture sayfalarını sunan HTTP handler"""
+
+    server_version = "YokFixture/1.0"
+
+    def log_message(self, format, *args):
+        # Benchmark çıktısını kirletmesin
+        pass
+
+    def _send(self, body: str, status: int = 200, headers: dict = None):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.bytes_served += len(payload)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        catalog: FixtureCatalog = self.server.catalog
+        path = parsed.path.rstrip("/")
+
+        if path == "/AkademikArama":
+            kind, body, headers = "search", catalog.search_page(), None
+        elif path == "/AkademikArama/AramaSonuc":
+            kind, body, headers = "tabs", catalog.tabs_page(query.get("aramaTerim", "")), None
+        elif path == "/AkademikArama/AkademisyenArama":
+            page = int(query.get("page", "1"))
+            if not 1 <= page <= catalog.pages:
+                return self._send("<html><body></body></html>", 404)
+            kind, body, headers = "results", catalog.results_page(query.get("aramaTerim", ""), page), None
+        elif path == "/AkademikArama/AkademisyenGorevOgrenimBilgileri":
+            sira = int(query.get("sira", "0"))
+            # Grafik sayfası, gerçek sitedeki gibi son görüntülenen profili oturumdan okur
+            kind, body, headers = "profile", catalog.profile_page(sira), {"Set-Cookie": f"author={sira}; Path=/"}
+        elif path == "/AkademikArama/viewAuthorGraphs.jsp":
+            cookies = dict(
+                part.strip().split("=", 1) for part in self.headers.get("Cookie", "").split(";") if "=" in part
+            )
+            kind, body, headers = "graph", catalog.graph_page(int(cookies.get("author", "0"))), None
+        else:
+            return self._send("<html><body>Not found</body></html>", 404)
+
+        self.server.hits[kind] += 1
+        self._send(body, headers=headers)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """İstek sayaçlarını tutan fixture HTTP sunucusu"""
+
+    daemon_threads = True
+
+    def __init__(self, address, catalog: FixtureCatalog):
+        super().__init__(address, FixtureRequestHandler)
+        self.catalog = catalog
+        self.hits = Counter()
+        self.bytes_served = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+
+def start_fixture_server(host: str = "127.0.0.1", port: int = 0, **catalog_options) -> FixtureServer:
+    """Sunucuyu arka plan thread'inde başlat (port=0 boş port seçer)"""
+    server = FixtureServer((host, port), FixtureCatalog(**catalog_options))
+    threading.Thread(target=server.serve_forever, name="yok-fixture-server", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="YÖK fixture server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--collaborators", type=int, default=15)
+    args = parser.parse_args()
+
+    server = FixtureServer((args.host, args.port), FixtureCatalog(args.pages, args.page_size, args.collaborators))
+    print(f"Fixture server: {server.base_url}")
+    server.serve_forever()
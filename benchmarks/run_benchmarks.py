@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Offline scraper benchmark - ProfileScraperTool ve CollaboratorScraperTool'u yerel fixture server'a karşı ölçer
+
+Raporlanan değerler: profil/sn, sayfa/sn, sorgu başına p50/p95 gecikme, yazılan
+byte ve tepe RSS (Python + Chrome). Sonuçlar karşılaştırma için JSON'a yazılır.
+
+Kullanım:
+    python benchmarks/run_benchmarks.py --queries 3 --pages 5 --page-size 20 --collaborator-profiles 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from fixture_server import start_fixture_server  # noqa: E402
+from models.schemas import SearchRequest  # noqa: E402
+from tools.profile_scraper import ProfileScraperTool  # noqa: E402
+from tools.collaborator_scraper import CollaboratorScraperTool  # noqa: E402
+from utils.file_manager import FileManager  # noqa: E402
+
+
+def _read_proc(path: str) -> str:
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def _children(pid: int) -> list:
+    """/proc üzerinden bir sürecin tüm alt süreçlerini bul"""
+    result = []
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        for task in Path(f"/proc/{current}/task").glob("*"):
+            for child in _read_proc(f"{task}/children").split():
+                result.append(int(child))
+                pending.append(int(child))
+    return result
+
+
+# Tarayıcı süreçleri; diğer alt süreçler (ör. subprocess çağrıları) sayılmaz
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "chromedriver", "headless_shell")
+
+
+def _is_browser(pid: int) -> bool:
+    name = _read_proc(f"/proc/{pid}/comm").strip().lower()
+    return any(browser in name for browser in BROWSER_PROCESS_NAMES)
+
+
+def _rss_bytes(pid: int) -> int:
+    for line in _read_proc(f"/proc/{pid}/status").splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) * 1024
+    return 0
+
+
+def _bytes_written() -> int:
+    """Sürecin write() ile yazdığı toplam byte (Linux /proc/self/io wchar)"""
+    for line in _read_proc("/proc/self/io").splitlines():
+        if line.startswith("wchar:"):
+            return int(line.split()[1])
+    return 0
+
+
+class RssSampler:
+    """Python ve tarayıcı alt süreçlerinin (chromedriver/Chrome) tepe RSS'ini örnekler"""
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self.peak_children_rss = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _run(self):
+        pid = os.getpid()
+        while not self._stop.is_set():
+            children_rss = sum(_rss_bytes(child) for child in _children(pid) if _is_browser(child))
+            self.peak_children_rss = max(self.peak_children_rss, children_rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def peak_python_rss(self) -> int:
+        # Linux'ta ru_maxrss KB cinsindendir
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _percentile(values: list, percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+async def run(args) -> dict:
+    server = start_fixture_server(pages=args.pages, page_size=args.page_size, collaborators=args.collaborators)
+    data_dir = Path(tempfile.mkdtemp(prefix="yok_bench_"))
+    file_manager = FileManager(str(data_dir))
+    profile_scraper = ProfileScraperTool(file_manager=file_manager, base_url=server.base_url)
+    collaborator_scraper = CollaboratorScraperTool(file_manager=file_manager)
+
+    query_latencies = []
+    collaborator_latencies = []
+    total_profiles = 0
+    total_collaborators = 0
+    written_before = _bytes_written()
+
+    with RssSampler() as sampler:
+        search_started = time.perf_counter()
+        session_ids = []
+        for index in range(args.queries):
+            session_id = profile_scraper._generate_session_id()
+            request = SearchRequest(name=f"akademisyen {index}", max_results=args.max_results)
+            started = time.perf_counter()
+            await profile_scraper._async_scrape_profiles(request, session_id, None, [])
+            query_latencies.append(time.perf_counter() - started)
+            data = await file_manager.load_session_data(session_id, "profiles") or {}
+            total_profiles += len(data.get("profiles", []))
+            session_ids.append(session_id)
+        search_elapsed = time.perf_counter() - search_started
+        result_pages = server.hits["results"]
+
+        collab_started = time.perf_counter()
+        for session_id in session_ids[:1]:
+            for profile_id in range(1, args.collaborator_profiles + 1):
+                started = time.perf_counter()
+                result = await collaborator_scraper.get_collaborators(
+                    session_id=session_id, profile_id=profile_id, wait=True
+                )
+                collaborator_latencies.append(time.perf_counter() - started)
+                total_collaborators += result.get("total_count", 0)
+        collab_elapsed = time.perf_counter() - collab_started
+
+    server.shutdown()
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "host": {"python": platform.python_version(), "platform": platform.platform()},
+        "parameters": vars(args),
+        "search": {
+            "queries": args.queries,
+            "profiles": total_profiles,
+            "result_pages": result_pages,
+            "elapsed_seconds": round(search_elapsed, 3),
+            "profiles_per_second": round(total_profiles / search_elapsed, 3) if search_elapsed else 0,
+            "pages_per_second": round(result_pages / search_elapsed, 3) if search_elapsed else 0,
+            "latency_p50_seconds": round(statistics.median(query_latencies), 3) if query_latencies else 0,
+            "latency_p95_seconds": round(_percentile(query_latencies, 95), 3),
+        },
+        "collaborators": {
+            "profiles": len(collaborator_latencies),
+            "collaborators": total_collaborators,
+            "elapsed_seconds": round(collab_elapsed, 3),
+            "collaborators_per_second": round(total_collaborators / collab_elapsed, 3) if collab_elapsed else 0,
+            "latency_p50_seconds": round(statistics.median(collaborator_latencies), 3) if collaborator_latencies else 0,
+            "latency_p95_seconds": round(_percentile(collaborator_latencies, 95), 3),
+        },
+        "io": {
+            "bytes_written": _bytes_written() - written_before,
+            "session_bytes_on_disk": _dir_size(data_dir),
+            "bytes_served": server.bytes_served,
+        },
+        "memory": {
+            "peak_python_rss_bytes": sampler.peak_python_rss,
+            "peak_chrome_rss_bytes": sampler.peak_children_rss,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline YÖK scraper benchmark")
+    parser.add_argument("--queries", type=int, default=3, help="Arama sorgusu sayısı")
+    parser.add_argument("--pages", type=int, default=5, help="Sorgu başına sonuç sayfası")
+    parser.add_argument("--page-size", type=int, default=20, help="Sayfa başına profil")
+    parser.add_argument("--max-results", type=int, default=1000, help="SearchRequest.max_results")
+    parser.add_argument("--collaborators", type=int, default=15, help="Profil başına işbirlikçi")
+    parser.add_argument("--collaborator-profiles", type=int, default=2, help="İşbirlikçisi çekilecek profil sayısı")
+    parser.add_argument("--output", help="JSON rapor yolu (varsayılan: benchmarks/results/<zaman>.json)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if not report["search"]["profiles"] or not report["search"]["result_pages"]:
+        # Chrome açılamadıysa scrape sessizce boş döner; sıfırlı rapor yanıltıcı olur
+        sys.exit("Benchmark geçersiz: hiç profil/sonuç sayfası çekilmedi (Chrome/chromedriver çalışıyor mu?)")
+    output = Path(args.output) if args.output else BENCH_DIR / "results" / f"{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(json.dumps({key: report[key] for key in ("search", "collaborators", "io", "memory")}, indent=2))
+    print(f"Rapor: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,7 @@ class Collaborator(BaseModel):
     deleted: bool
     url: str
     email: str
+    weight: Optional[float] = None
 
 class SearchRequest(BaseModel):
     name: str
@@ -45,11 +46,16 @@ class SearchRequest(BaseModel):
     specialty_ids: Optional[str] = None
     email: Optional[str] = None
     max_results: int = 100
+    profile: Optional[str] = None
+    deadline_seconds: Optional[float] = None
 
 class CollaboratorRequest(BaseModel):
     session_id: str
     profile_id: Optional[int] = None
     profile_url: Optional[str] = None
+    profile: Optional[str] = None
+    wait: bool = False
+    deadline_seconds: Optional[float] = None
 
 class SessionStatus(str, Enum):
     PENDING = "pending"
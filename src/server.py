@@ -1,7 +1,11 @@
+import argparse
 import asyncio
 import json
 import logging
-from typing import Any, Sequence, Dict
+import os
+import threading
+from datetime import datetime
+from typing import Any, Sequence, Dict, Optional
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 
@@ -14,28 +18,216 @@ class NotificationOptions:
 from mcp.server.stdio import stdio_server
 from mcp.types import (
     Resource,
+    ResourceTemplate,
     Tool,
     TextContent,
     ImageContent,
     EmbeddedResource,
+    InitializedNotification,
 )
 
-from tools.profile_scraper import ProfileScraperTool
-from tools.collaborator_scraper import CollaboratorScraperTool
-
-
-# Logging konfigürasyonu
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+from utils.metrics import metrics, start_metrics_server
+from utils.memory_monitor import memory_monitor
+from utils.logging_setup import setup_logging
+from utils.client_registry import session_ownership, LOCAL_CLIENT, WATCHLIST_CLIENT
+from utils.cancellation import session_tasks
+from utils.response import dumps, shape_response
+from utils.subscriptions import (
+    SESSION_RESOURCE_KINDS,
+    resource_subscriptions,
+    session_resource_uri,
+    parse_session_resource_uri,
 )
 
 # Server instance
 server = Server("yok-akademik-scraper")
 
-# Tool instances
-profile_scraper = ProfileScraperTool()
-collaborator_scraper = CollaboratorScraperTool()
+# Tool instance'ları ilk kullanımda oluşturulur: Selenium importu ve dizin
+# oluşturma list_tools cevabını geciktirmesin
+_file_manager = None
+_profile_scraper = None
+_collaborator_scraper = None
+_similarity_index = None
+_coauthor_graph = None
+_profile_refresher = None
+_collaborator_prefetcher = None
+_watchlist_runner = None
+_collaborator_batch = None
+_driver_pool = None
+_tools_lock = threading.Lock()
+_background_tasks = set()
+
+def get_file_manager():
+    """Paylaşılan FileManager'ı döndür"""
+    global _file_manager
+    with _tools_lock:
+        if _file_manager is None:
+            from utils.file_manager import FileManager
+            _file_manager = FileManager()
+            _file_manager.add_save_listener(handle_session_saved)
+        return _file_manager
+
+def get_driver_pool():
+    """Araçların ortak kullandığı boşta driver havuzunu döndür"""
+    global _driver_pool
+    with _tools_lock:
+        if _driver_pool is None:
+            from utils.selenium_manager import DriverPool
+            _driver_pool = DriverPool()
+        return _driver_pool
+
+def get_profile_scraper():
+    """ProfileScraperTool'u döndür (ilk çağrıda oluşturur)"""
+    global _profile_scraper
+    file_manager = get_file_manager()
+    pool = get_driver_pool()
+    with _tools_lock:
+        if _profile_scraper is None:
+            from tools.profile_scraper import ProfileScraperTool
+            from utils.selenium_manager import SeleniumManager
+            _profile_scraper = ProfileScraperTool(
+                selenium_manager=SeleniumManager(block_preset="search-minimal", pool=pool),
+                file_manager=file_manager
+            )
+        return _profile_scraper
+
+def get_collaborator_scraper():
+    """CollaboratorScraperTool'u döndür (ilk çağrıda oluşturur)"""
+    global _collaborator_scraper
+    file_manager = get_file_manager()
+    pool = get_driver_pool()
+    with _tools_lock:
+        if _collaborator_scraper is None:
+            from tools.collaborator_scraper import CollaboratorScraperTool
+            from utils.selenium_manager import SeleniumManager
+            _collaborator_scraper = CollaboratorScraperTool(
+                selenium_manager=SeleniumManager(block_preset="graph", pool=pool),
+                file_manager=file_manager
+            )
+        return _collaborator_scraper
+
+def get_collaborator_prefetcher():
+    """İşbirlikçi önceden çekme politikasını döndür (ilk çağrıda oluşturur)"""
+    global _collaborator_prefetcher
+    collaborator_scraper = get_collaborator_scraper()
+    with _tools_lock:
+        if _collaborator_prefetcher is None:
+            from tools.collaborator_prefetcher import CollaboratorPrefetcher
+            _collaborator_prefetcher = CollaboratorPrefetcher(collaborator_scraper)
+        return _collaborator_prefetcher
+
+def get_collaborator_batch():
+    """Toplu işbirlikçi tool'unu döndür (ilk çağrıda oluşturur)"""
+    global _collaborator_batch
+    collaborator_scraper = get_collaborator_scraper()
+    with _tools_lock:
+        if _collaborator_batch is None:
+            from tools.collaborator_batch import CollaboratorBatchTool
+            _collaborator_batch = CollaboratorBatchTool(collaborator_scraper)
+        return _collaborator_batch
+
+def get_profile_refresher():
+    """ProfileRefreshTool'u döndür (ilk çağrıda oluşturur)"""
+    global _profile_refresher
+    file_manager = get_file_manager()
+    with _tools_lock:
+        if _profile_refresher is None:
+            from tools.profile_refresher import ProfileRefreshTool
+            _profile_refresher = ProfileRefreshTool(file_manager=file_manager)
+        return _profile_refresher
+
+def get_watchlist_runner():
+    """Watchlist zamanlayıcısını döndür (ilk çağrıda oluşturur; scraper'lar ilk çalıştırmada açılır)"""
+    global _watchlist_runner
+    file_manager = get_file_manager()
+    profile_refresher = get_profile_refresher()
+    with _tools_lock:
+        if _watchlist_runner is None:
+            from tools.watchlist_runner import WatchlistRunner
+            _watchlist_runner = WatchlistRunner(
+                file_manager, profile_refresher, get_profile_scraper, get_collaborator_scraper
+            )
+        return _watchlist_runner
+
+def get_similarity_index():
+    """Benzerlik indeksini döndür (ilk çağrıda oluşturur)"""
+    global _similarity_index
+    file_manager = get_file_manager()
+    with _tools_lock:
+        if _similarity_index is None:
+            from utils.similarity import SimilarityIndex
+            _similarity_index = SimilarityIndex(file_manager.sessions_path)
+        return _similarity_index
+
+def get_coauthor_graph():
+    """Ortak yazarlık ağını döndür (ilk çağrıda oluşturur)"""
+    global _coauthor_graph
+    file_manager = get_file_manager()
+    with _tools_lock:
+        if _coauthor_graph is None:
+            from utils.coauthor_graph import CoauthorGraph
+            _coauthor_graph = CoauthorGraph(file_manager.sessions_path)
+        return _coauthor_graph
+
+def handle_session_saved(session_id: str, kind: str):
+    """Session verisi yazılınca resource abonelerini bilgilendir, indeksleri kirlet"""
+    if kind == "deleted":
+        if _similarity_index is not None:
+            _similarity_index.mark_dirty(session_id)
+        if _coauthor_graph is not None:
+            _coauthor_graph.mark_dirty(session_id)
+        return
+    # Watchlist'in geçici arama session'ları indekslere, aboneliklere ve önceden çekmeye girmez
+    if session_ownership.owner(session_id) == WATCHLIST_CLIENT:
+        return
+    resource_subscriptions.notify_soon(session_resource_uri(session_id, kind))
+    if kind == "profiles" and _similarity_index is not None:
+        _similarity_index.mark_dirty(session_id)
+    if kind == "profiles" and os.getenv("YOK_PREFETCH_TOP_K", "0") not in ("", "0"):
+        get_collaborator_prefetcher().on_profiles_saved(session_id)
+    if kind in ("collaborators", "collaborators_batch") and _coauthor_graph is not None:
+        _coauthor_graph.mark_dirty(session_id)
+
+async def prewarm():
+    """Tool'ları, watchlist zamanlayıcısını ve istenirse (YOK_PREWARM_DRIVER=1) bir Chrome driver'ı arka planda hazırla"""
+    try:
+        await asyncio.to_thread(get_profile_scraper)
+        await asyncio.to_thread(get_collaborator_scraper)
+        # Zamanı gelen watchlist'ler sunucunun kendi zamanlayıcısıyla çalışır
+        (await asyncio.to_thread(get_watchlist_runner)).start()
+        if os.getenv("YOK_PREWARM_DRIVER", "").lower() in ("1", "true", "yes"):
+            await get_profile_scraper().selenium_manager.prewarm(1)
+    except Exception as e:
+        logging.warning(f"Ön hazırlık başarısız: {e}")
+
+async def handle_initialized(notification: InitializedNotification):
+    """Handshake tamamlanınca ön hazırlığı başlat"""
+    task = asyncio.create_task(prewarm())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+server.notification_handlers[InitializedNotification] = handle_initialized
+
+FIELDS_RESOURCE_URI = "yok://taxonomy/fields"
+
+# Kayıt döndüren tool'ların ortak argümanları
+FIELDS_PROPERTY = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": "Kayıtlarda döndürülecek alanlar (örn. [\"name\", \"email\"]); verilmezse ham info metni hariç tümü",
+    "optional": True
+}
+CURSOR_PROPERTY = {
+    "type": "integer",
+    "description": "Kısaltılmış cevabın next_cursor değeri; kayıtlar bu sıradan devam eder",
+    "optional": True
+}
+
+def text_response(result: Any, arguments: Optional[dict] = None, offset: int = 0) -> list[TextContent]:
+    """Sonucu alan seçimi ve boyut sınırı uygulanmış kompakt JSON olarak döndür"""
+    if isinstance(result, dict):
+        result = shape_response(result, (arguments or {}).get("fields"), offset)
+    return [TextContent(type="text", text=dumps(result))]
 
 @server.list_tools()
 async def handle_list_tools() -> list[Tool]:
@@ -44,7 +236,7 @@ async def handle_list_tools() -> list[Tool]:
 
         Tool(
             name="quick_search",
-            description="⚡ HIZLI ARAMA: Akademisyen arama yapar ve ilk 10 profili hemen gösterir (30 saniye)",
+            description="⚡ HIZLI ARAMA: Akademisyen arama yapar, ilk profiller gelir gelmez (varsayılan 10) önizleme döndürür; arama arka planda sürer",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -72,14 +264,35 @@ async def handle_list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "Email filtreleme",
                         "optional": True
-                    }
+                    },
+                    "profile": {
+                        "type": "string",
+                        "description": "Profil kaydı: cprofile (.pstats) veya sampling (speedscope JSON), session klasörüne yazılır",
+                        "optional": True
+                    },
+                    "deadline_seconds": {
+                        "type": "number",
+                        "description": "İşin süre sınırı (saniye); dolunca o ana kadarki sonuç \"cancelled\" olarak kaydedilir",
+                        "optional": True
+                    },
+                    "min_profiles": {
+                        "type": "integer",
+                        "description": "Bu kadar profil gelince (veya arama bitince) hemen dön (varsayılan YOK_QUICK_SEARCH_MIN_PROFILES, 10)",
+                        "optional": True
+                    },
+                    "timeout_seconds": {
+                        "type": "number",
+                        "description": "Önizleme için en fazla bekleme süresi (varsayılan YOK_QUICK_SEARCH_TIMEOUT, 10 saniye)",
+                        "optional": True
+                    },
+                    "fields": FIELDS_PROPERTY
                 },
                 "required": ["name"]
             }
         ),
         Tool(
             name="get_collaborators",
-            description="Belirtilen akademisyenin işbirlikçilerini getirir",
+            description="Belirtilen akademisyenin işbirlikçilerini arka plan işi olarak çeker; iş bitince aynı çağrı sonucu döndürür, yarıda kalan iş kaldığı yerden devam eder",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -96,7 +309,58 @@ async def handle_list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "Profil URL'i",
                         "optional": True
-                    }
+                    },
+                    "profile": {
+                        "type": "string",
+                        "description": "Profil kaydı: cprofile (.pstats) veya sampling (speedscope JSON), session klasörüne yazılır",
+                        "optional": True
+                    },
+                    "wait": {
+                        "type": "boolean",
+                        "description": "true: iş bitene kadar bekle ve sonucu döndür",
+                        "optional": True,
+                        "default": False
+                    },
+                    "deadline_seconds": {
+                        "type": "number",
+                        "description": "İşin süre sınırı (saniye); dolunca o ana kadarki sonuç \"cancelled\" olarak kaydedilir",
+                        "optional": True
+                    },
+                    "fields": FIELDS_PROPERTY,
+                    "cursor": CURSOR_PROPERTY
+                },
+                "required": ["session_id"]
+            }
+        ),
+        Tool(
+            name="get_collaborators_batch",
+            description="👥 Bir session'daki birden çok (veya tüm) profilin işbirlikçilerini ortak driver havuzuyla arka planda çeker; birden çok profilde görünen işbirlikçinin sayfası bir kez ziyaret edilir",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "session_id": {
+                        "type": "string",
+                        "description": "Session ID"
+                    },
+                    "profile_ids": {
+                        "type": ["array", "string"],
+                        "items": {"type": "integer"},
+                        "description": "Profil ID listesi veya session'daki tüm profiller için \"all\"",
+                        "optional": True,
+                        "default": "all"
+                    },
+                    "wait": {
+                        "type": "boolean",
+                        "description": "true: iş bitene kadar bekle ve sonucu döndür",
+                        "optional": True,
+                        "default": False
+                    },
+                    "deadline_seconds": {
+                        "type": "number",
+                        "description": "İşin süre sınırı (saniye); dolunca o ana kadarki sonuç \"cancelled\" olarak kaydedilir",
+                        "optional": True
+                    },
+                    "fields": FIELDS_PROPERTY
                 },
                 "required": ["session_id"]
             }
@@ -116,7 +380,8 @@ async def handle_list_tools() -> list[Tool]:
                         "description": "Maksimum sonuç sayısı",
                         "optional": True,
                         "default": 50
-                    }
+                    },
+                    "fields": FIELDS_PROPERTY
                 },
                 "required": ["name"]
             }
@@ -136,6 +401,20 @@ async def handle_list_tools() -> list[Tool]:
                 "required": ["session_id"]
             }
         ),
+        Tool(
+            name="cancel_session",
+            description="⏹️ Session'da çalışan işleri (arama, işbirlikçi, toplu işbirlikçi, yenileme) durdurur; driver hemen bırakılır, o ana kadarki sonuç \"cancelled\" olarak kaydedilir",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "session_id": {
+                        "type": "string",
+                        "description": "Session ID"
+                    }
+                },
+                "required": ["session_id"]
+            }
+        ),
         Tool(
             name="get_full_results",
             description="📋 Tamamlanmış scraping sonuçlarını getirir",
@@ -151,43 +430,419 @@ async def handle_list_tools() -> list[Tool]:
                         "description": "Maksimum sonuç sayısı",
                         "optional": True,
                         "default": 50
+                    },
+                    "fields": FIELDS_PROPERTY,
+                    "cursor": CURSOR_PROPERTY
+                },
+                "required": ["session_id"]
+            }
+        ),
+        Tool(
+            name="resolve_fields",
+            description="🗂️ Alan ve uzmanlık ID'lerini isimden çözer veya bir alanın uzmanlıklarını listeler",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Aranacak alan/uzmanlık adı (kısmi eşleşme, Türkçe karakter duyarsız)",
+                        "optional": True
+                    },
+                    "field_id": {
+                        "type": "integer",
+                        "description": "Uzmanlıkları listelenecek alan ID",
+                        "optional": True
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="get_metrics",
+            description="⏱️ Scraping aşamalarının (driver açılışı, sayfa yükleme, satır çıkarma, kaydetme, sayfalama) süre histogramlarını gösterir",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "format": {
+                        "type": "string",
+                        "description": "Çıktı formatı: json veya prometheus",
+                        "optional": True,
+                        "default": "json"
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="refresh_session",
+            description="🔄 Tamamlanmış bir session'daki profilleri yeniden ziyaret eder, sadece değişen kayıtları günceller ve değişiklik zamanlarını kaydeder (arka planda çalışır, tekrar çağrılınca ilerlemeyi gösterir)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "session_id": {
+                        "type": "string",
+                        "description": "Yenilenecek session"
+                    },
+                    "max_profiles": {
+                        "type": "integer",
+                        "description": "Yenilenecek en fazla profil sayısı",
+                        "optional": True
+                    },
+                    "wait": {
+                        "type": "boolean",
+                        "description": "Yenileme bitene kadar bekle",
+                        "optional": True,
+                        "default": False
                     }
                 },
                 "required": ["session_id"]
             }
         ),
+        Tool(
+            name="find_similar_academics",
+            description="🔎 Anahtar kelime ve alan etiketlerine göre (TF-IDF, kosinüs) bir profile veya verilen anahtar kelimelere en benzer akademisyenleri kayıtlı tüm session'lardan bulur",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "session_id": {
+                        "type": "string",
+                        "description": "Sorgu profilinin session'ı",
+                        "optional": True
+                    },
+                    "profile_id": {
+                        "type": "integer",
+                        "description": "Sorgu profilinin ID'si",
+                        "optional": True
+                    },
+                    "profile_url": {
+                        "type": "string",
+                        "description": "Sorgu profilinin URL'i",
+                        "optional": True
+                    },
+                    "keywords": {
+                        "type": "string",
+                        "description": "Profil yerine noktalı virgülle ayrılmış anahtar kelimeler",
+                        "optional": True
+                    },
+                    "top_k": {
+                        "type": "integer",
+                        "description": "Döndürülecek akademisyen sayısı",
+                        "optional": True,
+                        "default": 10
+                    },
+                    "fields": FIELDS_PROPERTY
+                }
+            }
+        ),
+        Tool(
+            name="get_central_collaborators",
+            description="🕸️ Kayıtlı işbirlikçi sonuçlarından kurulan ortak yazarlık ağında bir akademisyenin çevresindeki en merkezi kişileri (PageRank, özvektör, derece) yeniden scrape etmeden gösterir",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "profile_url": {
+                        "type": "string",
+                        "description": "Akademisyenin profil URL'i",
+                        "optional": True
+                    },
+                    "session_id": {
+                        "type": "string",
+                        "description": "profile_id ile birlikte: profilin bulunduğu session",
+                        "optional": True
+                    },
+                    "profile_id": {
+                        "type": "integer",
+                        "description": "Session'daki profil ID",
+                        "optional": True
+                    },
+                    "top_k": {
+                        "type": "integer",
+                        "description": "Döndürülecek kişi sayısı",
+                        "optional": True,
+                        "default": 10
+                    },
+                    "hops": {
+                        "type": "integer",
+                        "description": "Çevre derinliği (1: doğrudan işbirlikçiler, 2: işbirlikçilerin işbirlikçileri)",
+                        "optional": True,
+                        "default": 1
+                    },
+                    "metric": {
+                        "type": "string",
+                        "description": "Sıralama metriği: pagerank, eigenvector, degree veya strength",
+                        "optional": True,
+                        "default": "pagerank"
+                    },
+                    "fields": FIELDS_PROPERTY
+                }
+            }
+        ),
+        Tool(
+            name="export_sessions",
+            description="📦 Session profillerini ve işbirlikçilerini Parquet/Arrow dosyalarına sütunlu olarak aktarır (pandas/pyarrow ile okunabilir)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "session_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Aktarılacak session'lar; verilmezse erişilebilen tüm session'lar",
+                        "optional": True
+                    },
+                    "format": {
+                        "type": "string",
+                        "description": "parquet veya arrow (Arrow IPC dosyası)",
+                        "optional": True,
+                        "default": "parquet"
+                    },
+                    "merge": {
+                        "type": "boolean",
+                        "description": "true: tür başına tek birleşik dosya, false: session başına ayrı dosyalar",
+                        "optional": True,
+                        "default": True
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="manage_watchlist",
+            description="⏰ Sabit akademisyen listelerini (isim veya profil URL'i) cron takvimiyle yoğun olmayan saatlerde yeniler; her çalıştırma önceki anlık görüntüye göre farkı kaydeder",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "action": {
+                        "type": "string",
+                        "description": "save (oluştur/güncelle), delete, list, run (şimdi çalıştır) veya history (son farklar)"
+                    },
+                    "watchlist_id": {
+                        "type": "string",
+                        "description": "Watchlist adı (harf, rakam, '-' ve '_')",
+                        "optional": True
+                    },
+                    "entries": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "save için: akademisyen isimleri veya profil URL'leri",
+                        "optional": True
+                    },
+                    "schedule": {
+                        "type": "string",
+                        "description": "save için: cron ifadesi (dakika saat gün ay haftanın-günü, örn. \"0 3 * * 1\") veya @daily/@weekly",
+                        "optional": True,
+                        "default": "@weekly"
+                    },
+                    "collaborators": {
+                        "type": "boolean",
+                        "description": "save için: işbirlikçi listeleri de yenilensin mi",
+                        "optional": True,
+                        "default": True
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "history için: döndürülecek çalıştırma sayısı",
+                        "optional": True,
+                        "default": 5
+                    }
+                },
+                "required": ["action"]
+            }
+        ),
+        Tool(
+            name="get_memory_stats",
+            description="🧠 Sunucu (tracemalloc), Chrome süreç ağaçları ve session bazlı bellek kullanımını gösterir",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "top": {
+                        "type": "integer",
+                        "description": "tracemalloc'ta gösterilecek satır sayısı",
+                        "optional": True,
+                        "default": 10
+                    },
+                    "tracemalloc": {
+                        "type": "string",
+                        "description": "tracemalloc'u başlat (start) veya durdur (stop)",
+                        "optional": True
+                    }
+                }
+            }
+        ),
+
+    ]
 
+# list_resources'ta gösterilecek en yeni session sayısı
+MAX_LISTED_SESSIONS = 100
 
+@server.list_resources()
+async def handle_list_resources() -> list[Resource]:
+    """List available resources."""
+    resources = [
+        Resource(
+            uri=FIELDS_RESOURCE_URI,
+            name="Alan ve uzmanlık sözlüğü",
+            description="quick_search filtreleri için kullanılan alan/uzmanlık ID'leri",
+            mimeType="application/json"
+        )
     ]
+    client_id = current_client_id()
+    for session_id, kind in await asyncio.to_thread(_session_resource_entries, client_id):
+        resources.append(Resource(
+            uri=session_resource_uri(session_id, kind),
+            name=f"{session_id} {kind}",
+            mimeType="application/json"
+        ))
+    return resources
+
+def _session_resource_entries(client_id: str) -> list[tuple[str, str]]:
+    """İstemcinin erişebildiği, verisi olan en yeni session'lar"""
+    file_manager = get_file_manager()
+    session_dirs = [path for path in file_manager.sessions_path.iterdir()
+                    if path.is_dir() and session_ownership.is_allowed(path.name, client_id)]
+    session_dirs.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+    entries = []
+    for session_dir in session_dirs[:MAX_LISTED_SESSIONS]:
+        if (session_dir / "main_profile.json").exists():
+            entries.append((session_dir.name, "profiles"))
+        if (session_dir / "collaborators.json").exists():
+            entries.append((session_dir.name, "collaborators"))
+    return entries
+
+@server.list_resource_templates()
+async def handle_list_resource_templates() -> list[ResourceTemplate]:
+    """Session resource şablonları"""
+    return [
+        ResourceTemplate(
+            uriTemplate=f"yok://sessions/{{session_id}}/{kind}",
+            name=f"Session {kind}",
+            description=f"Session'ın {kind} kayıtları; abone olunursa yeni kayıtlar geldikçe resources/updated gönderilir",
+            mimeType="application/json"
+        )
+        for kind in SESSION_RESOURCE_KINDS
+    ]
+
+def _session_resource_or_error(uri) -> tuple[str, str]:
+    """Session resource URI'sini çöz ve istemcinin erişim hakkını kontrol et"""
+    parsed = parse_session_resource_uri(uri)
+    if parsed is None:
+        raise ValueError(f"Unknown resource: {uri}")
+    if not session_ownership.is_allowed(parsed[0], current_client_id()):
+        raise ValueError(f"Session {parsed[0]} bu istemciye ait değil")
+    return parsed
+
+@server.read_resource()
+async def handle_read_resource(uri) -> str:
+    """Read a resource by URI."""
+    if str(uri) == FIELDS_RESOURCE_URI:
+        return json.dumps(get_file_manager().taxonomy.fields, ensure_ascii=False)
+    session_id, kind = _session_resource_or_error(uri)
+    file_manager = get_file_manager()
+    data = await file_manager.load_session_data(session_id, kind)
+    if data is None:
+        raise ValueError(f"Session {session_id} için {kind} verisi yok")
+    done_file = "main_done.txt" if kind == "profiles" else "collaborators_done.txt"
+    data["completed"] = (file_manager.get_session_dir(session_id) / done_file).exists()
+    return dumps(data)
+
+@server.subscribe_resource()
+async def handle_subscribe_resource(uri):
+    """Session resource'una abone ol"""
+    _session_resource_or_error(uri)
+    resource_subscriptions.subscribe(str(uri), server.request_context.session)
+
+@server.unsubscribe_resource()
+async def handle_unsubscribe_resource(uri):
+    """Session resource aboneliğini kaldır"""
+    resource_subscriptions.unsubscribe(str(uri), server.request_context.session)
+
+def current_client_id() -> str:
+    """Çağrıyı yapan MCP istemcisinin kimliği (HTTP'de mcp-session-id, stdio'da local)"""
+    try:
+        request = server.request_context.request
+    except LookupError:
+        return LOCAL_CLIENT
+    if request is not None and hasattr(request, "headers"):
+        return request.headers.get("mcp-session-id") or LOCAL_CLIENT
+    return LOCAL_CLIENT
 
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextContent]:
     """Handle tool calls."""
     try:
+        # Başka bir istemcinin session'ına erişimi engelle
+        client_id = current_client_id()
+        session_arg = arguments.get("session_id")
+        if session_arg and not session_ownership.is_allowed(session_arg.strip(), client_id):
+            result = {"error": f"Session {session_arg.strip()} bu istemciye ait değil", "status": "failed"}
+            return text_response(result)
+        
         if name == "quick_search":
             # Hızlı arama - ilk 10 profili hemen göster
             name = arguments.get("name", "")
             max_results = arguments.get("max_results", 100)
             
-            result = await profile_scraper.quick_search_profiles(name, max_results)
-            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
+            result = await get_profile_scraper().quick_search_profiles(
+                name, max_results, arguments.get("profile"), arguments.get("deadline_seconds"),
+                arguments.get("min_profiles"), arguments.get("timeout_seconds"), owner=client_id
+            )
+            return text_response(result, arguments)
         
         elif name == "check_scraping_status":
             # Scraping durumunu kontrol et
             session_id = arguments["session_id"].strip()
-            result = await profile_scraper.check_scraping_status(session_id)
-            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
+            result = await get_profile_scraper().check_scraping_status(session_id)
+            refresh = _profile_refresher.get_progress(session_id) if _profile_refresher is not None else None
+            if refresh:
+                result["refresh"] = refresh
+            collaborators_job = _collaborator_scraper.get_job_progress(session_id) if _collaborator_scraper is not None else None
+            if collaborators_job:
+                result["collaborators_job"] = collaborators_job
+            collaborators_batch = _collaborator_batch.get_progress(session_id) if _collaborator_batch is not None else None
+            if collaborators_batch:
+                result["collaborators_batch"] = collaborators_batch
+            if _collaborator_prefetcher is not None and _collaborator_prefetcher.enabled:
+                result["prefetch"] = _collaborator_prefetcher.stats()
+            active_jobs = session_tasks.active(session_id)
+            if active_jobs:
+                result["active_jobs"] = active_jobs
+            return text_response(result)
+        
+        elif name == "cancel_session":
+            session_id = arguments["session_id"].strip()
+            cancelled = session_tasks.cancel(session_id)
+            if cancelled:
+                result = {
+                    "success": True,
+                    "session_id": session_id,
+                    "cancelled": cancelled,
+                    "message": f"{len(cancelled)} iş durduruldu; kısmi sonuçlar \"cancelled\" olarak kaydediliyor",
+                    "next_steps": [f"check_scraping_status ile sonucu görün (session_id: {session_id})"]
+                }
+            else:
+                result = {"error": f"Session {session_id} için çalışan iş yok", "status": "failed"}
+            return text_response(result)
         
         elif name == "get_full_results":
             # Tamamlanmış sonuçları getir
             session_id = arguments["session_id"].strip()
             max_results = arguments.get("max_results", 50)
-            result = await profile_scraper.get_full_results(session_id, max_results)
-            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
+            offset = arguments.get("cursor") or 0
+            result = await get_profile_scraper().get_full_results(session_id, max_results, offset)
+            return text_response(result, arguments, offset)
         
         elif name == "get_collaborators":
-            result = await collaborator_scraper.get_collaborators(**arguments)
-            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
+            offset = arguments.get("cursor") or 0
+            if offset:
+                # Devam sayfası: kaydedilmiş sonuçtan oku, yeniden scrape etme
+                result = await get_collaborator_scraper().get_saved_collaborators(arguments["session_id"].strip(), offset)
+            else:
+                request_args = {key: value for key, value in arguments.items() if key not in ("fields", "cursor")}
+                result = await get_collaborator_scraper().get_collaborators(**request_args)
+            return text_response(result, arguments, offset)
+        
+        elif name == "get_collaborators_batch":
+            result = await get_collaborator_batch().start_batch(
+                arguments["session_id"].strip(), arguments.get("profile_ids") or "all", arguments.get("wait", False),
+                arguments.get("deadline_seconds")
+            )
+            return text_response(result, arguments)
         
         elif name == "live_stream_profiles":
             # Real-time streaming - hızlı arama ile simüle edilmiş
@@ -195,7 +850,9 @@ async def handle_call_tool(name: str, arguments: dict[str, Any]) -> Sequence[Tex
             max_results = arguments.get("max_results", 50)
             
             # Hızlı arama yap ve sonuçları döndür
-            result = await profile_scraper.quick_search_profiles(name, max_results)
+            result = await get_profile_scraper().quick_search_profiles(name, max_results)
+            if result.get("session_id"):
+                session_ownership.claim(result["session_id"], client_id)
             
             # Streaming mesajı ekle
             if result.get("success"):
@@ -205,7 +862,112 @@ async def handle_call_tool(name: str, arguments: dict[str, Any]) -> Sequence[Tex
                 result["streaming_message"] = f"❌ Streaming başlatılamadı: {name}"
                 result["streaming_status"] = "failed"
             
-            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
+            return text_response(result, arguments)
+        
+        elif name == "resolve_fields":
+            result = await get_profile_scraper().resolve_fields(
+                query=arguments.get("query"),
+                field_id=arguments.get("field_id")
+            )
+            return text_response(result)
+        
+        elif name == "get_metrics":
+            if arguments.get("format") == "prometheus":
+                return [TextContent(type="text", text=metrics.render_prometheus())]
+            return text_response(metrics.snapshot())
+        
+        elif name == "refresh_session":
+            result = await get_profile_refresher().refresh_session(
+                arguments["session_id"].strip(), arguments.get("max_profiles"), arguments.get("wait", False)
+            )
+            return text_response(result)
+        
+        elif name == "find_similar_academics":
+            index = get_similarity_index()
+            session_id = (arguments.get("session_id") or "").strip() or None
+            query, similar = await asyncio.to_thread(
+                index.similar, session_id, arguments.get("profile_id"), arguments.get("profile_url"),
+                arguments.get("keywords"), arguments.get("top_k", 10),
+                lambda candidate: session_ownership.is_allowed(candidate, client_id)
+            )
+            if query is None and not arguments.get("keywords"):
+                result = {"error": "Sorgu profili bulunamadı (session_id + profile_id, profile_url veya keywords gerekli)", "status": "failed"}
+            else:
+                result = {"success": True, "query": query, "profiles": similar, "index": index.stats()}
+            return text_response(result, arguments)
+        
+        elif name == "get_central_collaborators":
+            profile_url = arguments.get("profile_url")
+            if not profile_url and arguments.get("session_id") and arguments.get("profile_id") is not None:
+                session_data = await get_file_manager().load_session_data(arguments["session_id"].strip(), "profiles") or {}
+                profile_url = next((profile.get("url") for profile in session_data.get("profiles", [])
+                                    if profile.get("id") == arguments["profile_id"]), None)
+            if not profile_url:
+                result = {"error": "profile_url veya session_id + profile_id gerekli", "status": "failed"}
+                return text_response(result)
+            graph = get_coauthor_graph()
+            # Ağ sadece istemcinin erişebildiği session'ların kenarlarından kurulur
+            allowed = lambda candidate: session_ownership.is_allowed(candidate, client_id)
+            result = await asyncio.to_thread(
+                graph.central_around, profile_url, arguments.get("top_k", 10),
+                arguments.get("hops", 1), arguments.get("metric", "pagerank"), allowed
+            )
+            if result is None:
+                result = {"error": f"{profile_url} ortak yazarlık ağında yok; önce get_collaborators çalıştırın", "status": "failed"}
+            else:
+                result = {"success": True, **result, "graph": await asyncio.to_thread(graph.stats, allowed)}
+            return text_response(result, arguments)
+        
+        elif name == "export_sessions":
+            from utils.exporter import export_sessions, list_session_ids
+            file_manager = get_file_manager()
+            requested = [session_id.strip() for session_id in arguments.get("session_ids") or []]
+            denied = [session_id for session_id in requested if not session_ownership.is_allowed(session_id, client_id)]
+            if denied:
+                result = {"error": f"Session {', '.join(denied)} bu istemciye ait değil", "status": "failed"}
+                return text_response(result)
+            session_ids = requested or [session_id for session_id in list_session_ids(file_manager.sessions_path)
+                                        if session_ownership.is_allowed(session_id, client_id)]
+            output_dir = file_manager.base_path / "exports" / datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            # Dosya okuma/yazma event loop'u bloklamasın
+            result = await asyncio.to_thread(
+                export_sessions, file_manager.sessions_path, output_dir, session_ids,
+                fmt=arguments.get("format", "parquet"), merge=arguments.get("merge", True)
+            )
+            return text_response(result)
+        
+        elif name == "manage_watchlist":
+            runner = get_watchlist_runner()
+            action = arguments.get("action")
+            watchlist_id = (arguments.get("watchlist_id") or "").strip()
+            # Watchlist'ler de session'lar gibi oluşturan istemciye aittir
+            if action == "list":
+                result = runner.list_watchlists(owner=client_id)
+            elif not watchlist_id:
+                result = {"error": "watchlist_id gerekli", "status": "failed"}
+            elif action == "save":
+                result = runner.save_watchlist(
+                    watchlist_id, arguments.get("entries"), arguments.get("schedule", "@weekly"),
+                    arguments.get("collaborators", True), owner=client_id
+                )
+            elif action == "delete":
+                result = runner.delete_watchlist(watchlist_id, owner=client_id)
+            elif action == "run":
+                result = await runner.run_watchlist(watchlist_id, owner=client_id)
+            elif action == "history":
+                result = runner.history(watchlist_id, arguments.get("limit", 5), owner=client_id)
+            else:
+                result = {"error": f"Bilinmeyen işlem: {action} (save, delete, list, run, history)", "status": "failed"}
+            return text_response(result)
+        
+        elif name == "get_memory_stats":
+            if arguments.get("tracemalloc") == "start":
+                memory_monitor.start_tracemalloc()
+            elif arguments.get("tracemalloc") == "stop":
+                memory_monitor.stop_tracemalloc()
+            # /proc taraması ve tracemalloc snapshot'ı event loop'u bloklamasın
+            result = await asyncio.to_thread(memory_monitor.report, arguments.get("top", 10))
+            return text_response(result)
         
         else:
             raise ValueError(f"Unknown tool: {name}")
@@ -216,25 +978,108 @@ async def handle_call_tool(name: str, arguments: dict[str, Any]) -> Sequence[Tex
 
 
 
-async def main():
-    """Main server entry point."""
+def initialization_options() -> InitializationOptions:
+    """MCP handshake seçenekleri"""
+    capabilities = server.get_capabilities(
+        notification_options=NotificationOptions(
+            tools_changed=False,
+            resources_changed=False,
+            prompts_changed=False
+        ),
+        experimental_capabilities={}
+    )
+    # Lowlevel server subscribe'ı her zaman False bildirir; session resource'ları abone olunabilir
+    capabilities.resources.subscribe = True
+    return InitializationOptions(
+        server_name="yok-akademik-scraper",
+        server_version="1.0.0",
+        capabilities=capabilities
+    )
+
+# HTTP session manager'ı da aynı seçenekleri (abonelik desteği, sürüm) kullansın
+server.create_initialization_options = initialization_options
+
+async def run_stdio():
+    """Tek istemcili stdio transport'u"""
     async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="yok-akademik-scraper",
-                server_version="1.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(
-                        tools_changed=False,
-                        resources_changed=False,
-                        prompts_changed=False
-                    ),
-                    experimental_capabilities={}
-                )
-            )
-        )
+        await server.run(read_stream, write_stream, initialization_options())
+
+def create_http_app(max_sessions: Optional[int] = None, idle_timeout: Optional[float] = None):
+    """Streamable HTTP (SSE) transport'u için ASGI uygulaması
+    
+    Tüm istemciler aynı tool'ları, driver havuzunu ve önbellekleri paylaşır.
+    max_sessions aşılınca yeni istemciler 503 alır.
+    """
+    from contextlib import asynccontextmanager
+    from starlette.applications import Starlette
+    from starlette.routing import Route
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    
+    session_manager = StreamableHTTPSessionManager(
+        app=server,
+        max_sessions=max_sessions or int(os.getenv("YOK_HTTP_MAX_SESSIONS", "32")),
+        session_idle_timeout=idle_timeout or float(os.getenv("YOK_HTTP_IDLE_TIMEOUT", "1800")),
+    )
+    
+    class MCPEndpoint:
+        async def __call__(self, scope, receive, send):
+            await session_manager.handle_request(scope, receive, send)
+    
+    @asynccontextmanager
+    async def lifespan(app):
+        async with session_manager.run():
+            yield
+    
+    return Starlette(routes=[Route("/mcp", endpoint=MCPEndpoint())], lifespan=lifespan)
+
+async def run_http(host: str, port: int):
+    """Çok istemcili HTTP transport'u (uvicorn)"""
+    import uvicorn
+    
+    config = uvicorn.Config(
+        create_http_app(),
+        host=host,
+        port=port,
+        # Eşzamanlı bağlantı sınırı aşılınca uvicorn 503 döner
+        limit_concurrency=int(os.getenv("YOK_HTTP_MAX_CONNECTIONS", "64")),
+        log_level=os.getenv("YOK_LOG_LEVEL", "info").lower(),
+        log_config=None,
+    )
+    logging.info(f"MCP HTTP server: http://{host}:{port}/mcp")
+    await uvicorn.Server(config).serve()
+
+def parse_args(argv=None):
+    """Komut satırı argümanları"""
+    parser = argparse.ArgumentParser(description="YÖK Akademik MCP server")
+    parser.add_argument("--transport", choices=["stdio", "http"], default=os.getenv("YOK_TRANSPORT", "stdio"))
+    parser.add_argument("--host", default=os.getenv("YOK_HTTP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("YOK_HTTP_PORT", "8000")))
+    return parser.parse_args(argv)
+
+async def main(argv=None):
+    """Main server entry point."""
+    args = parse_args(argv)
+    
+    # Loglar kuyruğa yazılır, stderr'e ayrı thread basar (YOK_LOG_FORMAT=json ile JSON)
+    setup_logging()
+    
+    # İsteğe bağlı Prometheus endpoint'i (YOK_METRICS_PORT=9464 gibi)
+    metrics_port = os.getenv("YOK_METRICS_PORT")
+    if metrics_port:
+        start_metrics_server(int(metrics_port), os.getenv("YOK_METRICS_HOST", "127.0.0.1"))
+    
+    try:
+        if args.transport == "http":
+            await run_http(args.host, args.port)
+        else:
+            await run_stdio()
+    finally:
+        if _watchlist_runner is not None:
+            await _watchlist_runner.stop()
+        # Havuzda boşta bekleyen driver'ları kapat (havuz araçlar arasında ortak)
+        for tool in (_profile_scraper, _collaborator_scraper):
+            if tool is not None:
+                await tool.selenium_manager.shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
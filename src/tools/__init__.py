@@ -1,4 +1,20 @@
-from .profile_scraper import ProfileScraperTool
-from .collaborator_scraper import CollaboratorScraperTool
+import importlib
 
-__all__ = ['ProfileScraperTool', 'CollaboratorScraperTool'] 
\ No newline at end of file
+# Tool modülleri Selenium'u içe aktarır; ilk erişimde yüklensin
+_LAZY_EXPORTS = {
+    'ProfileScraperTool': '.profile_scraper',
+    'CollaboratorScraperTool': '.collaborator_scraper',
+    'ProfileRefreshTool': '.profile_refresher',
+    'CollaboratorPrefetcher': '.collaborator_prefetcher',
+    'WatchlistRunner': '.watchlist_runner',
+    'CollaboratorBatchTool': '.collaborator_batch',
+}
+
+__all__ = ['ProfileScraperTool', 'CollaboratorScraperTool', 'ProfileRefreshTool', 'CollaboratorPrefetcher',
+           'WatchlistRunner', 'CollaboratorBatchTool']
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
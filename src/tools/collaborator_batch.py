@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+from utils.metrics import metrics
+from utils.logging_setup import set_log_context
+from utils.cancellation import CancelScope, SessionCancelled, check_cancelled, default_deadline, session_tasks
+
+logger = logging.getLogger(__name__)
+
+OPERATION = "collaborators_batch"
+
+
+class _BatchState:
+    """Bir toplu işin işçiler arasında paylaşılan durumu"""
+
+    def __init__(self, session_id: str, progress: Dict[str, Any]):
+        self.session_id = session_id
+        self.progress = progress
+        # profil URL'i -> işbirlikçi detayı (aynı kişi birden çok profilin altında çıkabilir)
+        self.details: Dict[str, asyncio.Future] = {}
+        self.results: Dict[int, Dict[str, Any]] = {}
+        # Önceki çalıştırmalardan kalan, bu işte istenmeyen profiller (dosyada korunur)
+        self.kept: List[Dict[str, Any]] = []
+        self.save_lock = asyncio.Lock()
+
+
+class CollaboratorBatchTool:
+    """Bir session'daki birden çok profilin işbirlikçilerini ortak driver havuzuyla çeker
+
+    Profil URL'leri session dosyasından tek geçişte çözülür. Her işçi tek bir
+    driver'ı tüm iş boyunca kullanır; birden çok profilin altında görünen
+    işbirlikçinin detay sayfası bir kez ziyaret edilir. Biten her profil
+    collaborators_batch.json'a yazılır, yarıda kalan iş tamamlanmış profilleri atlayarak devam eder.
+    """
+
+    def __init__(self, collaborator_scraper, concurrency: Optional[int] = None):
+        self.scraper = collaborator_scraper
+        self.file_manager = collaborator_scraper.file_manager
+        self.selenium_manager = collaborator_scraper.selenium_manager
+        self.concurrency = concurrency or int(os.getenv("YOK_BATCH_CONCURRENCY", "2"))
+        self._jobs: Dict[str, asyncio.Task] = {}
+        self._progress: Dict[str, Dict[str, Any]] = {}
+
+    async def start_batch(self, session_id: str, profile_ids: Union[str, List[int]] = "all",
+                          wait: bool = False, deadline_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Toplu işbirlikçi işini başlat (arka planda; wait=True ise bitmesini bekler)"""
+        try:
+            set_log_context(session_id=session_id)
+            task = self._jobs.get(session_id)
+            if task is None:
+                session_data = await self.file_manager.load_session_data(session_id, "profiles")
+                if not session_data:
+                    return {"error": f"Session {session_id} bulunamadı", "status": "failed"}
+                profiles, missing = self._resolve(session_data.get("profiles", []), profile_ids)
+                if not profiles:
+                    return {"error": "İşbirlikçileri çekilecek profil bulunamadı", "status": "failed", "missing_ids": missing}
+
+                previous = await self.file_manager.load_session_data(session_id, "collaborators_batch") or {}
+                completed_urls = {entry.get("profile_url") for entry in previous.get("profiles", [])
+                                  if entry.get("status") == "completed"}
+                # Tüm profiller önceki çalıştırmada bittiyse iş anında biter; sonucu bekleyip döndür
+                wait = wait or all(profile["url"] in completed_urls for profile in profiles)
+                progress = {
+                    "status": "running",
+                    "started_at": datetime.now().isoformat(),
+                    "profiles_total": len(profiles),
+                    "profiles_done": 0,
+                    "profiles_failed": 0,
+                    "profiles_resumed": 0,
+                    "detail_fetches": 0,
+                    "detail_reused": 0,
+                    "missing_ids": missing,
+                }
+                self._progress[session_id] = progress
+                task = asyncio.create_task(
+                    self._run(session_id, profiles, previous, progress, deadline_seconds or default_deadline())
+                )
+                self._jobs[session_id] = task
+
+            if wait:
+                return await asyncio.shield(task)
+            return {
+                "session_id": session_id,
+                "status": "running",
+                "job": self._progress[session_id],
+                "message": "İşbirlikçiler arka planda toplu olarak çekiliyor",
+                "next_steps": [
+                    f"check_scraping_status ile ilerlemeyi izleyin (session_id: {session_id})",
+                    "Bitince get_collaborators_batch aynı argümanlarla sonucu döndürür"
+                ]
+            }
+        except Exception as e:
+            logger.error(f"Toplu işbirlikçi işi başlatılamadı: {e}")
+            return {"error": f"Toplu işbirlikçi işi başlatılamadı: {str(e)}", "status": "failed"}
+
+    @staticmethod
+    def _resolve(profiles: List[Dict[str, Any]], profile_ids: Union[str, List[int]]):
+        """Profil ID'lerini tek geçişte URL'li kayıtlara çevir; (profiller, bulunamayan ID'ler)"""
+        with_url = [profile for profile in profiles if profile.get("url")]
+        if profile_ids == "all":
+            return with_url, []
+        by_id = {profile.get("id"): profile for profile in with_url}
+        wanted = list(dict.fromkeys(profile_ids or []))
+        return [by_id[profile_id] for profile_id in wanted if profile_id in by_id], \
+            [profile_id for profile_id in wanted if profile_id not in by_id]
+
+    async def _run(self, session_id: str, profiles: List[Dict[str, Any]], previous: Dict[str, Any],
+                   progress: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        set_log_context(session_id=session_id)
+        with session_tasks.scope(session_id, OPERATION, deadline) as scope:
+            return await self._run_workers(session_id, profiles, previous, progress, scope)
+
+    async def _run_workers(self, session_id: str, profiles: List[Dict[str, Any]], previous: Dict[str, Any],
+                           progress: Dict[str, Any], scope: CancelScope) -> Dict[str, Any]:
+        state = _BatchState(session_id, progress)
+        loop = asyncio.get_running_loop()
+
+        # Önceki çalıştırmada tamamlanan profiller atlanır, detayları tekrar kullanılır
+        done = {entry["profile_url"]: entry for entry in previous.get("profiles", []) if entry.get("status") == "completed"}
+        for entry in done.values():
+            for record in entry.get("collaborators", []):
+                if record.get("url") and record["url"] not in state.details:
+                    state.details[record["url"]] = loop.create_future()
+                    state.details[record["url"]].set_result(record)
+        queue: asyncio.Queue = asyncio.Queue()
+        for profile in profiles:
+            if profile["url"] in done:
+                state.results[profile["id"]] = done[profile["url"]]
+                progress["profiles_resumed"] += 1
+            else:
+                queue.put_nowait(profile)
+        progress["profiles_done"] = progress["profiles_resumed"]
+        requested = {profile["url"] for profile in profiles}
+        state.kept = [entry for entry in previous.get("profiles", []) if entry.get("profile_url") not in requested]
+
+        order = [profile["id"] for profile in profiles]
+        workers = [asyncio.create_task(self._worker(queue, state, order))
+                   for _ in range(min(self.concurrency, queue.qsize()))]
+        try:
+            with metrics.span("batch_total", operation=OPERATION):
+                await asyncio.gather(*workers)
+            progress["status"] = "completed"
+        except (SessionCancelled, asyncio.CancelledError):
+            # Diğer işçiler de durdurulur; driver'lar kaydetmeden önce kapanır
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            progress["status"] = "cancelled"
+            # Sahibi olmayan iptal (sunucu kapanışı) yayılır
+            if scope.reason is None:
+                raise
+            progress["cancel_reason"] = scope.reason
+        except Exception as e:
+            logger.error(f"Toplu işbirlikçi işi hatası: {e}")
+            progress["status"] = "failed"
+            progress["error"] = str(e)
+        finally:
+            progress["finished_at"] = datetime.now().isoformat()
+            self._jobs.pop(session_id, None)
+
+        entries = [state.results[profile_id] for profile_id in order if profile_id in state.results]
+        await self._save(state, order, completed=progress["status"] == "completed")
+        logger.info(f"Toplu işbirlikçi işi bitti: {session_id} ({progress['profiles_done']}/{len(order)} profil)")
+        return {
+            "session_id": session_id,
+            "status": progress["status"],
+            "job": progress,
+            "profiles": entries,
+            "total_count": len(entries),
+            "unique_collaborators": len(state.details),
+        }
+
+    async def _worker(self, queue: asyncio.Queue, state: _BatchState, order: List[int]):
+        """Kuyruk boşalana kadar profilleri tek driver ile işle"""
+        driver = None
+        try:
+            while True:
+                check_cancelled()
+                try:
+                    profile = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                if driver is None:
+                    with metrics.span("driver_startup", operation=OPERATION):
+                        driver = await self.selenium_manager.get_driver(session_id=state.session_id, operation=OPERATION)
+                entry = {"profile_id": profile["id"], "profile_url": profile["url"], "profile_name": profile.get("name", "")}
+                try:
+                    driver = await self.selenium_manager.recycle_if_needed(driver)
+                    targets, graph = await self.scraper._read_graph(driver, profile["url"], operation=OPERATION)
+                    collaborators = []
+                    for idx, obj in enumerate(targets or [], start=1):
+                        check_cancelled()
+                        driver = await self.selenium_manager.recycle_if_needed(driver)
+                        record = await self._detail(driver, obj, idx, state)
+                        if record:
+                            collaborators.append(record)
+                    # Grafiğin merkez linki istenenden farklı yazılmış olabilir; devam ve eşleme istenen URL ile yapılır
+                    entry.update({**graph, "profile_url": profile["url"], "center_url": graph.get("profile_url") or profile["url"]})
+                    entry.update({"collaborators": collaborators, "status": "completed"})
+                    state.progress["profiles_done"] += 1
+                except SessionCancelled:
+                    raise
+                except Exception as e:
+                    logger.error(f"Profilin işbirlikçileri çekilemedi {profile['url']}: {e}")
+                    entry.update({"status": "failed", "error": str(e)})
+                    state.progress["profiles_failed"] += 1
+                state.results[profile["id"]] = entry
+                metrics.increment("batch_profiles", outcome=entry["status"])
+                await self._save(state, order, completed=False)
+        finally:
+            if driver is not None:
+                with metrics.span("driver_close", operation=OPERATION):
+                    await self.selenium_manager.close_driver(driver)
+
+    async def _detail(self, driver, obj: Dict[str, Any], idx: int, state: _BatchState) -> Optional[Dict[str, Any]]:
+        """İşbirlikçi detayını al; aynı URL başka profil için alındıysa (veya alınıyorsa) onu kullan"""
+        href = obj.get("href")
+        if not href:
+            # Linki olmayan (silinmiş) kayıt sayfa ziyareti gerektirmez
+            return await self.scraper._extract_collaborator_data(driver, obj, idx)
+        future = state.details.get(href)
+        if future is None:
+            future = state.details[href] = asyncio.get_running_loop().create_future()
+            record = None
+            try:
+                with metrics.span("collaborator_detail", operation=OPERATION):
+                    record = await self.scraper._extract_collaborator_data(driver, obj, idx)
+                state.progress["detail_fetches"] += 1
+                # Rate limiting
+                await asyncio.sleep(self.scraper.collaborator_delay)
+            finally:
+                future.set_result(record)
+        else:
+            record = await asyncio.shield(future)
+            state.progress["detail_reused"] += 1
+        if record is None:
+            return None
+        return {**record, "id": idx, "name": obj.get("name") or record.get("name"), "weight": obj.get("weight")}
+
+    async def _save(self, state: _BatchState, order: List[int], completed: bool):
+        """Biten profilleri istenen sırayla collaborators_batch.json'a yaz"""
+        async with state.save_lock:
+            entries = [state.results[profile_id] for profile_id in order if profile_id in state.results]
+            await self.file_manager.save_collaborator_batch(state.session_id, {
+                "session_id": state.session_id,
+                "updated_at": datetime.now().isoformat(),
+                "completed": completed,
+                **({"cancelled": True, "cancel_reason": state.progress["cancel_reason"]}
+                   if state.progress.get("cancel_reason") else {}),
+                "total_count": len(entries),
+                "profiles": entries + state.kept,
+            })
+
+    def get_progress(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Session'ın son toplu işinin ilerlemesi"""
+        return self._progress.get(session_id)
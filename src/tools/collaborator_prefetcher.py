@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from utils.memory_monitor import memory_monitor, MB
+from utils.metrics import metrics
+from utils.logging_setup import set_log_context
+
+logger = logging.getLogger(__name__)
+
+
+class CollaboratorPrefetcher:
+    """Arama sonuçlarının ilk k profili için işbirlikçileri boştaki kapasiteyle önceden çeker
+
+    Session ilk N profile ulaşınca veya tamamlanınca tetiklenir. Sonuçlar
+    CollaboratorScraperTool.prefetch_cache'e yazılır; aynı profil için gelen
+    get_collaborators çağrısı scrape etmeden döner. Açık driver sayısı kapasiteyi
+    veya toplam RSS eşiği aşılırsa çalışan önceden çekmeler iptal edilir; hatayla
+    biten bir önceden çekme (site engeli olabilir) bekleme süresi boyunca yenilerini
+    durdurur. Hiçbir profil başlatılamadıysa (kapasite/bellek) session sonraki
+    kayıtta yeniden denenir.
+    """
+
+    def __init__(
+        self,
+        collaborator_scraper,
+        top_k: Optional[int] = None,
+        trigger_count: Optional[int] = None,
+        budget: Optional[int] = None,
+        max_drivers: Optional[int] = None,
+        max_rss_mb: Optional[float] = None,
+        cooldown: Optional[float] = None,
+        check_interval: float = 2.0
+    ):
+        self.scraper = collaborator_scraper
+        self.file_manager = collaborator_scraper.file_manager
+        # top_k=0: önceden çekme kapalı
+        self.top_k = top_k if top_k is not None else int(os.getenv("YOK_PREFETCH_TOP_K", "0"))
+        self.trigger_count = trigger_count or int(os.getenv("YOK_PREFETCH_AFTER", "10"))
+        # Aynı anda en fazla kaç önceden çekme driver'ı açılabilir
+        self.budget = budget or int(os.getenv("YOK_PREFETCH_BUDGET", "1"))
+        # Önceden çekme dahil toplam açık driver sınırı (siteye giden eşzamanlı istek)
+        self.max_drivers = max_drivers or int(os.getenv("YOK_PREFETCH_MAX_DRIVERS", "2"))
+        max_rss_mb = max_rss_mb if max_rss_mb is not None else float(os.getenv("YOK_PREFETCH_MAX_RSS_MB", "2048"))
+        self.max_rss = int(max_rss_mb * MB) if max_rss_mb else None
+        self.cooldown = cooldown if cooldown is not None else float(os.getenv("YOK_PREFETCH_COOLDOWN", "300"))
+        self.check_interval = check_interval
+        self._semaphore = asyncio.Semaphore(self.budget)
+        self._triggered: Set[str] = set()
+        self._checking: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._watchdog: Optional[asyncio.Task] = None
+        self._paused_until = 0.0
+        self.last_cancel_reason: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.top_k > 0
+
+    def on_profiles_saved(self, session_id: str):
+        """Profil kaydı dinleyicisi: session tetiklenme koşuluna ulaştıysa önceden çekmeyi başlat"""
+        if not self.enabled or session_id in self._triggered or session_id in self._checking:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._checking.add(session_id)
+        task = loop.create_task(self._check_session(session_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _check_session(self, session_id: str):
+        try:
+            status = await self.file_manager.get_session_status(session_id)
+            data = await self.file_manager.load_session_data(session_id, "profiles") or {}
+            profiles = data.get("profiles", [])
+            if not profiles or (len(profiles) < self.trigger_count and not status.get("profiles_completed")):
+                return
+            urls = [profile["url"] for profile in profiles[:self.top_k] if profile.get("url")]
+            counts = await self.prefetch_urls(session_id, urls)
+            # Hepsi baskı nedeniyle atlandıysa tetiklenmiş sayılmaz (ör. tamamlanınca tekrar denenir)
+            if any(not outcome.startswith("skipped_") for outcome in counts):
+                self._triggered.add(session_id)
+        except Exception as e:
+            logger.warning(f"Önceden çekme başlatılamadı {session_id}: {e}")
+        finally:
+            self._checking.discard(session_id)
+
+    async def pressure(self) -> Optional[str]:
+        """Önceden çekmeyi durdurması gereken baskı: rate, capacity, memory veya None"""
+        if time.monotonic() < self._paused_until:
+            return "rate"
+        if memory_monitor.driver_count() > self.max_drivers:
+            return "capacity"
+        # /proc taraması event loop'u bloklamasın
+        if self.max_rss and await asyncio.to_thread(memory_monitor.total_rss) > self.max_rss:
+            return "memory"
+        return None
+
+    async def prefetch_urls(self, session_id: str, urls: List[str]) -> Dict[str, int]:
+        """URL'leri sırayla (bütçe kadar paralel) önceden çek; sonuç sayılarını döndür"""
+        set_log_context(session_id=session_id)
+        counts: Dict[str, int] = {}
+
+        async def prefetch_one(url: str):
+            async with self._semaphore:
+                # Boşta kapasite yoksa başlatma; yeni driver açılacağı için bir eksiği aranır
+                reason = await self.pressure()
+                if reason is None and memory_monitor.driver_count() >= self.max_drivers:
+                    reason = "capacity"
+                if reason:
+                    outcome = f"skipped_{reason}"
+                else:
+                    outcome = await self._prefetch(session_id, url)
+            counts[outcome] = counts.get(outcome, 0) + 1
+            metrics.increment("collaborator_prefetch", outcome=outcome)
+
+        logger.info(f"İşbirlikçi önceden çekme: {session_id} ({len(urls)} profil)")
+        await asyncio.gather(*(prefetch_one(url) for url in urls))
+        logger.info(f"Önceden çekme bitti: {session_id} {counts}")
+        return counts
+
+    async def _prefetch(self, session_id: str, url: str) -> str:
+        if self.scraper.get_prefetched(url) is not None or url in self.scraper.prefetch_tasks:
+            return "cached"
+        task = asyncio.create_task(self.scraper.prefetch(url, session_id))
+        self._ensure_watchdog()
+        try:
+            fetched = await task
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            return "cancelled"
+        except Exception as e:
+            # Sayfa/grafik hatası: site yavaşlatıyor olabilir, bir süre yeni önceden çekme yapma
+            logger.warning(f"Önceden çekme hatası {url}: {e}")
+            self._paused_until = time.monotonic() + self.cooldown
+            return "failed"
+        return "fetched" if fetched else "empty"
+
+    def _ensure_watchdog(self):
+        if self._watchdog is None or self._watchdog.done():
+            self._watchdog = asyncio.create_task(self._watch())
+
+    async def _watch(self):
+        """Önceden çekmeler sürerken baskıyı izle, gerekirse bekleyeni olmayanları iptal et"""
+        while self.scraper.prefetch_tasks:
+            reason = await self.pressure()
+            if reason and reason != "rate":
+                self.cancel(reason)
+            await asyncio.sleep(self.check_interval)
+
+    def cancel(self, reason: str = "manual") -> int:
+        """Bekleyen bir get_collaborators çağrısı olmayan önceden çekmeleri iptal et"""
+        cancelled = 0
+        for url, task in list(self.scraper.prefetch_tasks.items()):
+            if url not in self.scraper.claimed_prefetches and not task.done():
+                task.cancel()
+                cancelled += 1
+        if cancelled:
+            self.last_cancel_reason = reason
+            logger.warning(f"{cancelled} önceden çekme iptal edildi ({reason})")
+        return cancelled
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "top_k": self.top_k,
+            "budget": self.budget,
+            "running": len(self.scraper.prefetch_tasks),
+            "paused_seconds": max(0.0, round(self._paused_until - time.monotonic(), 1)),
+            "last_cancel_reason": self.last_cancel_reason,
+            "cache": self.scraper.prefetch_cache_stats(),
+        }
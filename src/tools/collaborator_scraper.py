@@ -1,6 +1,9 @@
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import os
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -8,23 +11,182 @@ from selenium.webdriver.support import expected_conditions as EC
 from models.schemas import CollaboratorRequest, Collaborator, SessionStatus
 from utils.selenium_manager import SeleniumManager
 from utils.file_manager import FileManager
+from utils.html_parser import parse_profile_page
+from utils.lru_cache import ByteLRUCache
+from utils.memory_monitor import estimate_size
+from utils.metrics import metrics
+from utils.profiling import resolve_profile_mode, profile_session
+from utils.logging_setup import set_log_context
+from utils.cancellation import SessionCancelled, check_cancelled, default_deadline, detach_scope, session_tasks
 
 logger = logging.getLogger(__name__)
 
+# D3 grafiğinin bağlı olduğu veri setini (__data__) tek geçişte okur.
+# Düğümler: {index, name, href}, kenarlar: {source, target, weight}
+GRAPH_DATA_SCRIPT = """
+const toHref = (d) => {
+    const raw = d && (d.url || d.href || d.link || d.pageUrl || d.profileUrl || '');
+    try { return raw ? new URL(raw, location.href).href : ''; } catch (e) { return ''; }
+};
+const nodeIds = new Map();
+const nodes = [];
+document.querySelectorAll('svg g').forEach((g) => {
+    const d = g.__data__;
+    if (!d || typeof d !== 'object' || Array.isArray(d) || d.source !== undefined) return;
+    if (nodeIds.has(d)) return;
+    const name = (d.name || d.label || g.querySelector('text')?.textContent || '').trim();
+    const index = nodes.length;
+    nodeIds.set(d, index);
+    if (d.index !== undefined) nodeIds.set(d.index, index);
+    nodes.push({ index, name, href: toHref(d) });
+});
+const resolve = (ref) => nodeIds.has(ref) ? nodeIds.get(ref) : (ref && nodeIds.has(ref.index) ? nodeIds.get(ref.index) : -1);
+const edges = [];
+document.querySelectorAll('svg line, svg path').forEach((el) => {
+    const d = el.__data__;
+    if (!d || d.source === undefined || d.target === undefined) return;
+    const source = resolve(d.source);
+    const target = resolve(d.target);
+    if (source < 0 || target < 0) return;
+    edges.push({ source, target, weight: Number(d.value ?? d.weight ?? d.count ?? 1) || 1 });
+});
+return { nodes, edges };
+"""
+
+# Veri seti okunamazsa: her düğüme tıklayıp #pageUrl'den link toplar (yavaş)
+GRAPH_CLICK_SCRIPT = """
+const gs = document.querySelectorAll('svg g');
+const results = [];
+for (let i = 2; i < gs.length; i++) {
+    const name = gs[i].querySelector('text')?.textContent.trim() || '';
+    gs[i].dispatchEvent(new MouseEvent('click', { bubbles: true }));
+    const href = document.getElementById('pageUrl')?.href || '';
+    results.push({ name, href });
+}
+return results;
+"""
+
+# Arka plan işinde collaborators.json'ın ara sonuçla güncellenme aralığı (kayıt sayısı)
+PROGRESS_SAVE_EVERY = 10
+
 class CollaboratorScraperTool:
     """İşbirlikçi scraper tool'u"""
     
-    def __init__(self):
-        self.selenium_manager = SeleniumManager()
-        self.file_manager = FileManager()
-        self.base_url = "https://akademik.yok.gov.tr/"
+    def __init__(
+        self,
+        selenium_manager: Optional[SeleniumManager] = None,
+        file_manager: Optional[FileManager] = None
+    ):
+        self.selenium_manager = selenium_manager or SeleniumManager(block_preset="graph")
+        self.file_manager = file_manager or FileManager()
         self.default_photo_url = "/default_photo.jpg"
+        # İki işbirlikçi sayfası arasındaki bekleme (saniye)
+        self.collaborator_delay = 0.5
+        # Önceden çekilen sonuçlar: profile_url -> {collaborators, graph, fetched_at}
+        max_mb = float(os.getenv("YOK_PREFETCH_CACHE_MAX_MB", "32"))
+        self.prefetch_cache = ByteLRUCache(int(max_mb * 1024 * 1024))
+        self.prefetch_ttl = float(os.getenv("YOK_PREFETCH_TTL", "1800"))
+        # Devam eden önceden çekmeler ve bunları bekleyen (iptal edilmemesi gereken) URL'ler
+        self.prefetch_tasks: Dict[str, asyncio.Task] = {}
+        self.claimed_prefetches: set = set()
+        # Arka plan işbirlikçi işleri: session_id -> task / ilerleme
+        self._jobs: Dict[str, asyncio.Task] = {}
+        self._job_progress: Dict[str, Dict[str, Any]] = {}
+        metrics.register_gauge("prefetch_cache", self.prefetch_cache_stats)
+
+    def prefetch_cache_stats(self) -> Dict[str, float]:
+        """prefetch_cache istatistikleri"""
+        return {key: value for key, value in self.prefetch_cache.stats().items() if value is not None}
+
+    def get_prefetched(self, profile_url: str) -> Optional[Dict[str, Any]]:
+        """Süresi dolmamış önceden çekilmiş sonucu döndür"""
+        entry = self.prefetch_cache.get(profile_url)
+        if entry is None:
+            return None
+        if time.time() - entry["fetched_at"] > self.prefetch_ttl:
+            self.prefetch_cache.pop(profile_url)
+            return None
+        return entry
+
+    async def fetch_collaborators(self, profile_url: str, session_id: Optional[str] = None,
+                                  operation: str = "collaborators",
+                                  progress: Optional[Dict[str, Any]] = None,
+                                  strict: bool = False) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Yeni bir driver ile profilin işbirlikçilerini çek; (işbirlikçiler, grafik) döndürür
+        
+        progress verilirse her işbirlikçi session'ın günlüğüne yazılır ve önceki
+        günlükten devam edilir; iş tamamlanınca progress["finished"] True olur.
+        strict ise sayfa/grafik hatası boş sonuç yerine exception olarak yükselir.
+        """
+        with metrics.span("driver_startup", operation=operation):
+            driver = await self.selenium_manager.get_driver(session_id=session_id, operation=operation)
+        try:
+            with metrics.span("scrape_total", operation=operation):
+                return await self._scrape_collaborators(
+                    driver, profile_url, session_id if progress is not None else None, progress, strict
+                )
+        finally:
+            with metrics.span("driver_close", operation=operation):
+                await self.selenium_manager.close_driver(driver)
+
+    async def prefetch(self, profile_url: str, session_id: Optional[str] = None) -> bool:
+        """İşbirlikçileri arka planda çekip prefetch_cache'e koy; sonuç önbelleğe girdiyse True"""
+        if self.get_prefetched(profile_url) is not None or profile_url in self.prefetch_tasks:
+            return False
+        # Tetikleyen aramanın iptali/son tarihi önceden çekmeyi durdurmaz
+        detach_scope()
+        task = asyncio.current_task()
+        self.prefetch_tasks[profile_url] = task
+        try:
+            # Sayfa/grafik hatası exception olarak yükselir; boş sonuç işbirlikçisi olmayan profildir
+            collaborators, graph = await self.fetch_collaborators(
+                profile_url, session_id, operation="prefetch", strict=True
+            )
+            # Boş sonuç önbelleğe alınmaz; takip eden çağrı profili kendisi çeker
+            if not collaborators:
+                return False
+            entry = {"collaborators": collaborators, "graph": graph, "fetched_at": time.time()}
+            self.prefetch_cache.put(profile_url, entry, estimate_size(entry))
+            return True
+        finally:
+            self.prefetch_tasks.pop(profile_url, None)
+            self.claimed_prefetches.discard(profile_url)
+
+    async def _wait_for_prefetch(self, profile_url: str) -> Optional[Dict[str, Any]]:
+        """Aynı profil için süren önceden çekme varsa bitmesini bekle"""
+        task = self.prefetch_tasks.get(profile_url)
+        if task is None:
+            return None
+        # Bekleyen istek varken baskı nedeniyle iptal edilmesin
+        self.claimed_prefetches.add(profile_url)
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+        except Exception:
+            pass
+        return self.get_prefetched(profile_url)
+    
+    def _conflicting_job(self, session_id: str, profile_url: str) -> Optional[Dict[str, Any]]:
+        """Session'da başka bir profil için çalışan iş varsa hata yanıtı"""
+        if session_id not in self._jobs:
+            return None
+        progress = self._job_progress[session_id]
+        if progress["profile_url"] == profile_url:
+            return None
+        return {
+            "error": f"Session {session_id} için başka bir profilin işbirlikçileri çekiliyor",
+            "status": "failed",
+            "job": progress
+        }
     
     async def get_collaborators(self, **kwargs) -> Dict[str, Any]:
         """İşbirlikçileri getir"""
         try:
             # Request'i doğrula
             request = CollaboratorRequest(**kwargs)
+            set_log_context(session_id=request.session_id)
             
             # Session kontrolü
             session_status = await self.file_manager.get_session_status(request.session_id)
@@ -50,25 +212,78 @@ class CollaboratorScraperTool:
                     "status": "failed"
                 }
             
-            # WebDriver ile scraping başlat
-            driver = await self.selenium_manager.get_driver()
+            # Session başına tek işbirlikçi işi çalışır (collaborators.json session'a ait)
+            conflict = self._conflicting_job(request.session_id, profile_url)
+            if conflict:
+                return conflict
             
-            try:
-                collaborators = await self._scrape_collaborators(driver, profile_url)
-                
-                # Sonuçları kaydet
-                await self.file_manager.save_collaborators(request.session_id, collaborators)
-                await self.file_manager.mark_session_complete(request.session_id, "collaborators")
-                
+            # Önceden çekilmiş (veya çekilmekte olan) sonuç varsa scrape etme
+            prefetched = self.get_prefetched(profile_url) or await self._wait_for_prefetch(profile_url)
+            metrics.increment("prefetch_lookups", outcome="hit" if prefetched else "miss")
+            if prefetched:
+                logger.info(f"İşbirlikçiler önbellekten döndürüldü: {profile_url}")
+                collaborators = prefetched["collaborators"]
+                # Beklerken başlayan bir iş varsa dosya onundur; sonucu kaydetmeden döndür
+                conflict = self._conflicting_job(request.session_id, profile_url)
+                if conflict:
+                    return conflict
+                if request.session_id not in self._jobs:
+                    with metrics.span("save_results", operation="collaborators"):
+                        await self.file_manager.save_collaborators(
+                            request.session_id, collaborators, {**prefetched["graph"], "requested_url": profile_url}
+                        )
+                        await self.file_manager.mark_session_complete(request.session_id, "collaborators")
                 return {
                     "session_id": request.session_id,
                     "collaborators": collaborators,
                     "total_count": len(collaborators),
-                    "status": "completed"
+                    "status": "completed",
+                    "prefetched": True
                 }
-            finally:
-                # Driver'ı kapat
-                await self.selenium_manager.close_driver(driver)
+            
+            conflict = self._conflicting_job(request.session_id, profile_url)
+            if conflict:
+                return conflict
+            task = self._jobs.get(request.session_id)
+            if task is None and session_status.get("collaborators_completed"):
+                # Biten işin sonucu: aynı profil için yeniden scrape etme (yarıda kalan kayıt devam eder)
+                saved = await self.file_manager.load_session_data(request.session_id, "collaborators") or {}
+                if not saved.get("cancelled") and profile_url in (saved.get("requested_url"), saved.get("profile_url")):
+                    return await self.get_saved_collaborators(request.session_id)
+            if task is not None:
+                progress = self._job_progress[request.session_id]
+            else:
+                progress = {
+                    "status": "running",
+                    "profile_url": profile_url,
+                    "started_at": datetime.now().isoformat(),
+                    "processed": 0,
+                    "total": None,
+                    "resumed_from": 0,
+                    "finished": False,
+                }
+                self._job_progress[request.session_id] = progress
+                # collaborators.json artık bu işe ait; önceki profilin tamamlandı işareti geçersiz
+                self.file_manager.clear_session_complete(request.session_id, "collaborators")
+                deadline = request.deadline_seconds or default_deadline()
+                task = asyncio.create_task(
+                    self._run_job(request.session_id, profile_url, request.profile, progress, deadline)
+                )
+                self._jobs[request.session_id] = task
+            
+            if request.wait:
+                return await asyncio.shield(task)
+            return {
+                "session_id": request.session_id,
+                "status": "running",
+                "job": progress,
+                "message": "İşbirlikçiler arka planda çekiliyor",
+                "next_steps": [
+                    f"check_scraping_status ile ilerlemeyi izleyin (session_id: {request.session_id})",
+                    "Bitince get_collaborators aynı argümanlarla sonucu döndürür; "
+                    "yarıda kalırsa kaldığı yerden devam eder"
+                ]
+            }
                 
         except Exception as e:
             logger.error(f"İşbirlikçi scraping hatası: {e}")
@@ -76,7 +291,103 @@ class CollaboratorScraperTool:
                 "error": str(e),
                 "status": "failed"
             }
-    
+
+    async def _run_job(self, session_id: str, profile_url: str, profile: Optional[str],
+                       progress: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Arka plan işbirlikçi işi: günlüğe yazarak çek, bitince sonucu kaydet"""
+        set_log_context(session_id=session_id)
+        with session_tasks.scope(session_id, "collaborators", deadline) as scope:
+            try:
+                return await self._run_job_steps(session_id, profile_url, profile, progress)
+            except (SessionCancelled, asyncio.CancelledError):
+                # Sahibi olmayan iptal (sunucu kapanışı): günlük korunur, iptal yayılır
+                if scope.reason is None:
+                    progress["status"] = "cancelled"
+                    raise
+                return await self._save_cancelled_job(session_id, profile_url, progress, scope.reason)
+            finally:
+                progress["finished_at"] = datetime.now().isoformat()
+                self._jobs.pop(session_id, None)
+
+    async def _save_cancelled_job(self, session_id: str, profile_url: str, progress: Dict[str, Any],
+                                  reason: str) -> Dict[str, Any]:
+        """Durdurulan işin günlükteki kayıtlarını "cancelled" işaretiyle kaydet; günlük devam için korunur"""
+        progress["status"] = "cancelled"
+        progress["cancel_reason"] = reason
+        journal = await self.file_manager.load_collaborator_journal(session_id)
+        collaborators, graph = [], {"profile_url": profile_url, "profile_name": "", "edges": []}
+        if journal and journal["header"].get("profile_url") == profile_url:
+            graph = journal["header"]["graph"]
+            collaborators = sorted(journal["records"], key=lambda collaborator: collaborator["id"])
+        await self.file_manager.save_collaborators(session_id, collaborators, {
+            **graph, "requested_url": profile_url, "cancelled": True, "cancel_reason": reason
+        })
+        logger.info(f"İşbirlikçi işi durduruldu ({reason}): {len(collaborators)} kayıt kaydedildi")
+        return {
+            "session_id": session_id,
+            "collaborators": collaborators,
+            "total_count": len(collaborators),
+            "status": "cancelled",
+            "cancel_reason": reason,
+            "job": progress
+        }
+
+    async def _run_job_steps(self, session_id: str, profile_url: str, profile: Optional[str],
+                             progress: Dict[str, Any]) -> Dict[str, Any]:
+        """İşi çalıştır ve sonucu kaydet; durdurma SessionCancelled olarak _run_job'a çıkar"""
+        try:
+            # İstenirse (profile argümanı veya YOK_PROFILE_MODE) görevi profille
+            profile_mode = resolve_profile_mode(profile)
+            with profile_session(profile_mode, self.file_manager.get_session_dir(session_id), "collaborators"):
+                collaborators, graph = await self.fetch_collaborators(profile_url, session_id, progress=progress)
+            
+            # Grafikteki merkez URL'i istenenden farklı yazılmış olabilir; tekrar eden çağrılar için istenen de saklanır
+            graph = {**graph, "requested_url": profile_url}
+            with metrics.span("save_results", operation="collaborators"):
+                await self.file_manager.save_collaborators(session_id, collaborators, graph)
+                if not progress["finished"]:
+                    # Günlük korunur; aynı çağrı kaldığı yerden devam eder
+                    progress["status"] = "failed"
+                    progress["error"] = "İşbirlikçi grafiği okunamadı veya iş yarıda kaldı"
+                    return {"error": progress["error"], "status": "failed", "session_id": session_id, "job": progress}
+                await self.file_manager.mark_session_complete(session_id, "collaborators")
+                self.file_manager.clear_collaborator_journal(session_id)
+            progress["status"] = "completed"
+            return {
+                "session_id": session_id,
+                "collaborators": collaborators,
+                "total_count": len(collaborators),
+                "status": "completed"
+            }
+        except SessionCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"İşbirlikçi işi hatası: {e}")
+            progress["status"] = "failed"
+            progress["error"] = str(e)
+            return {"error": str(e), "status": "failed", "session_id": session_id, "job": progress}
+
+    def get_job_progress(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Session'ın son işbirlikçi işinin ilerlemesi"""
+        return self._job_progress.get(session_id)
+
+    async def get_saved_collaborators(self, session_id: str, offset: int = 0) -> Dict[str, Any]:
+        """Kaydedilmiş işbirlikçileri offset'ten itibaren getir (yeniden scrape etmeden)"""
+        session_data = await self.file_manager.load_session_data(session_id, "collaborators")
+        if not session_data:
+            return {
+                "error": f"Session {session_id} için kaydedilmiş işbirlikçi yok",
+                "status": "failed"
+            }
+        collaborators = session_data.get("collaborators", [])
+        return {
+            "session_id": session_id,
+            "collaborators": collaborators[offset:],
+            "total_count": len(collaborators),
+            "offset": offset,
+            "status": "completed"
+        }
+
     async def _get_profile_url_by_id(self, session_id: str, profile_id: int) -> Optional[str]:
         """Profile ID'ye göre URL'i al"""
         try:
@@ -94,69 +405,163 @@ class CollaboratorScraperTool:
             logger.error(f"Profile URL alınamadı: {e}")
             return None
     
-    async def _scrape_collaborators(self, driver, profile_url: str) -> List[Dict[str, Any]]:
-        """İşbirlikçi scraping işlemi"""
-        collaborators = []
-        
-        try:
-            # Profil sayfasına git
-            logger.info(f"Profil sayfasına gidiliyor: {profile_url}")
+    async def _read_graph(self, driver, profile_url: str, operation: str = "collaborators") -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Profilin işbirlikçi grafiğini aç ve (isim/link listesi, grafik) döndür"""
+        # Profil sayfasına git
+        logger.info(f"Profil sayfasına gidiliyor: {profile_url}")
+        with metrics.span("navigate", operation=operation):
             await self.selenium_manager.navigate_to_page(driver, profile_url)
-            
-            # İşbirlikçiler sekmesine geç
+        
+        # İşbirlikçiler sekmesine geç
+        with metrics.span("graph_wait", operation=operation):
             if not await self.selenium_manager.wait_for_clickable(
                 driver, By.XPATH, "//a[@href='viewAuthorGraphs.jsp']"
             ):
                 raise Exception("İşbirlikçiler sekmesi bulunamadı")
-            
-            driver.find_element(By.XPATH, "//a[@href='viewAuthorGraphs.jsp']").click()
-            
+        
+            await self.selenium_manager.run(
+                driver, lambda: driver.find_element(By.XPATH, "//a[@href='viewAuthorGraphs.jsp']").click()
+            )
+        
             # Graph yüklenmesini bekle
             if not await self.selenium_manager.wait_for_element(driver, By.CSS_SELECTOR, "svg g"):
                 raise Exception("İşbirlikçi grafiği yüklenemedi")
+        
+        # Grafiğin veri setinden işbirlikçileri tek seferde çek
+        with metrics.span("graph_extraction", operation=operation):
+            return await self._extract_graph_collaborators(driver, profile_url)
+    
+    async def _scrape_collaborators(self, driver, profile_url: str, session_id: Optional[str] = None,
+                                    progress: Optional[Dict[str, Any]] = None,
+                                    strict: bool = False) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """İşbirlikçi scraping işlemi; (işbirlikçiler, grafik) döndürür
+        
+        session_id verilirse tamamlanan her işbirlikçi session'ın günlüğüne eklenir;
+        aynı profil için günlük varsa grafik yeniden okunmaz ve kalan işbirlikçilerden devam edilir.
+        """
+        collaborators = []
+        graph = {"profile_url": profile_url, "profile_name": "", "edges": []}
+        progress = progress if progress is not None else {}
+        original_driver = driver
+        
+        try:
+            journal = await self.file_manager.load_collaborator_journal(session_id) if session_id else None
+            if journal and journal["header"].get("profile_url") == profile_url:
+                isimler_ve_linkler, graph = journal["header"]["targets"], journal["header"]["graph"]
+                collaborators = journal["records"]
+                progress["resumed_from"] = len(collaborators)
+                logger.info(f"İşbirlikçi işi günlükten devam ediyor: {len(collaborators)}/{len(isimler_ve_linkler)}")
+            else:
+                # Okunamayan grafik hata fırlatır; boş liste profilin işbirlikçisi olmadığı anlamına gelir
+                isimler_ve_linkler, graph = await self._read_graph(driver, profile_url)
+                if not isimler_ve_linkler:
+                    logger.info(f"Profilin işbirlikçisi yok: {profile_url}")
+                    progress["total"] = progress["processed"] = 0
+                    progress["finished"] = True
+                    return collaborators, graph
+                
+                if session_id:
+                    await self.file_manager.start_collaborator_journal(
+                        session_id, {"profile_url": profile_url, "graph": graph, "targets": isimler_ve_linkler}
+                    )
             
-            # JavaScript ile işbirlikçi verilerini çek
-            script = """
-const gs = document.querySelectorAll('svg g');
-const results = [];
-for (let i = 2; i < gs.length; i++) {
-    const name = gs[i].querySelector('text')?.textContent.trim() || '';
-    gs[i].dispatchEvent(new MouseEvent('click', { bubbles: true }));
-    const href = document.getElementById('pageUrl')?.href || '';
-    results.push({ name, href });
-}
-return results;
-"""
-            isimler_ve_linkler = await self.selenium_manager.execute_script_safe(driver, script)
-            
-            if not isimler_ve_linkler:
-                logger.warning("İşbirlikçi verileri çekilemedi")
-                return collaborators
+            progress["total"] = len(isimler_ve_linkler)
+            progress["processed"] = len(collaborators)
+            done_ids = {collaborator["id"] for collaborator in collaborators}
             
             # Her işbirlikçi için detay bilgileri al
             for idx, obj in enumerate(isimler_ve_linkler, start=1):
+                if idx in done_ids:
+                    continue
+                check_cancelled()
                 try:
-                    collaborator = await self._extract_collaborator_data(driver, obj, idx)
+                    # Profil sayfaları bağımsız olduğundan şişen driver burada güvenle değiştirilebilir
+                    driver = await self.selenium_manager.recycle_if_needed(driver)
+                    with metrics.span("collaborator_detail", operation="collaborators"):
+                        collaborator = await self._extract_collaborator_data(driver, obj, idx)
                     if collaborator:
                         collaborators.append(collaborator)
+                        progress["processed"] = len(collaborators)
                         
-                        # Progressive saving
-                        if len(collaborators) % 10 == 0:
-                            await self.file_manager.save_collaborators(
-                                "temp_session", collaborators
-                            )
+                        if session_id:
+                            # Her kayıt günlüğe; abonelere ara sonuç PROGRESS_SAVE_EVERY kayıtta bir
+                            await self.file_manager.append_collaborator_record(session_id, collaborator)
+                            if len(collaborators) % PROGRESS_SAVE_EVERY == 0:
+                                await self.file_manager.save_collaborators(session_id, collaborators, graph)
                         
                         # Rate limiting
-                        await asyncio.sleep(0.5)
+                        await asyncio.sleep(self.collaborator_delay)
                 
                 except Exception as e:
                     logger.error(f"İşbirlikçi verisi çıkarılamadı: {e}")
             
-            return collaborators
+            # Devam edilen işte kayıtlar günlük sırasındadır; sonuç grafik sırasına döner
+            collaborators.sort(key=lambda collaborator: collaborator["id"])
+            progress["finished"] = True
+            return collaborators, graph
             
+        except SessionCancelled:
+            raise
         except Exception as e:
             logger.error(f"İşbirlikçi scraping hatası: {e}")
-            return collaborators
+            if strict:
+                raise
+            return collaborators, graph
+        finally:
+            # Yeniden başlatılan driver'ı kapat (orijinali çağıran kapatır)
+            if driver is not original_driver:
+                await self.selenium_manager.close_driver(driver)
+    
+    async def _extract_graph_collaborators(self, driver, profile_url: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """D3 grafiğinin düğüm/kenar verisinden isim, link ve ağırlıkları çıkar
+        
+        (işbirlikçiler, grafik) döndürür; grafik merkez profili ve linki olan
+        düğümler arasındaki tüm kenarları URL'lerle içerir.
+        """
+        graph = await self.selenium_manager.execute_script_safe(driver, GRAPH_DATA_SCRIPT)
+        nodes = (graph or {}).get("nodes") or []
+        edges = (graph or {}).get("edges") or []
+        
+        if not nodes or not any(node.get("href") for node in nodes):
+            # Veri setinde link yoksa eski tıklama yöntemine dön
+            logger.warning("Grafik verisinde link bulunamadı, tıklama yöntemine dönülüyor")
+            collaborators = await self.selenium_manager.execute_script_safe(driver, GRAPH_CLICK_SCRIPT)
+            if collaborators is None:
+                raise Exception("İşbirlikçi grafiği okunamadı")
+            return collaborators, {"profile_url": profile_url, "profile_name": "", "edges": []}
+        
+        # Merkez düğüm: profilin kendisi, yoksa en çok bağlantısı olan düğüm
+        degree: Dict[int, float] = {}
+        for edge in edges:
+            degree[edge["source"]] = degree.get(edge["source"], 0) + 1
+            degree[edge["target"]] = degree.get(edge["target"], 0) + 1
+        center = next((node["index"] for node in nodes if node.get("href") == profile_url), None)
+        if center is None:
+            center = max(degree, key=degree.get) if degree else nodes[0]["index"]
+        
+        weights: Dict[int, float] = {}
+        for edge in edges:
+            if edge["source"] == center:
+                weights[edge["target"]] = weights.get(edge["target"], 0) + edge["weight"]
+            elif edge["target"] == center:
+                weights[edge["source"]] = weights.get(edge["source"], 0) + edge["weight"]
+        
+        collaborators = [
+            {"name": node["name"], "href": node["href"], "weight": weights.get(node["index"])}
+            for node in nodes if node["index"] != center
+        ]
+        
+        # Merkez linki sayfadaki düğümde yoksa istenen profil URL'i kullanılır
+        hrefs = {node["index"]: node.get("href") or "" for node in nodes}
+        hrefs[center] = hrefs.get(center) or profile_url
+        graph_edges = [
+            {"source": hrefs[edge["source"]], "target": hrefs[edge["target"]], "weight": edge["weight"]}
+            for edge in edges
+            if hrefs.get(edge["source"]) and hrefs.get(edge["target"]) and edge["source"] != edge["target"]
+        ]
+        center_name = next((node["name"] for node in nodes if node["index"] == center), "")
+        logger.info(f"Grafik verisinden {len(collaborators)} işbirlikçi ve {len(edges)} bağlantı çıkarıldı")
+        return collaborators, {"profile_url": hrefs[center], "profile_name": center_name, "edges": graph_edges}
     
     async def _extract_collaborator_data(self, driver, obj: Dict[str, str], idx: int) -> Optional[Dict[str, Any]]:
         """İşbirlikçi verilerini çıkar"""
@@ -168,7 +573,6 @@ return results;
             info = ""
             deleted = False
             title = ''
-            header = ''
             green_label = ''
             blue_label = ''
             keywords_str = ''
@@ -182,64 +586,22 @@ return results;
                 # İşbirlikçi profil sayfasına git
                 await self.selenium_manager.navigate_to_page(driver, href)
                 
-                # Profil bilgilerini çek
-                tds = driver.find_elements(By.XPATH, "//td[h6]")
-                if not tds:
+                # Sayfanın tek bir anlık görüntüsünü al ve tarayıcıdan bağımsız ayrıştır
+                page_source, page_url = await self.selenium_manager.run(
+                    driver, lambda: (driver.page_source, driver.current_url)
+                )
+                details = await asyncio.to_thread(parse_profile_page, page_source, page_url, self.default_photo_url)
+                if not details:
                     photo_url = self.default_photo_url
                     deleted = True
                 else:
-                    info = tds[0].text
-                    info_lines = info.splitlines()
-                    
-                    if len(info_lines) > 1:
-                        title = info_lines[0].strip()
-                        name = info_lines[1].strip()
-                    else:
-                        title = isim
-                        name = isim
-                    
-                    header = info_lines[2].strip() if len(info_lines) > 2 else ''
-                    
-                    # Label'ları çek
-                    try:
-                        green_span = tds[0].find_element(By.CSS_SELECTOR, 'span.label-success')
-                        green_label = green_span.text.strip()
-                    except Exception:
-                        pass
-                    
-                    try:
-                        blue_span = tds[0].find_element(By.CSS_SELECTOR, 'span.label-primary')
-                        blue_label = blue_span.text.strip()
-                        
-                        # Keywords'i çek
-                        td_html = tds[0].get_attribute('innerHTML')
-                        import re
-                        if isinstance(td_html, str):
-                            m = re.search(r'<span[^>]*label-primary[^>]*>.*?</span>([^<]*)', td_html)
-                            if m:
-                                kw = m.group(1).strip()
-                                if kw:
-                                    keywords_str = kw
-                    except Exception:
-                        pass
-                    
-                    # Email
-                    try:
-                        email_link = tds[0].find_element(By.CSS_SELECTOR, "a[href^='mailto']")
-                        email = email_link.text.strip().replace('[at]', '@')
-                    except Exception:
-                        email = ''
-                    
-                    # Fotoğraf
-                    try:
-                        img = driver.find_element(By.CSS_SELECTOR, "img.img-circle")
-                        photo_url = img.get_attribute("src")
-                    except Exception:
-                        try:
-                            img = driver.find_element(By.CSS_SELECTOR, "img#imgPicture")
-                            photo_url = img.get_attribute("src")
-                        except Exception:
-                            photo_url = self.default_photo_url
+                    info = details["info"]
+                    title = details["title"] or isim
+                    green_label = details["green_label"]
+                    blue_label = details["blue_label"]
+                    keywords_str = details["keywords"]
+                    email = details["email"]
+                    photo_url = details["photoUrl"]
             
             return {
                 "id": idx,
@@ -253,7 +615,8 @@ return results;
                 "status": "completed",
                 "deleted": deleted,
                 "url": href if not deleted else "",
-                "email": email
+                "email": email,
+                "weight": obj.get("weight")
             }
             
         except Exception as e:
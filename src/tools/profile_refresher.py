@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+from utils.file_manager import FileManager
+from utils.html_parser import parse_profile_page, DEFAULT_PHOTO_URL
+from utils.metrics import metrics
+from utils.logging_setup import HOT, set_log_context
+from utils.cancellation import session_tasks
+
+logger = logging.getLogger(__name__)
+
+# İçerik hash'ine giren alanlar (info ham metindir, bu alanların tekrarıdır)
+HASH_FIELDS = ("name", "title", "header", "green_label", "blue_label", "keywords", "email", "photoUrl")
+
+# Ara kayıt aralığı (işlenen profil sayısı)
+SAVE_EVERY = 100
+
+
+def content_hash(profile: Dict[str, Any]) -> str:
+    """Profilin çıkarılmış alanlarının hash'i"""
+    payload = json.dumps([profile.get(field) or "" for field in HASH_FIELDS], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ProfileRefreshTool:
+    """Kayıtlı session'daki profil sayfalarını yeniden ziyaret edip sadece değişen kayıtları günceller
+
+    Sayfalar Selenium yerine HTTP ile çekilir; önceki cevabın ETag/Last-Modified
+    değerleri koşullu istekte gönderilir ve 304 dönen profiller ayrıştırılmadan atlanır.
+    """
+
+    def __init__(
+        self,
+        file_manager: Optional[FileManager] = None,
+        concurrency: Optional[int] = None,
+        timeout: float = 20.0,
+        http_session: Optional[requests.Session] = None,
+        interval: Optional[float] = None
+    ):
+        self.file_manager = file_manager or FileManager()
+        self.concurrency = concurrency or int(os.getenv("YOK_REFRESH_CONCURRENCY", "4"))
+        # İki istek başlangıcı arasındaki en kısa süre (saniye); siteye yük bindirmesin
+        self.interval = interval if interval is not None else float(os.getenv("YOK_REFRESH_INTERVAL", "0.5"))
+        self._next_slot = 0.0
+        self.timeout = timeout
+        self.http = http_session or requests.Session()
+        self.http.headers.setdefault("User-Agent", "Mozilla/5.0 (X11; Linux x86_64) yok-akademik-refresh")
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._progress: Dict[str, Dict[str, Any]] = {}
+
+    def _fetch(self, url: str, etag: Optional[str], last_modified: Optional[str]) -> Tuple[int, str, Dict[str, str]]:
+        """Profil sayfasını koşullu GET ile çek (thread'de çalışır)"""
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        response = self.http.get(url, headers=headers, timeout=self.timeout)
+        validators = {key: response.headers[header] for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified"))
+                      if header in response.headers}
+        return response.status_code, response.text if response.status_code != 304 else "", validators
+
+    async def _throttle(self):
+        """İstek başlangıçlarını en az interval saniye aralıkla sırala"""
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def refresh_profile(self, profile: Dict[str, Any], now: str) -> str:
+        """Tek profili yenile; sonuç: not_modified, unchanged, changed, baselined, deleted veya failed"""
+        url = profile.get("url")
+        if not url:
+            return "failed"
+        try:
+            with metrics.span("refresh_fetch", operation="refresh"):
+                status, source, validators = await asyncio.to_thread(
+                    self._fetch, url, profile.get("etag"), profile.get("last_modified")
+                )
+        except requests.RequestException as e:
+            logger.warning(f"Profil çekilemedi {url}: {e}")
+            return "failed"
+
+        profile["checked_at"] = now
+        if status == 304:
+            return "not_modified"
+        # Sadece 404/410 silinme sayılır; 403/429 gibi cevaplar geçici engeldir
+        if status in (404, 410):
+            if not profile.get("deleted"):
+                profile["deleted"] = True
+                profile["changed_at"] = now
+                return "deleted"
+            return "unchanged"
+        if status != 200:
+            return "failed"
+
+        details = await asyncio.to_thread(parse_profile_page, source, url, DEFAULT_PHOTO_URL)
+        if details is None:
+            # Bakım/hata sayfası: kayıt ve doğrulayıcılar (ETag) korunur, sonraki yenilemede tekrar denenir
+            logger.warning(f"Profil sayfası ayrıştırılamadı {url}")
+            return "failed"
+        profile.update(validators)
+
+        new_hash = content_hash(details)
+        old_hash = profile.get("content_hash")
+        if old_hash == new_hash and not profile.get("deleted"):
+            return "unchanged"
+
+        # Arama satırından gelen kayıtta hash yoktur: ilk yenileme taban değeri kaydeder
+        changed_fields = [field for field in HASH_FIELDS if (profile.get(field) or "") != (details.get(field) or "")]
+        for field in HASH_FIELDS + ("info",):
+            profile[field] = details.get(field) or ""
+        profile["content_hash"] = new_hash
+        profile.pop("deleted", None)
+        if old_hash is None:
+            return "baselined"
+        profile["changed_at"] = now
+        profile["changed_fields"] = changed_fields
+        return "changed"
+
+    async def _run_refresh(self, session_id: str, data: Dict[str, Any], max_profiles: Optional[int]):
+        """Profilleri sınırlı eşzamanlılıkla yenile, ara ara kaydet"""
+        set_log_context(session_id=session_id)
+        progress = self._progress[session_id]
+        profiles = [profile for profile in data.get("profiles", []) if profile.get("url")]
+        if max_profiles:
+            profiles = profiles[:max_profiles]
+        progress["total"] = len(profiles)
+        now = datetime.now().isoformat()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def refresh_one(profile: Dict[str, Any]):
+            async with semaphore:
+                await self._throttle()
+                outcome = await self.refresh_profile(profile, now)
+            progress["counts"][outcome] = progress["counts"].get(outcome, 0) + 1
+            progress["processed"] += 1
+            metrics.increment("refresh_profiles", outcome=outcome)
+            if outcome in ("changed", "deleted"):
+                logger.info("Profil değişti: %s (%s)", profile.get("name"), outcome, extra=HOT)
+            if progress["processed"] % SAVE_EVERY == 0:
+                await self.file_manager.save_completed_profiles(session_id, data)
+
+        with session_tasks.scope(session_id, "refresh") as scope:
+            try:
+                with metrics.span("refresh_total", operation="refresh"):
+                    await asyncio.gather(*(refresh_one(profile) for profile in profiles))
+                data["refreshed_at"] = now
+                progress["status"] = "completed"
+            except asyncio.CancelledError:
+                progress["status"] = "cancelled"
+                # cancel_session ile durdurulduysa yenilenen profiller aşağıda kaydedilir
+                if scope.reason is None:
+                    raise
+                progress["cancel_reason"] = scope.reason
+            except Exception as e:
+                logger.error(f"Yenileme hatası: {e}")
+                progress["status"] = "failed"
+                progress["error"] = str(e)
+            finally:
+                await self.file_manager.save_completed_profiles(session_id, data)
+                progress["finished_at"] = datetime.now().isoformat()
+                self._tasks.pop(session_id, None)
+                logger.info(f"Yenileme bitti: {session_id} {progress['counts']}")
+
+    async def refresh_session(self, session_id: str, max_profiles: Optional[int] = None, wait: bool = False) -> Dict[str, Any]:
+        """Tamamlanmış bir session'ın profillerini yenile (arka planda; wait=True ise bitmesini bekler)"""
+        try:
+            if session_id in self._tasks:
+                return {"success": True, "session_id": session_id, "message": "Yenileme zaten çalışıyor",
+                        **self._progress[session_id]}
+
+            status = await self.file_manager.get_session_status(session_id)
+            if status["status"] == "not_found":
+                return {"error": f"Session {session_id} bulunamadı", "status": "failed"}
+            if not status.get("profiles_completed"):
+                return {"error": f"Session {session_id} henüz tamamlanmadı, yenilenemez", "status": "failed"}
+            data = await self.file_manager.load_session_data(session_id, "profiles")
+
+            self._progress[session_id] = {
+                "status": "running",
+                "started_at": datetime.now().isoformat(),
+                "processed": 0,
+                "total": None,
+                "counts": {},
+            }
+            task = asyncio.create_task(self._run_refresh(session_id, data, max_profiles))
+            self._tasks[session_id] = task
+            if wait:
+                await task
+            return {"success": True, "session_id": session_id, **self._progress[session_id]}
+        except Exception as e:
+            logger.error(f"Yenileme başlatılamadı: {e}")
+            return {"error": f"Yenileme başlatılamadı: {str(e)}", "status": "failed"}
+
+    def get_progress(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Son yenilemenin ilerlemesi"""
+        return self._progress.get(session_id)
@@ -1,9 +1,11 @@
 import asyncio
+import json
+import os
 import re
 import uuid
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -14,6 +16,13 @@ from models.schemas import SearchRequest, AcademicProfile, SessionStatus
 from utils.selenium_manager import SeleniumManager
 from utils.file_manager import FileManager
 from utils.stream_manager import stream_manager
+from utils.html_parser import parse_profile_rows, has_next_page
+from utils.metrics import metrics
+from utils.profiling import resolve_profile_mode, profile_session
+from utils.memory_monitor import memory_monitor, estimate_size
+from utils.logging_setup import HOT, set_log_context
+from utils.cancellation import CancelScope, SessionCancelled, check_cancelled, default_deadline, session_tasks
+from utils.client_registry import session_ownership
 
 
 logger = logging.getLogger(__name__)
@@ -21,11 +30,26 @@ logger = logging.getLogger(__name__)
 class ProfileScraperTool:
     """Akademisyen profil scraper tool'u"""
     
-    def __init__(self):
-        self.selenium_manager = SeleniumManager()
-        self.file_manager = FileManager()
-        self.base_url = "https://akademik.yok.gov.tr/"
+    def __init__(
+        self,
+        selenium_manager: Optional[SeleniumManager] = None,
+        file_manager: Optional[FileManager] = None,
+        base_url: str = "https://akademik.yok.gov.tr/"
+    ):
+        self.selenium_manager = selenium_manager or SeleniumManager(block_preset="search-minimal")
+        self.file_manager = file_manager or FileManager()
+        self.base_url = base_url
         self.default_photo_url = "/default_photo.jpg"
+        # Arama gönderildikten sonra Akademisyenler sekmesi aranmadan önceki bekleme (saniye)
+        self.tab_delay = 3
+        # Devam eden scrape'lerin bellekteki profil listeleri (bellek raporu için)
+        self._in_flight_profiles: Dict[str, List[Dict[str, Any]]] = {}
+        # quick_search bekleyicileri: session_id -> (beklenen profil sayısı, olay)
+        self._result_waiters: Dict[str, Tuple[int, asyncio.Event]] = {}
+        memory_monitor.register_session_source(
+            "in_flight_profiles",
+            lambda: {sid: estimate_size(profiles) for sid, profiles in list(self._in_flight_profiles.items())}
+        )
     
     def _generate_session_id(self) -> str:
         """Benzersiz session ID oluştur"""
@@ -65,9 +89,6 @@ class ProfileScraperTool:
             # Stream başlat
             await stream_manager.start_streaming(session_id, self._stream_callback)
             
-            # Fields verilerini yükle
-            fields_data = await self.file_manager.load_fields()
-            
             # Filtreleme parametrelerini hazırla
             selected_field = None
             selected_specialties = []
@@ -84,7 +105,7 @@ class ProfileScraperTool:
                 specialty_ids = [int(s.strip()) for s in request.specialty_ids.split(',')]
                 for specialty_id in specialty_ids:
                     specialty_name = self.file_manager.get_specialty_name_by_id(
-                        fields_data, request.field_id, specialty_id
+                        request.field_id, specialty_id
                     )
                     if specialty_name:
                         selected_specialties.append(specialty_name)
@@ -110,74 +131,171 @@ class ProfileScraperTool:
                 "status": "failed"
             }
     
+    async def search_and_wait(self, name: str, max_results: int = 10, owner: Optional[str] = None,
+                              discard: bool = False) -> Tuple[str, List[Dict[str, Any]]]:
+        """Aramayı arka plana atmadan çalıştır; (session_id, profiller) döndürür
+
+        owner verilirse session ilk kayıttan önce ona atanır (diğer istemciler erişemez).
+        discard ise session dizini sonuç okunduktan sonra (hata olsa da) silinir.
+        """
+        session_id = self._generate_session_id()
+        if owner is not None:
+            session_ownership.claim(session_id, owner)
+        request = SearchRequest(name=name, max_results=max_results)
+        try:
+            # Ayrı görev: cancel_session yalnızca aramayı durdurur, bekleyen çağıranı değil
+            await asyncio.create_task(self._async_scrape_profiles(request, session_id, None, []))
+            session_data = await self.file_manager.load_session_data(session_id, "profiles") or {}
+            return session_id, session_data.get("profiles", [])
+        finally:
+            if discard:
+                await self.file_manager.delete_session(session_id)
+    
+    async def resolve_fields(self, query: Optional[str] = None, field_id: Optional[int] = None) -> Dict[str, Any]:
+        """Alan/uzmanlık ID'lerini isimden veya alan ID'sinden çöz"""
+        try:
+            taxonomy = self.file_manager.taxonomy
+            
+            if field_id is not None:
+                field_name = taxonomy.get_field_name(field_id)
+                if not field_name:
+                    return {
+                        "error": f"Alan ID {field_id} bulunamadı",
+                        "status": "failed"
+                    }
+                return {
+                    "success": True,
+                    "field_id": field_id,
+                    "field_name": field_name,
+                    "specialties": taxonomy.get_specialties(field_id)
+                }
+            
+            if query:
+                matches = taxonomy.search(query)
+                return {
+                    "success": True,
+                    "query": query,
+                    "fields": matches["fields"],
+                    "specialties": matches["specialties"]
+                }
+            
+            # Parametre yoksa sadece alan listesini döndür
+            return {
+                "success": True,
+                "fields": [
+                    {"field_id": field["id"], "name": field["name"], "specialty_count": len(field.get("specialties", []))}
+                    for field in taxonomy.fields
+                ]
+            }
+        except Exception as e:
+            logger.error(f"Alan çözümleme hatası: {e}")
+            return {
+                "error": str(e),
+                "status": "failed"
+            }
+    
     async def _stream_callback(self, message: Dict[str, Any]):
         """Stream callback - real-time updates"""
-        logger.info(f"Stream update: {message}")
+        # Mesaj tüm profil listesini taşır; sadece tür ve sayı loglanır
+        logger.info("Stream update: %s (%s profil)", message.get("type"), message.get("count", "-"), extra=HOT)
         # Bu callback MCP server'a real-time updates gönderecek
     
     async def _async_scrape_profiles(self, request: SearchRequest, session_id: str, 
                                    selected_field: Optional[str], selected_specialties: List[str]):
         """Async scraping işlemi"""
+        set_log_context(session_id=session_id)
+        try:
+            with session_tasks.scope(session_id, "profile_search", request.deadline_seconds or default_deadline()) as scope:
+                await self._run_scrape_profiles(request, session_id, selected_field, selected_specialties, scope)
+        finally:
+            # Sonuç dosyası yazıldı (tamamlandı, hata verdi veya durduruldu)
+            self._notify_results(session_id)
+
+    def _notify_results(self, session_id: str, count: Optional[int] = None):
+        """Bekleyen quick_search'ü uyar: yeterli profil geldiyse veya arama bittiyse (count=None)"""
+        waiter = self._result_waiters.get(session_id)
+        if waiter and (count is None or count >= waiter[0]):
+            waiter[1].set()
+
+    async def _run_scrape_profiles(self, request: SearchRequest, session_id: str,
+                                   selected_field: Optional[str], selected_specialties: List[str], scope: CancelScope):
+        """Aramayı çalıştır ve sonucu kaydet; durdurulursa kısmi sonucu işaretleyerek kaydet"""
         try:
             logger.info(f"Async scraping başlatıldı: {session_id}")
             logger.info(f"Request: {request.name}, field: {selected_field}, specialties: {selected_specialties}")
             
-            # WebDriver ile scraping başlat - Smithery için güvenli hale getirildi
-            driver = None
-            try:
-                logger.info("WebDriver oluşturuluyor...")
-                driver = await self.selenium_manager.get_driver()
-                logger.info("WebDriver başarıyla oluşturuldu, scraping başlıyor...")
+            # İstenirse (profile argümanı veya YOK_PROFILE_MODE) görevi profille
+            profile_mode = resolve_profile_mode(request.profile)
+            with profile_session(profile_mode, self.file_manager.get_session_dir(session_id), "profile_search"):
+                # WebDriver ile scraping başlat - Smithery için güvenli hale getirildi
+                driver = None
+                try:
+                    logger.info("WebDriver oluşturuluyor...")
+                    with metrics.span("driver_startup", operation="profile_search"):
+                        driver = await self.selenium_manager.get_driver(
+                            session_id=session_id, operation="profile_search"
+                        )
+                    logger.info("WebDriver başarıyla oluşturuldu, scraping başlıyor...")
                 
-                profiles = await self._scrape_profiles(
-                    driver, request, session_id, selected_field, selected_specialties
-                )
+                    with metrics.span("scrape_total", operation="profile_search"):
+                        profiles = await self._scrape_profiles(
+                            driver, request, session_id, selected_field, selected_specialties
+                        )
                 
-                logger.info(f"Scraping tamamlandı: {len(profiles)} profil bulundu")
+                    logger.info(f"Scraping tamamlandı: {len(profiles)} profil bulundu")
                 
-                # Sonuçları kaydet
-                save_success = await self.file_manager.save_profiles(session_id, profiles)
-                if save_success:
-                    logger.info(f"Profil verileri kaydedildi: {len(profiles)} profil")
+                    # Sonuçları kaydet
+                    with metrics.span("save_results", operation="profile_search"):
+                        save_success = await self.file_manager.save_profiles(session_id, profiles)
+                    if save_success:
+                        logger.info(f"Profil verileri kaydedildi: {len(profiles)} profil")
                     
-                    # JSON dosyasına completed ekle
-                    final_data = {
-                        "profiles": profiles,
-                        "completed": True,
-                        "total_count": len(profiles),
-                        "session_id": session_id,
-                        "completed_at": datetime.now().isoformat()
-                    }
+                        # JSON dosyasına completed ekle
+                        final_data = {
+                            "profiles": profiles,
+                            "completed": True,
+                            "total_count": len(profiles),
+                            "session_id": session_id,
+                            "completed_at": datetime.now().isoformat()
+                        }
                     
-                    # Tamamlanmış veriyi kaydet
-                    await self.file_manager.save_completed_profiles(session_id, final_data)
+                        # Tamamlanmış veriyi kaydet
+                        with metrics.span("save_results", operation="profile_search"):
+                            await self.file_manager.save_completed_profiles(session_id, final_data)
                     
-                    # Sadece profil bulunduysa session'ı tamamlandı olarak işaretle
-                    if len(profiles) > 0:
-                        await self.file_manager.mark_session_complete(session_id, "main")
-                        logger.info("Session tamamlandı olarak işaretlendi")
+                        # Sadece profil bulunduysa session'ı tamamlandı olarak işaretle
+                        if len(profiles) > 0:
+                            await self.file_manager.mark_session_complete(session_id, "main")
+                            logger.info("Session tamamlandı olarak işaretlendi")
+                        else:
+                            logger.warning("Hiç profil bulunamadı, session tamamlanmadı")
+                            # Boş session dosyası oluştur
+                            await self.file_manager.save_profiles(session_id, [])
                     else:
-                        logger.warning("Hiç profil bulunamadı, session tamamlanmadı")
-                        # Boş session dosyası oluştur
+                        logger.error("Profil verileri kaydedilemedi!")
+                        # Hata durumunda boş session dosyası oluştur
                         await self.file_manager.save_profiles(session_id, [])
-                else:
-                    logger.error("Profil verileri kaydedilemedi!")
+                    
+                except (SessionCancelled, asyncio.CancelledError):
+                    # Sahibi olmayan iptal (sunucu kapanışı) yayılır
+                    if scope.reason is None:
+                        raise
+                    await self._save_cancelled_profiles(session_id, scope.reason)
+                except Exception as e:
+                    logger.error(f"Scraping hatası: {e}")
+                    import traceback
+                    logger.error(f"Traceback: {traceback.format_exc()}")
                     # Hata durumunda boş session dosyası oluştur
                     await self.file_manager.save_profiles(session_id, [])
-                    
-            except Exception as e:
-                logger.error(f"Scraping hatası: {e}")
-                import traceback
-                logger.error(f"Traceback: {traceback.format_exc()}")
-                # Hata durumunda boş session dosyası oluştur
-                await self.file_manager.save_profiles(session_id, [])
-            finally:
-                # Driver'ı güvenli şekilde kapat
-                if driver:
-                    try:
-                        await self.selenium_manager.close_driver(driver)
-                    except Exception as e:
-                        logger.warning(f"Driver kapatma hatası: {e}")
+                finally:
+                    self._in_flight_profiles.pop(session_id, None)
+                    # Driver'ı güvenli şekilde kapat
+                    if driver:
+                        try:
+                            with metrics.span("driver_close", operation="profile_search"):
+                                await self.selenium_manager.close_driver(driver)
+                        except Exception as e:
+                            logger.warning(f"Driver kapatma hatası: {e}")
                 
         except Exception as e:
             logger.error(f"Async scraping hatası: {e}")
@@ -185,6 +303,20 @@ class ProfileScraperTool:
             logger.error(f"Traceback: {traceback.format_exc()}")
             # Hata durumunda session'ı işaretleme
     
+    async def _save_cancelled_profiles(self, session_id: str, reason: str):
+        """Durdurulan aramanın o ana kadarki profillerini "cancelled" işaretiyle kaydet"""
+        profiles = list(self._in_flight_profiles.get(session_id, []))
+        await self.file_manager.save_completed_profiles(session_id, {
+            "profiles": profiles,
+            "completed": False,
+            "cancelled": True,
+            "cancel_reason": reason,
+            "total_count": len(profiles),
+            "session_id": session_id,
+            "cancelled_at": datetime.now().isoformat()
+        })
+        logger.info(f"Arama durduruldu ({reason}): {len(profiles)} profil kaydedildi")
+    
     async def _scrape_profiles(
         self, 
         driver, 
@@ -202,242 +334,229 @@ class ProfileScraperTool:
         try:
             # Ana sayfaya git
             logger.info("YÖK ana sayfasına gidiliyor...")
-            success = await self.selenium_manager.navigate_to_page(driver, self.base_url + "AkademikArama/")
+            with metrics.span("navigate", operation="profile_search"):
+                success = await self.selenium_manager.navigate_to_page(driver, self.base_url + "AkademikArama/")
             if not success:
                 raise Exception("Ana sayfa yüklenemedi")
             logger.info("Ana sayfa yüklendi")
             
             # Arama kutusunu bekle
             logger.info("Arama kutusu bekleniyor...")
-            search_box = await self.selenium_manager.wait_for_element(driver, By.ID, "aramaTerim")
+            with metrics.span("search_box_wait", operation="profile_search"):
+                search_box = await self.selenium_manager.wait_for_element(driver, By.ID, "aramaTerim")
             if not search_box:
                 raise Exception("Arama kutusu bulunamadı")
             logger.info("Arama kutusu bulundu!")
             
             # Çerez onayını dene
-            await self.selenium_manager.handle_cookies(driver)
+            with metrics.span("cookie_consent", operation="profile_search"):
+                await self.selenium_manager.handle_cookies(driver)
             
             # Arama yap
             logger.info(f"Arama yapılıyor: {request.name}")
             
             # Network isteklerini temizle (önceki istekleri temizle)
-            self.selenium_manager.clear_network_requests(driver)
-            
-            search_box = driver.find_element(By.ID, "aramaTerim")
-            search_box.clear()
-            search_box.send_keys(request.name)
-            logger.info("Arama terimi girildi")
+            await self.selenium_manager.run(driver, self.selenium_manager.clear_network_requests, driver)
             
-            search_button = driver.find_element(By.ID, "searchButton")
-            search_button.click()
-            logger.info("Arama butonu tıklandı!")
-            
-            # Network isteklerini izle
-            await asyncio.sleep(2)  # İsteklerin gelmesini bekle
-            network_requests = self.selenium_manager.get_network_requests(driver, "AkademikArama")
-            logger.info(f"Network istekleri bulundu: {len(network_requests)}")
-            
-            for req in network_requests:
-                logger.info(f"Network isteği: {req.url}")
-                if req.response:
-                    logger.info(f"Response status: {req.response.status_code}")
+            with metrics.span("search_submit", operation="profile_search"):
+                await self.selenium_manager.run(driver, self._submit_search, driver, request.name)
+                logger.info("Arama butonu tıklandı!")
             
             # Hemen Akademisyenler sekmesini bekle ve tıkla
-            try:
-                # Önce sayfanın yüklenmesini bekle
-                await asyncio.sleep(3)
-                
-                # Akademisyenler linkini farklı yöntemlerle bul
-                akademisyenler_link = None
-                
-                # Yöntem 1: Link text ile
+            with metrics.span("tab_wait", operation="profile_search"):
                 try:
-                    akademisyenler_link = WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable((By.LINK_TEXT, "Akademisyenler"))
-                    )
-                except:
-                    pass
+                    # Önce sayfanın yüklenmesini bekle
+                    await asyncio.sleep(self.tab_delay)
                 
-                # Yöntem 2: Partial text ile
-                if not akademisyenler_link:
-                    try:
-                        akademisyenler_link = WebDriverWait(driver, 3).until(
-                            EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, "Akademisyen"))
-                        )
-                    except:
-                        pass
+                    # Akademisyenler linkini farklı yöntemlerle bul
+                    akademisyenler_link = await self.selenium_manager.run(driver, self._find_academics_tab, driver)
                 
-                # Yöntem 3: CSS selector ile
-                if not akademisyenler_link:
-                    try:
-                        akademisyenler_link = driver.find_element(By.CSS_SELECTOR, "a[href*='akademisyen']")
-                    except:
-                        pass
-                
-                if akademisyenler_link:
-                    akademisyenler_link.click()
-                    logger.info("Akademisyenler sekmesine geçildi")
-                    await asyncio.sleep(2)
-                else:
-                    logger.warning("Akademisyenler sekmesi bulunamadı, mevcut sayfada devam ediliyor")
+                    if akademisyenler_link:
+                        # Sonuç listesinin yanıtını yakalamak için önceki istekleri temizle
+                        await self.selenium_manager.run(driver, self.selenium_manager.clear_network_requests, driver)
+                        await self.selenium_manager.run(driver, akademisyenler_link.click)
+                        logger.info("Akademisyenler sekmesine geçildi")
+                    else:
+                        logger.warning("Akademisyenler sekmesi bulunamadı, mevcut sayfada devam ediliyor")
                     
-            except Exception as e:
-                logger.error(f"Akademisyenler sekmesi hatası: {e}")
-                # Sekme bulunamazsa devam et
+                except Exception as e:
+                    logger.error(f"Akademisyenler sekmesi hatası: {e}")
+                    # Sekme bulunamazsa devam et
             
             # Profil satırlarını topla
             profiles = []
+            self._in_flight_profiles[session_id] = profiles
             profile_urls = set()
             page_num = 1
             profile_id_counter = 1
             while True:
+                check_cancelled()
+                set_log_context(page=page_num)
                 logger.info(f"{page_num}. sayfa yükleniyor...")
                 
-                # Sayfa yüklenmesini bekle
-                await asyncio.sleep(1)
-                
-                # Profil satırlarını farklı yöntemlerle bul
-                profile_rows = []
+                # Önce sonuçları taşıyan ağ yanıtını oku, DOM render'ını bekleme
+                with metrics.span("page_wait", operation="profile_search"):
+                    captured = await self._wait_for_search_response(driver)
+                    if captured:
+                        page_source, page_url = captured
+                        logger.info(f"{page_num}. sayfa ağ yanıtından okunuyor: {page_url}")
+                    else:
+                        # Sayfa yüklenmesini bekle
+                        await asyncio.sleep(1)
+                        try:
+                            await self.selenium_manager.run(
+                                driver, WebDriverWait(driver, 5).until,
+                                EC.presence_of_element_located((By.CSS_SELECTOR, "tr[id^='authorInfo_']"))
+                            )
+                        except Exception as e:
+                            logger.warning(f"authorInfo_ profilleri bulunamadı: {e}")
+                    
+                        # Sayfanın tek bir anlık görüntüsünü al
+                        page_source, page_url = await self.selenium_manager.run(driver, self._snapshot, driver)
                 
-                # Yöntem 1: authorInfo_ ile başlayan ID'ler
-                try:
-                    WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "tr[id^='authorInfo_']"))
+                # Tarayıcıdan bağımsız ayrıştır
+                with metrics.span("row_extraction", operation="profile_search"):
+                    page_profiles = await asyncio.to_thread(
+                        parse_profile_rows, page_source, page_url, self.default_photo_url
                     )
-                    profile_rows = driver.find_elements(By.CSS_SELECTOR, "tr[id^='authorInfo_']")
-                except Exception as e:
-                    logger.warning(f"authorInfo_ profilleri bulunamadı: {e}")
-                
-                # Yöntem 2: Tablo satırları
-                if not profile_rows:
-                    try:
-                        profile_rows = driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
-                        # Boş satırları filtrele
-                        profile_rows = [row for row in profile_rows if row.find_elements(By.CSS_SELECTOR, "td")]
-                    except Exception as e:
-                        logger.warning(f"Tablo satırları bulunamadı: {e}")
                 
-                # Yöntem 3: Link içeren satırlar
-                if not profile_rows:
-                    try:
-                        profile_rows = driver.find_elements(By.CSS_SELECTOR, "tr:has(a)")
-                    except Exception as e:
-                        logger.warning(f"Link içeren satırlar bulunamadı: {e}")
+                logger.info(f"{page_num}. sayfada {len(page_profiles)} profil bulundu")
                 
-                logger.info(f"{page_num}. sayfada {len(profile_rows)} profil bulundu")
-                
-                if len(profile_rows) == 0:
+                if len(page_profiles) == 0:
                     logger.info("Profil bulunamadı, döngü bitiyor")
                     break
-                for row in profile_rows:
-                    try:
-                        info_td = row.find_element(By.XPATH, "./td[h6]")
-                        all_links = info_td.find_elements(By.CSS_SELECTOR, 'a.anahtarKelime')
-                        green_label = all_links[0].text.strip() if len(all_links) > 0 else ''
-                        blue_label = all_links[1].text.strip() if len(all_links) > 1 else ''
-                        if selected_field and green_label != selected_field:
-                            continue
-                        if selected_specialties and blue_label not in selected_specialties:
-                            continue
-                        link = row.find_element(By.CSS_SELECTOR, "a")
-                        link_text = link.text.strip()
-                        url = link.get_attribute("href")
-                        if url in profile_urls:
-                            logger.info(f"Profil zaten eklenmiş: {url}")
-                            continue
-                        info = info_td.text.strip() if info_td else ""
-                        img = row.find_element(By.CSS_SELECTOR, "img")
-                        img_src = img.get_attribute("src") if img else None
-                        if not img_src:
-                            img_src = self.default_photo_url
-                        info_lines = info.splitlines()
-                        if len(info_lines) > 1:
-                            title = info_lines[0].strip()
-                            name = info_lines[1].strip()
-                        else:
-                            title = link_text
-                            name = link_text
-                        header = info_lines[2].strip() if len(info_lines) > 2 else ''
-                        label_text = f"{green_label}   {blue_label}"
-                        keywords_text = info_td.text.replace(label_text, '').strip()
-                        keywords_text = keywords_text.lstrip(';:,. \u000b\n\t')
-                        lines = [l.strip() for l in keywords_text.split('\n') if l.strip()]
-                        if lines:
-                            keywords_line = lines[-1]
-                            if header.strip() == keywords_line or header.strip() in keywords_line:
-                                keywords_str = ""
-                            else:
-                                keywords = [k.strip() for k in keywords_line.split(';') if k.strip()]
-                                keywords_str = " ; ".join(keywords) if keywords else ""
-                        else:
-                            keywords_str = ""
-                        email = ''
-                        try:
-                            email_link = row.find_element(By.CSS_SELECTOR, "a[href^='mailto']")
-                            email = email_link.text.strip().replace('[at]', '@')
-                        except Exception:
-                            email = ''
-                        profiles.append({
-                            "id": profile_id_counter,
-                            "name": name,
-                            "title": title,
-                            "url": url,
-                            "info": info,
-                            "photoUrl": img_src,
-                            "header": header,
-                            "green_label": green_label,
-                            "blue_label": blue_label,
-                            "keywords": keywords_str,
-                            "email": email
-                        })
-                        profile_id_counter += 1
-                        profile_urls.add(url)
-                        logger.info(f"Profil eklendi: {name} - {url}")
-                        
-                        # Her profil bulunduğunda dosyayı güncelle (real-time streaming için)
+                for profile in page_profiles:
+                    if selected_field and profile["green_label"] != selected_field:
+                        continue
+                    if selected_specialties and profile["blue_label"] not in selected_specialties:
+                        continue
+                    check_cancelled()
+                    url = profile["url"]
+                    if url in profile_urls:
+                        logger.info("Profil zaten eklenmiş: %s", url, extra=HOT)
+                        continue
+                    profiles.append({"id": profile_id_counter, **profile})
+                    profile_id_counter += 1
+                    profile_urls.add(url)
+                    logger.info("Profil eklendi: %s - %s", profile['name'], url, extra=HOT)
+                    
+                    # Her profil bulunduğunda dosyayı güncelle (real-time streaming için)
+                    with metrics.span("save_profiles", operation="profile_search"):
                         await self.file_manager.save_profiles(session_id, profiles)
-                        
-                        # Streaming update
-                        if stream_manager:
-                            await stream_manager._send_update(session_id, {
-                                "type": "profiles",
-                                "session_id": session_id,
-                                "data": profiles,
-                                "count": len(profiles),
-                                "status": "profiles_updated"
-                            })
-                        if len(profiles) >= request.max_results:
-                            logger.info(f"Maksimum sonuç sayısına ulaşıldı: {len(profiles)}")
-                            return profiles
-                    except Exception as e:
-                        logger.error(f"Profil satırı işlenemedi: {e}")
+                    self._notify_results(session_id, len(profiles))
+                    
+                    # Streaming update
+                    if stream_manager:
+                        await stream_manager._send_update(session_id, {
+                            "type": "profiles",
+                            "session_id": session_id,
+                            "data": profiles,
+                            "count": len(profiles),
+                            "status": "profiles_updated"
+                        })
+                    if len(profiles) >= request.max_results:
+                        logger.info(f"Maksimum sonuç sayısına ulaşıldı: {len(profiles)}")
+                        return profiles
                 # Pagination: aktif sayfa <li> elementinden sonra gelen <a>'ya tıkla
-                try:
-                    pagination = driver.find_element(By.CSS_SELECTOR, "ul.pagination")
-                    active_li = pagination.find_element(By.CSS_SELECTOR, "li.active")
-                    all_lis = pagination.find_elements(By.TAG_NAME, "li")
-                    active_index = all_lis.index(active_li)
-                    if active_index == len(all_lis) - 1:
-                        logger.info("Son sayfaya gelindi, döngü bitiyor.")
+                # Sayfa ağ yanıtından okunduysa DOM henüz render edilmemiş olabilir; satırlar beklenir
+                first_row = None
+                if "pagination" not in page_source:
+                    # AJAX parçasında sayfalama yok: DOM'a satırlar render edildikten sonra bakılır
+                    first_row = await self.selenium_manager.wait_for_element(
+                        driver, By.CSS_SELECTOR, "tr[id^='authorInfo_'], table tbody tr", timeout=10
+                    )
+                    if first_row is None:
+                        logger.warning("Sonuç satırları DOM'da oluşmadı, döngü bitiyor")
                         break
-                    next_li = all_lis[active_index + 1]
-                    next_a = next_li.find_element(By.TAG_NAME, "a")
-                    logger.info(f"{page_num+1}. sayfaya geçiliyor...")
-                    next_a.click()
-                    page_num += 1
-                    WebDriverWait(driver, 10).until(EC.staleness_of(profile_rows[0]))
-                except Exception as e:
-                    logger.info(f"Sonraki sayfa bulunamadı veya tıklanamadı: {e}")
+                    page_source, _ = await self.selenium_manager.run(driver, self._snapshot, driver)
+                if not has_next_page(page_source):
+                    logger.info("Son sayfaya gelindi, döngü bitiyor.")
                     break
+                with metrics.span("pagination", operation="profile_search"):
+                    try:
+                        if first_row is None:
+                            first_row = await self.selenium_manager.wait_for_element(
+                                driver, By.CSS_SELECTOR, "tr[id^='authorInfo_'], table tbody tr", timeout=10
+                            )
+                        next_a = await self.selenium_manager.wait_for_element(
+                            driver, By.CSS_SELECTOR, "ul.pagination li.active + li a", timeout=10
+                        )
+                        if first_row is None or next_a is None:
+                            raise Exception("Sonuç satırları veya sayfalama DOM'da oluşmadı")
+                        logger.info(f"{page_num+1}. sayfaya geçiliyor...")
+                        await self.selenium_manager.run(driver, self.selenium_manager.clear_network_requests, driver)
+                        await self.selenium_manager.run(driver, next_a.click)
+                        page_num += 1
+                        await self.selenium_manager.run(
+                            driver, WebDriverWait(driver, 10).until, EC.staleness_of(first_row)
+                        )
+                    except Exception as e:
+                        logger.warning(f"Sonraki sayfa bulunamadı veya tıklanamadı: {e}")
+                        break
             logger.info(f"Toplam {len(profiles)} profil toplandı.")
             return profiles
             
+        except SessionCancelled:
+            raise
         except Exception as e:
             logger.error(f"Scraping hatası: {e}")
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
             return profiles
     
+    @staticmethod
+    def _snapshot(driver) -> Tuple[str, str]:
+        """Sayfa kaynağı ve URL'i (thread'de çalışır)"""
+        return driver.page_source, driver.current_url
+    
+    @staticmethod
+    def _submit_search(driver, name: str):
+        """Arama terimini gir ve ara (thread'de çalışır)"""
+        search_box = driver.find_element(By.ID, "aramaTerim")
+        search_box.clear()
+        search_box.send_keys(name)
+        driver.find_element(By.ID, "searchButton").click()
+    
+    @staticmethod
+    def _find_academics_tab(driver):
+        """Akademisyenler sekmesinin linkini bul; yoksa None (thread'de çalışır)"""
+        # Yöntem 1: Link text ile, Yöntem 2: Partial text ile
+        for locator in ((By.LINK_TEXT, "Akademisyenler"), (By.PARTIAL_LINK_TEXT, "Akademisyen")):
+            try:
+                return WebDriverWait(driver, 3).until(EC.element_to_be_clickable(locator))
+            except Exception:
+                pass
+        # Yöntem 3: CSS selector ile
+        try:
+            return driver.find_element(By.CSS_SELECTOR, "a[href*='akademisyen']")
+        except Exception:
+            return None
+    
+    async def _wait_for_search_response(self, driver, timeout: float = 3.0) -> Optional[tuple[str, str]]:
+        """Profil satırlarını içeren son ağ yanıtını bekle (html, url)
+        
+        JSON yanıtlar stream yolundaki gibi çözülür; dönen HTML doğrudan parse_profile_rows'a verilir.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            network_requests = await self.selenium_manager.run(
+                driver, self.selenium_manager.get_network_requests, driver, "AkademikArama"
+            )
+            for req in reversed(network_requests):
+                if not req.response or req.response.status_code != 200:
+                    continue
+                try:
+                    html = self._response_html(req)
+                except ValueError as e:
+                    logger.warning(f"Arama yanıtı çözülemedi: {e}")
+                    continue
+                if html:
+                    return html, req.url
+            if loop.time() >= deadline:
+                return None
+            await asyncio.sleep(0.2)
+    
     async def _extract_profile_data(
         self, 
         row, 
@@ -555,17 +674,32 @@ class ProfileScraperTool:
         """Session durumunu kontrol et"""
         return await self.file_manager.get_session_status(session_id)
     
-    async def quick_search_profiles(self, name: str, max_results: int = 100) -> Dict[str, Any]:
-        """Hızlı arama - ilk 10 profili hemen göster"""
+    async def quick_search_profiles(self, name: str, max_results: int = 100, profile: Optional[str] = None,
+                                    deadline_seconds: Optional[float] = None, min_profiles: Optional[int] = None,
+                                    timeout: Optional[float] = None, owner: Optional[str] = None) -> Dict[str, Any]:
+        """Hızlı arama - ilk min_profiles profil gelince (veya arama bitince) hemen göster
+        
+        Varsayılanlar YOK_QUICK_SEARCH_MIN_PROFILES (10) ve YOK_QUICK_SEARCH_TIMEOUT
+        (10 saniye); süre dolarsa o ana kadar bulunan profiller döner. owner verilirse
+        session, arama başlamadan ona atanır (diğer istemciler ara sonuçları göremez).
+        """
         try:
             logger.info(f"Quick search başlatıldı: {name}")
             
             # Session ID oluştur
             session_id = self._generate_session_id()
             logger.info(f"Quick search session: {session_id}")
+            if owner is not None:
+                session_ownership.claim(session_id, owner)
             
             # Request oluştur
-            request = SearchRequest(name=name, max_results=max_results)
+            request = SearchRequest(name=name, max_results=max_results, profile=profile, deadline_seconds=deadline_seconds)
+            min_profiles = max(1, min_profiles or int(os.getenv("YOK_QUICK_SEARCH_MIN_PROFILES", "10")))
+            timeout = timeout if timeout is not None else float(os.getenv("YOK_QUICK_SEARCH_TIMEOUT", "10"))
+            
+            # Bekleyici task'tan önce kurulur; ilk profiller hemen gelse de sinyal kaçmaz
+            waiter = asyncio.Event()
+            self._result_waiters[session_id] = (min_profiles, waiter)
             
             # Arka planda scraping başlat - Smithery için try-catch eklendi
             try:
@@ -577,18 +711,24 @@ class ProfileScraperTool:
                 logger.error(f"Scraping task başlatılamadı: {e}")
                 # Hata durumunda boş session dosyası oluştur
                 await self.file_manager.save_profiles(session_id, [])
+                waiter.set()
             
-            # Smithery için hızlı sonuç - Selenium çalışmazsa hemen session ID döndür
+            # Smithery için hızlı sonuç - Selenium çalışmazsa süre dolunca session ID döndür
             try:
-                # 5 saniye bekle (Smithery için kısaltıldı)
-                await asyncio.sleep(5)
+                try:
+                    with metrics.span("first_results_wait", operation="profile_search"):
+                        await asyncio.wait_for(waiter.wait(), timeout)
+                except asyncio.TimeoutError:
+                    logger.info(f"Quick search {timeout}s içinde {min_profiles} profile ulaşmadı: {session_id}")
+                finally:
+                    self._result_waiters.pop(session_id, None)
                 
                 # Session dosyasını kontrol et
                 session_data = await self.file_manager.load_session_data(session_id, "profiles")
                 if session_data and session_data.get("profiles"):
                     profiles = session_data["profiles"]
-                    # İlk 10 profili göster
-                    preview_profiles = profiles[:10]
+                    # İlk min_profiles profili göster
+                    preview_profiles = profiles[:min_profiles]
                     
                     return {
                         "success": True,
@@ -597,6 +737,7 @@ class ProfileScraperTool:
                         "preview_count": len(preview_profiles),
                         "total_found": len(profiles),
                         "max_results": max_results,
+                        "completed": bool(session_data.get("completed")),
                         "preview_profiles": preview_profiles,
                         "next_steps": [
                             "check_scraping_status ile durum kontrol edebilirsiniz",
@@ -646,14 +787,26 @@ class ProfileScraperTool:
             if session_data:
                 profiles = session_data.get("profiles", [])
                 completed = status.get("profiles_completed", False)
+                cancelled = session_data.get("cancelled", False)
                 
+                if cancelled:
+                    return {
+                        "success": True,
+                        "session_id": session_id,
+                        "status": "cancelled",
+                        "cancel_reason": session_data.get("cancel_reason"),
+                        "profiles_found": len(profiles),
+                        "completed": False,
+                        "message": f"Arama durduruldu ({session_data.get('cancel_reason')}): {len(profiles)} profil kaydedildi"
+                    }
                 return {
                     "success": True,
                     "session_id": session_id,
                     "status": "completed" if completed else "in_progress",
                     "profiles_found": len(profiles),
                     "completed": completed,
-                    "message": f"Scraping durumu: {len(profiles)} profil bulundu" + (" (tamamlandı)" if completed else " (devam ediyor)")
+                    "message": f"Scraping durumu: {len(profiles)} profil bulundu" + (" (tamamlandı)" if completed else " (devam ediyor)"),
+                    "profile_files": sorted(f.name for f in self.file_manager.get_session_dir(session_id).glob("profile_*"))
                 }
             else:
                 # Session dizinini kontrol et
@@ -679,8 +832,8 @@ class ProfileScraperTool:
                 "session_id": session_id
             }
     
-    async def get_full_results(self, session_id: str, max_results: int = 50) -> Dict[str, Any]:
-        """Tamamlanmış sonuçları getir"""
+    async def get_full_results(self, session_id: str, max_results: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """Tamamlanmış sonuçları getir (offset: atlanacak profil sayısı)"""
         try:
             logger.info(f"Full results getiriliyor: {session_id}")
             
@@ -695,7 +848,7 @@ class ProfileScraperTool:
             profiles = session_data["profiles"]
             
             # Maksimum sonuç sayısını sınırla
-            limited_profiles = profiles[:max_results]
+            limited_profiles = profiles[offset:offset + max_results]
             
             # Detaylı bilgileri formatla
             detailed_profiles = []
@@ -717,6 +870,7 @@ class ProfileScraperTool:
                 "success": True,
                 "session_id": session_id,
                 "total_found": len(profiles),
+                "offset": offset,
                 "shown_count": len(limited_profiles),
                 "profiles": detailed_profiles
             }
@@ -807,7 +961,7 @@ class ProfileScraperTool:
             request = SearchRequest(name=name, max_results=max_results)
             
             # Driver oluştur
-            driver = await self.selenium_manager.get_driver()
+            driver = await self.selenium_manager.get_driver(session_id=session_id, operation="live_stream")
             
             try:
                 # Ana sayfaya git
@@ -823,32 +977,38 @@ class ProfileScraperTool:
                     return
                 
                 # Network isteklerini temizle
-                self.selenium_manager.clear_network_requests(driver)
+                await self.selenium_manager.run(driver, self.selenium_manager.clear_network_requests, driver)
                 
                 # Arama yap
-                search_box.clear()
-                search_box.send_keys(request.name)
-                search_button = driver.find_element(By.ID, "searchButton")
-                search_button.click()
+                await self.selenium_manager.run(driver, self._submit_search, driver, request.name)
                 
                 # Real-time network monitoring
-                profiles_found = 0
-                while profiles_found < max_results:
+                profiles = []
+                seen_urls = set()
+                processed_requests = set()
+                while len(profiles) < max_results:
                     # Network isteklerini kontrol et
-                    network_requests = self.selenium_manager.get_network_requests(driver, "AkademikArama")
+                    network_requests = await self.selenium_manager.run(
+                        driver, self.selenium_manager.get_network_requests, driver, "AkademikArama"
+                    )
                     
                     for req in network_requests:
+                        if req.request_id in processed_requests:
+                            continue
+                        processed_requests.add(req.request_id)
                         if req.response and req.response.status_code == 200:
                             # Profil verisi olabilir
                             try:
-                                profile_data = self._extract_profile_from_request(req)
-                                if profile_data:
-                                    profiles_found += 1
+                                for profile_data in self._extract_profile_from_request(req):
+                                    if profile_data["url"] in seen_urls or len(profiles) >= max_results:
+                                        continue
+                                    seen_urls.add(profile_data["url"])
+                                    profiles.append({"id": len(profiles) + 1, **profile_data})
                                     yield {
                                         "type": "profile",
                                         "session_id": session_id,
-                                        "profile": profile_data,
-                                        "count": profiles_found
+                                        "profile": profiles[-1],
+                                        "count": len(profiles)
                                     }
                             except Exception as e:
                                 logger.error(f"Profil çıkarma hatası: {e}")
@@ -856,12 +1016,12 @@ class ProfileScraperTool:
                     await asyncio.sleep(1)  # 1 saniye bekle
                     
                     # Timeout kontrolü
-                    if profiles_found == 0 and len(network_requests) > 10:
+                    if not profiles and len(network_requests) > 10:
                         yield {"error": "Profil bulunamadı"}
                         break
                 
                 # Session'ı kaydet
-                await self.file_manager.save_profiles(session_id, [])
+                await self.file_manager.save_profiles(session_id, profiles)
                 
             finally:
                 await self.selenium_manager.close_driver(driver)
@@ -870,13 +1030,37 @@ class ProfileScraperTool:
             logger.error(f"Real-time streaming hatası: {e}")
             yield {"error": f"Streaming hatası: {str(e)}"}
     
-    def _extract_profile_from_request(self, request):
-        """Network isteğinden profil verisi çıkar"""
+    @staticmethod
+    def _response_html(request) -> Optional[str]:
+        """Profil satırlarını taşıyan yanıtın HTML'i (JSON içindeki parçalar çözülür); yoksa None"""
+        if not (request.response and request.response.body):
+            return None
+        body = request.response.body
+        if "authorInfo_" not in body:
+            return None
+        
+        if "json" in (request.response.mime_type or ""):
+            # JSON yanıt içindeki HTML parçalarını birleştir
+            fragments = []
+            pending = [json.loads(body)]
+            while pending:
+                value = pending.pop()
+                if isinstance(value, dict):
+                    pending.extend(value.values())
+                elif isinstance(value, list):
+                    pending.extend(value)
+                elif isinstance(value, str) and "authorInfo_" in value:
+                    fragments.append(value)
+            body = "".join(reversed(fragments))
+        return body
+    
+    def _extract_profile_from_request(self, request) -> List[Dict[str, Any]]:
+        """Network isteğinden profil verisi çıkar (HTML sayfa/parça veya HTML içeren JSON)"""
         try:
-            if request.response and request.response.body:
-                # Response body'den profil verisi çıkar
-                # Bu kısım YÖK sitesinin response formatına göre ayarlanacak
-                return None  # Şimdilik None döndür
+            body = self._response_html(request)
+            if not body:
+                return []
+            return parse_profile_rows(body, request.url, self.default_photo_url)
         except Exception as e:
             logger.error(f"Request'ten profil çıkarılamadı: {e}")
-            return None 
\ No newline at end of file
+            return []
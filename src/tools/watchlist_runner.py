@@ -0,0 +1,314 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.file_manager import FileManager
+from utils.metrics import metrics
+from utils.client_registry import WATCHLIST_CLIENT
+from utils.logging_setup import set_log_context
+from utils.watchlist import (
+    WATCHLIST_ID_PATTERN,
+    CronSchedule,
+    WatchlistStore,
+    diff_snapshots,
+    has_changes,
+    in_window,
+    parse_window,
+)
+
+logger = logging.getLogger(__name__)
+
+# Anlık görüntüde saklanan işbirlikçi alanları
+COLLABORATOR_FIELDS = ("name", "url", "title", "green_label", "blue_label", "weight", "deleted")
+
+
+def _is_url(entry: str) -> bool:
+    return entry.startswith(("http://", "https://"))
+
+
+class WatchlistRunner:
+    """Watchlist'leri takvimlerine göre yoğun olmayan saatlerde yeniler ve farkları kaydeder
+
+    Profil sayfaları ProfileRefreshTool ile (HTTP, koşullu istek) yenilenir;
+    isim girdileri her çalıştırmada aranır, işbirlikçiler Selenium ile çekilir.
+    Scraper'lar ilk ihtiyaçta verilen fabrika fonksiyonlarıyla oluşturulur.
+    """
+
+    def __init__(
+        self,
+        file_manager: FileManager,
+        profile_refresher,
+        profile_scraper_factory: Callable[[], Any],
+        collaborator_scraper_factory: Callable[[], Any],
+        store: Optional[WatchlistStore] = None,
+        concurrency: Optional[int] = None,
+        interval: Optional[float] = None,
+        window: Optional[str] = None,
+        poll_interval: float = 60.0
+    ):
+        self.file_manager = file_manager
+        self.refresher = profile_refresher
+        self.profile_scraper_factory = profile_scraper_factory
+        self.collaborator_scraper_factory = collaborator_scraper_factory
+        self.store = store or WatchlistStore(file_manager.base_path / "watchlists")
+        self.concurrency = concurrency or int(os.getenv("YOK_WATCHLIST_CONCURRENCY", "1"))
+        # Siteye giden iki istek başlangıcı arasındaki en kısa süre (saniye)
+        self.interval = interval if interval is not None else float(os.getenv("YOK_WATCHLIST_INTERVAL", "2"))
+        self.window = parse_window(window if window is not None else os.getenv("YOK_WATCHLIST_WINDOW", "00:00-06:00"))
+        self.name_results = int(os.getenv("YOK_WATCHLIST_NAME_RESULTS", "3"))
+        self.poll_interval = poll_interval
+        self._running: Dict[str, asyncio.Task] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+        self._next_slot = 0.0
+
+    # --- Tanımlar ---
+
+    @staticmethod
+    def _is_allowed(watchlist: Dict[str, Any], owner: Optional[str]) -> bool:
+        """owner verilmezse (zamanlayıcı) veya watchlist sahipsizse herkes erişebilir"""
+        return owner is None or watchlist.get("owner") in (None, owner)
+
+    def _get_owned(self, watchlist_id: str, owner: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """(watchlist, hata) - bulunamazsa veya başka istemciye aitse hata döner"""
+        watchlist = self.store.get(watchlist_id)
+        if watchlist is None:
+            return None, {"error": f"Watchlist {watchlist_id} bulunamadı", "status": "failed"}
+        if not self._is_allowed(watchlist, owner):
+            return None, {"error": f"Watchlist {watchlist_id} bu istemciye ait değil", "status": "failed"}
+        return watchlist, None
+
+    def save_watchlist(self, watchlist_id: str, entries: List[str], schedule: str,
+                       collaborators: bool = True, owner: Optional[str] = None) -> Dict[str, Any]:
+        """Watchlist oluştur veya güncelle (son çalıştırma bilgisi ve sahibi korunur)"""
+        if not WATCHLIST_ID_PATTERN.match(watchlist_id or ""):
+            return {"error": "watchlist_id sadece harf, rakam, '-' ve '_' içerebilir (en fazla 64)", "status": "failed"}
+        entries = [entry.strip() for entry in entries or [] if entry and entry.strip()]
+        if not entries:
+            return {"error": "En az bir isim veya profil URL'i gerekli", "status": "failed"}
+        try:
+            next_run = CronSchedule(schedule).next_after(datetime.now())
+        except ValueError as e:
+            return {"error": str(e), "status": "failed"}
+        watchlist = self.store.get(watchlist_id)
+        if watchlist is None:
+            watchlist = {"id": watchlist_id, "owner": owner, "created_at": datetime.now().isoformat()}
+        elif not self._is_allowed(watchlist, owner):
+            return {"error": f"Watchlist {watchlist_id} bu istemciye ait değil", "status": "failed"}
+        watchlist.update({
+            "entries": list(dict.fromkeys(entries)),
+            "schedule": schedule.strip(),
+            "collaborators": collaborators,
+            "next_run": next_run.isoformat(),
+        })
+        self.store.save(watchlist)
+        return {"success": True, "watchlist": watchlist}
+
+    def delete_watchlist(self, watchlist_id: str, owner: Optional[str] = None) -> Dict[str, Any]:
+        _, error = self._get_owned(watchlist_id, owner)
+        if error:
+            return error
+        if not self.store.delete(watchlist_id):
+            return {"error": f"Watchlist {watchlist_id} bulunamadı", "status": "failed"}
+        return {"success": True, "watchlist_id": watchlist_id}
+
+    def list_watchlists(self, owner: Optional[str] = None) -> Dict[str, Any]:
+        watchlists = [
+            watchlist for watchlist in self.store.load_all().values() if self._is_allowed(watchlist, owner)
+        ]
+        for watchlist in watchlists:
+            watchlist["running"] = watchlist["id"] in self._running
+        return {"success": True, "watchlists": watchlists, "window": self._window_text()}
+
+    def history(self, watchlist_id: str, limit: int = 5, owner: Optional[str] = None) -> Dict[str, Any]:
+        _, error = self._get_owned(watchlist_id, owner)
+        if error:
+            return error
+        return {"success": True, "watchlist_id": watchlist_id, "runs": self.store.list_runs(watchlist_id, limit)}
+
+    def _window_text(self) -> Optional[str]:
+        if self.window is None:
+            return None
+        start, end = self.window
+        return f"{start.strftime('%H:%M')}-{end.strftime('%H:%M')}"
+
+    # --- Çalıştırma ---
+
+    async def _throttle(self):
+        """İstek başlangıçlarını en az interval saniye aralıkla sırala"""
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _resolve_entries(self, watchlist: Dict[str, Any], previous: Dict[str, Any],
+                               counts: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+        """Girdileri URL -> profil kaydına çevir; isimler aranır, önceki kayıtlar taban alınır"""
+        profiles: Dict[str, Dict[str, Any]] = {}
+        for entry in watchlist["entries"]:
+            if _is_url(entry):
+                found = [{"url": entry}]
+            else:
+                await self._throttle()
+                try:
+                    # Arama session'ı sadece URL'leri çözmek içindir; okunduktan sonra silinir
+                    _, found = await self.profile_scraper_factory().search_and_wait(
+                        entry, self.name_results, owner=WATCHLIST_CLIENT, discard=True
+                    )
+                except Exception as e:
+                    logger.warning(f"Watchlist araması başarısız {entry}: {e}")
+                    found = []
+                if not found:
+                    # Arama başarısızsa bu isimle önceden bulunan profiller korunur
+                    found = [profile for profile in previous.get("profiles", {}).values() if profile.get("entry") == entry]
+                    counts["search_failed"] = counts.get("search_failed", 0) + 1
+            for row in found:
+                url = row.get("url")
+                if url and url not in profiles:
+                    base = dict(previous.get("profiles", {}).get(url) or row)
+                    base.pop("id", None)
+                    base["entry"] = entry
+                    profiles[url] = base
+        return profiles
+
+    async def _refresh_profiles(self, profiles: Dict[str, Dict[str, Any]], now: str, counts: Dict[str, int]):
+        async def refresh_one(profile: Dict[str, Any]):
+            await self._throttle()
+            outcome = await self.refresher.refresh_profile(profile, now)
+            counts[f"profile_{outcome}"] = counts.get(f"profile_{outcome}", 0) + 1
+
+        await asyncio.gather(*(refresh_one(profile) for profile in profiles.values()))
+
+    async def _fetch_collaborators(self, profiles: Dict[str, Dict[str, Any]], previous: Dict[str, Any],
+                                   counts: Dict[str, int]) -> Dict[str, List[Dict[str, Any]]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results: Dict[str, List[Dict[str, Any]]] = {}
+
+        async def fetch_one(url: str):
+            async with semaphore:
+                await self._throttle()
+                try:
+                    collaborators, _ = await self.collaborator_scraper_factory().fetch_collaborators(
+                        url, operation="watchlist"
+                    )
+                except Exception as e:
+                    logger.warning(f"Watchlist işbirlikçileri çekilemedi {url}: {e}")
+                    collaborators = []
+            if collaborators:
+                results[url] = [{field: item.get(field) for field in COLLABORATOR_FIELDS} for item in collaborators]
+                counts["collaborators_fetched"] = counts.get("collaborators_fetched", 0) + 1
+            else:
+                # Boş sonuç çoğunlukla hata: önceki liste korunur, fark üretilmez
+                counts["collaborators_failed"] = counts.get("collaborators_failed", 0) + 1
+                if url in previous.get("collaborators", {}):
+                    results[url] = previous["collaborators"][url]
+
+        await asyncio.gather(*(fetch_one(url) for url, profile in profiles.items() if not profile.get("deleted")))
+        return results
+
+    async def _run(self, watchlist: Dict[str, Any], trigger: str) -> Dict[str, Any]:
+        watchlist_id = watchlist["id"]
+        set_log_context(session_id=f"watchlist:{watchlist_id}")
+        started_at = datetime.now().isoformat()
+        previous = self.store.load_snapshot(watchlist_id)
+        base = previous or {"profiles": {}, "collaborators": {}}
+        counts: Dict[str, int] = {}
+        logger.info(f"Watchlist çalıştırılıyor: {watchlist_id} ({trigger})")
+
+        with metrics.span("watchlist_run", operation="watchlist"):
+            profiles = await self._resolve_entries(watchlist, base, counts)
+            await self._refresh_profiles(profiles, started_at, counts)
+            collaborators = {}
+            if watchlist.get("collaborators", True):
+                collaborators = await self._fetch_collaborators(profiles, base, counts)
+
+        snapshot = {"taken_at": started_at, "profiles": profiles, "collaborators": collaborators}
+        diff = diff_snapshots(previous, snapshot)
+        run = {
+            "watchlist_id": watchlist_id,
+            "trigger": trigger,
+            "started_at": started_at,
+            "finished_at": datetime.now().isoformat(),
+            "baseline": previous is None,
+            "changed": previous is not None and has_changes(diff),
+            "counts": counts,
+            "diff": diff,
+        }
+        self.store.save_run(watchlist_id, snapshot, run)
+        metrics.increment("watchlist_runs", outcome="changed" if run["changed"] else "unchanged")
+        logger.info(f"Watchlist bitti: {watchlist_id} {counts}")
+        return run
+
+    async def run_watchlist(self, watchlist_id: str, trigger: str = "manual",
+                            owner: Optional[str] = None) -> Dict[str, Any]:
+        """Watchlist'i şimdi çalıştır (zaten çalışıyorsa o çalıştırmanın sonucunu bekler)"""
+        watchlist, error = self._get_owned(watchlist_id, owner)
+        if error:
+            return error
+        task = self._running.get(watchlist_id)
+        if task is None:
+            task = asyncio.create_task(self._run(watchlist, trigger))
+            self._running[watchlist_id] = task
+            task.add_done_callback(lambda _: self._running.pop(watchlist_id, None))
+        try:
+            run = await asyncio.shield(task)
+        except Exception as e:
+            logger.error(f"Watchlist çalıştırılamadı {watchlist_id}: {e}")
+            self.store.update(watchlist_id, last_run=datetime.now().isoformat(), last_status="failed")
+            return {"error": f"Watchlist çalıştırılamadı: {str(e)}", "status": "failed"}
+        self.store.update(watchlist_id, last_run=run["finished_at"],
+                          last_status="changed" if run["changed"] else "unchanged")
+        return {"success": True, **run}
+
+    # --- Zamanlayıcı ---
+
+    def due_watchlists(self, now: datetime) -> List[str]:
+        """next_run zamanı geçmiş watchlist'ler (en eskisi önce)"""
+        due = [
+            (watchlist["next_run"], watchlist_id)
+            for watchlist_id, watchlist in self.store.load_all().items()
+            if watchlist.get("next_run") and datetime.fromisoformat(watchlist["next_run"]) <= now
+            and watchlist_id not in self._running
+        ]
+        return [watchlist_id for _, watchlist_id in sorted(due)]
+
+    async def run_due(self, now: Optional[datetime] = None) -> List[str]:
+        """Pencere içindeyse zamanı gelen watchlist'leri sırayla çalıştır"""
+        now = now or datetime.now()
+        if not in_window(self.window, now):
+            return []
+        ran = []
+        for watchlist_id in self.due_watchlists(now):
+            watchlist = self.store.get(watchlist_id)
+            if watchlist is None:
+                continue
+            # Kaçırılan çalıştırmalar biriktirilmez: bir kez çalışır, sonraki zaman şimdiden hesaplanır
+            self.store.update(watchlist_id, next_run=CronSchedule(watchlist["schedule"]).next_after(now).isoformat())
+            await self.run_watchlist(watchlist_id, trigger="schedule")
+            ran.append(watchlist_id)
+        return ran
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_due()
+            except Exception as e:
+                logger.error(f"Watchlist zamanlayıcı hatası: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self):
+        """Zamanlayıcıyı arka planda başlat (tekrar çağrılırsa bir şey yapmaz)"""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
@@ -1,4 +1,15 @@
-from .selenium_manager import SeleniumManager
-from .file_manager import FileManager
+import importlib
 
-__all__ = ['SeleniumManager', 'FileManager'] 
\ No newline at end of file
+# Selenium gibi ağır bağımlılıklar ilk erişimde yüklensin (server açılışı hızlı olsun)
+_LAZY_EXPORTS = {
+    'SeleniumManager': '.selenium_manager',
+    'FileManager': '.file_manager',
+}
+
+__all__ = ['SeleniumManager', 'FileManager']
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
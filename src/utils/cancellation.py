@@ -0,0 +1,158 @@
+"""
+Cancellation - Session işleri için iptal ve son tarih (deadline) yönetimi
+
+Her arka plan işi (profil araması, işbirlikçi işi, toplu iş, yenileme)
+çalıştığı süre boyunca bir CancelScope açar. Döngüler her adımda
+check_cancelled() çağırır: iş iptal edildiyse veya son tarihi geçtiyse
+SessionCancelled fırlatılır ve iş o ana kadarki sonucu "cancelled" olarak
+kaydeder. cancel_session ayrıca görevi asyncio düzeyinde iptal eder; böylece
+uzun bir sayfa beklemesinde olan iş de driver'ını hemen bırakır.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+CANCELLED = "cancelled"
+DEADLINE = "deadline"
+
+_current_scope: contextvars.ContextVar[Optional["CancelScope"]] = contextvars.ContextVar(
+    "cancel_scope", default=None
+)
+
+
+def default_deadline() -> Optional[float]:
+    """YOK_SESSION_DEADLINE (saniye) ayarlıysa varsayılan son tarih"""
+    value = float(os.getenv("YOK_SESSION_DEADLINE", "0") or 0)
+    return value if value > 0 else None
+
+
+class SessionCancelled(Exception):
+    """İş iptal edildi veya son tarihi geçti"""
+
+    def __init__(self, reason: str = CANCELLED):
+        super().__init__(f"İş durduruldu: {reason}")
+        self.reason = reason
+
+
+class CancelScope:
+    """Bir session işinin iptal bayrağı ve son tarihi"""
+
+    def __init__(self, session_id: str, operation: str, deadline_seconds: Optional[float] = None,
+                 task: Optional[asyncio.Task] = None):
+        self.session_id = session_id
+        self.operation = operation
+        self.task = task
+        self.started_at = datetime.now().isoformat()
+        self.deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+        self.reason: Optional[str] = None
+        self.closed = False
+
+    def cancel(self, reason: str = CANCELLED):
+        """İlk neden geçerlidir"""
+        if self.reason is None:
+            self.reason = reason
+
+    @property
+    def cancelled(self) -> bool:
+        if self.reason is None and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.reason = DEADLINE
+        return self.reason is not None
+
+    def remaining(self) -> Optional[float]:
+        """Son tarihe kalan süre (saniye); son tarih yoksa None"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self):
+        """İş durdurulduysa SessionCancelled fırlat"""
+        if self.cancelled:
+            raise SessionCancelled(self.reason)
+
+    def to_dict(self) -> Dict[str, Any]:
+        remaining = self.remaining()
+        return {
+            "operation": self.operation,
+            "started_at": self.started_at,
+            "deadline_in": round(remaining, 1) if remaining is not None else None,
+            "cancel_reason": self.reason,
+        }
+
+
+def current_scope() -> Optional[CancelScope]:
+    """Çalışan işin scope'u (iş dışında None)"""
+    return _current_scope.get()
+
+
+def check_cancelled():
+    """Çalışan iş durdurulduysa SessionCancelled fırlat; scope yoksa bir şey yapmaz"""
+    scope = _current_scope.get()
+    if scope is not None and not scope.closed:
+        scope.check()
+
+
+def detach_scope():
+    """Çalışan görevi (ve açacağı görevleri) ebeveyn işin scope'undan ayır
+
+    Görevler oluşturuldukları context'i kopyalar; bir işin tetiklediği ama ona
+    ait olmayan görevler (ör. önceden çekme) bununla işin iptalinden etkilenmez.
+    """
+    _current_scope.set(None)
+
+
+class SessionTasks:
+    """session_id -> çalışan işlerin scope'ları"""
+
+    def __init__(self):
+        self._scopes: Dict[str, List[CancelScope]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def scope(self, session_id: str, operation: str,
+              deadline_seconds: Optional[float] = None) -> Iterator[CancelScope]:
+        """Çalışan görev için scope aç; iş bitince kaydı sil"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        scope = CancelScope(session_id, operation, deadline_seconds, task)
+        token = _current_scope.set(scope)
+        with self._lock:
+            self._scopes.setdefault(session_id, []).append(scope)
+        try:
+            yield scope
+        finally:
+            scope.closed = True
+            _current_scope.reset(token)
+            with self._lock:
+                scopes = self._scopes.get(session_id, [])
+                if scope in scopes:
+                    scopes.remove(scope)
+                if not scopes:
+                    self._scopes.pop(session_id, None)
+
+    def cancel(self, session_id: str, reason: str = CANCELLED) -> List[str]:
+        """Session'ın tüm işlerini durdur; durdurulan işlerin adlarını döndür"""
+        with self._lock:
+            scopes = list(self._scopes.get(session_id, []))
+        for scope in scopes:
+            scope.cancel(reason)
+            # Bekleyen await'i kes: finally blokları driver'ı hemen kapatır
+            if scope.task is not None and not scope.task.done() and scope.task is not asyncio.current_task():
+                scope.task.cancel()
+        return [scope.operation for scope in scopes]
+
+    def active(self, session_id: str) -> List[Dict[str, Any]]:
+        """Session'ın çalışan işleri"""
+        with self._lock:
+            return [scope.to_dict() for scope in self._scopes.get(session_id, [])]
+
+
+# Global instance
+session_tasks = SessionTasks()
@@ -0,0 +1,45 @@
+"""
+Client Registry - Scraping session'larını onları başlatan MCP istemcisine bağlar
+
+HTTP transport'ta tek bir server birden çok istemciye hizmet verir; bir
+istemcinin başlattığı session'ın sonuçlarını başka bir istemci okuyamamalıdır.
+İstemci kimliği HTTP'de mcp-session-id başlığı, stdio'da "local"dir.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+LOCAL_CLIENT = "local"
+# Watchlist zamanlayıcısının açtığı arama session'larının sahibi; hiçbir MCP istemcisi erişemez
+WATCHLIST_CLIENT = "watchlist"
+
+
+class SessionOwnership:
+    """session_id -> istemci kimliği eşlemesi"""
+
+    def __init__(self):
+        self._owners: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, session_id: str, client_id: str):
+        """Session'ı istemciye ata (ilk atama geçerlidir)"""
+        with self._lock:
+            self._owners.setdefault(session_id, client_id)
+
+    def owner(self, session_id: str) -> Optional[str]:
+        with self._lock:
+            return self._owners.get(session_id)
+
+    def is_allowed(self, session_id: str, client_id: str) -> bool:
+        """İstemci session'a erişebilir mi? (sahibi bilinmeyen eski session'lar serbesttir)"""
+        owner = self.owner(session_id)
+        return owner is None or owner == client_id
+
+    def sessions_of(self, client_id: str) -> List[str]:
+        """İstemcinin session'ları"""
+        with self._lock:
+            return [session_id for session_id, owner in self._owners.items() if owner == client_id]
+
+
+# Global instance
+session_ownership = SessionOwnership()
@@ -0,0 +1,306 @@
+"""
+Co-author Graph - Session'lardaki işbirlikçi sonuçlarından profil URL'i anahtarlı küresel ortak yazarlık ağı
+
+Her collaborators.json (ve collaborators_batch.json'daki her profil kaydı); merkez
+profil ile işbirlikçileri arasındaki kenarları ve (grafik verisi okunabildiyse)
+işbirlikçilerin kendi aralarındaki kenarları içerir.
+Tüm session'ların kenarları simetrik seyrek komşuluk matrisinde birleştirilir;
+aynı kenar birden çok kez görülürse en büyük ağırlık alınır. Derece, PageRank,
+özvektör merkeziliği ve bağlı bileşenler vektörel seyrek işlemlerle hesaplanır.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+    from scipy.sparse.csgraph import connected_components
+except ImportError:  # numpy/scipy opsiyonel
+    np = None
+    sp = None
+    connected_components = None
+
+logger = logging.getLogger(__name__)
+
+CENTRALITY_METRICS = ("pagerank", "eigenvector", "degree", "strength")
+
+# Session izinlerine göre süzülmüş ağlardan bellekte tutulacak en fazla sayı
+MAX_VIEWS = 16
+
+
+def pagerank(adjacency, damping: float = 0.85, tol: float = 1e-8, max_iter: int = 200):
+    """Ağırlıklı PageRank (güç yöntemi); çıkışı olmayan düğümlerin payı eşit dağıtılır"""
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    out_strength = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_strength == 0
+    inverse = np.divide(1.0, out_strength, out=np.zeros(n), where=~dangling)
+    # Satır normalize geçiş matrisinin transpozu
+    transition = (sp.diags(inverse) @ adjacency).T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        updated = damping * (transition @ rank + rank[dangling].sum() / n) + (1 - damping) / n
+        if np.abs(updated - rank).sum() < tol:
+            return updated
+        rank = updated
+    return rank
+
+
+def eigenvector_centrality(adjacency, tol: float = 1e-8, max_iter: int = 500):
+    """Özvektör merkeziliği (A + I üzerinde güç yöntemi; iki parçalı yıldız ağlarda da yakınsar)"""
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    vector = np.full(n, 1.0 / np.sqrt(n))
+    for _ in range(max_iter):
+        updated = adjacency @ vector + vector
+        norm = np.linalg.norm(updated)
+        if norm == 0:
+            return vector
+        updated /= norm
+        if np.abs(updated - vector).sum() < tol:
+            return updated
+        vector = updated
+    return vector
+
+
+class CoauthorGraph:
+    """Session'lardan artımlı beslenen ortak yazarlık ağı"""
+
+    def __init__(self, sessions_path: Path):
+        if np is None:
+            raise RuntimeError("Ortak yazarlık ağı için numpy ve scipy gerekli: pip install numpy scipy")
+        self.sessions_path = Path(sessions_path)
+        self._lock = threading.RLock()
+        self._node_of: Dict[str, int] = {}
+        self._urls: List[str] = []
+        self._names: List[str] = []
+        # session_id -> (kaynak, hedef, ağırlık) dizileri
+        self._session_edges: Dict[str, Tuple[Any, Any, Any]] = {}
+        self._dirty_sessions: Set[str] = set()
+        self._loaded = False
+        self._adjacency = None
+        self._metrics: Dict[str, Any] = {}
+        # İzinli session anahtarları -> (komşuluk, metrikler)
+        self._views: Dict[frozenset, Tuple[Any, Dict[str, Any]]] = {}
+
+    # --- Güncelleme ---
+
+    def mark_dirty(self, session_id: str):
+        """Session'ın işbirlikçi verisi değişti; bir sonraki sorguda yeniden okunacak"""
+        with self._lock:
+            self._dirty_sessions.add(session_id)
+
+    def _node(self, url: str, name: str = "") -> int:
+        index = self._node_of.get(url)
+        if index is None:
+            index = self._node_of[url] = len(self._names)
+            self._urls.append(url)
+            self._names.append(name)
+        elif name and not self._names[index]:
+            self._names[index] = name
+        return index
+
+    def add_collaborators(self, session_id: str, data: Dict[str, Any]):
+        """Bir collaborators.json içeriğini ağa ekle (session'ın önceki kenarlarının yerine geçer)"""
+        with self._lock:
+            # Toplu kayıtlarda kenarlar grafiğin merkez linkini kullanır
+            center_url = data.get("center_url") or data.get("profile_url")
+            center = self._node(center_url, data.get("profile_name", "")) if center_url else None
+            sources, targets, weights = [], [], []
+            for collaborator in data.get("collaborators", []):
+                if not collaborator.get("url"):
+                    continue
+                node = self._node(collaborator["url"], collaborator.get("name", ""))
+                if center is not None and node != center:
+                    sources.append(center)
+                    targets.append(node)
+                    weights.append(float(collaborator.get("weight") or 1))
+            for edge in data.get("edges", []):
+                source, target = self._node(edge["source"]), self._node(edge["target"])
+                if source != target:
+                    sources.append(source)
+                    targets.append(target)
+                    weights.append(float(edge.get("weight") or 1))
+            self._session_edges[session_id] = (
+                np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64),
+                np.asarray(weights, dtype=np.float64)
+            )
+            self._adjacency = None
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ortak yazarlık ağı session'ı okuyamadı {path}: {e}")
+            return None
+
+    def _load_session(self, session_id: str):
+        """Session'ın tekli ve toplu işbirlikçi sonuçlarını (öncekilerin yerine) ekle"""
+        with self._lock:
+            for key in [key for key in self._session_edges if key.split("#", 1)[0] == session_id]:
+                del self._session_edges[key]
+            self._adjacency = None
+        session_dir = self.sessions_path / session_id
+        data = self._read(session_dir / "collaborators.json")
+        if data:
+            self.add_collaborators(session_id, data)
+        batch = self._read(session_dir / "collaborators_batch.json")
+        for entry in (batch or {}).get("profiles", []):
+            if entry.get("status") == "completed":
+                self.add_collaborators(f"{session_id}#{entry['profile_url']}", entry)
+
+    def refresh(self):
+        """İlk çağrıda tüm session'ları, sonra sadece kirli session'ları oku ve matrisi kur"""
+        with self._lock:
+            if not self._loaded:
+                if self.sessions_path.exists():
+                    self._dirty_sessions.update(path.name for path in self.sessions_path.iterdir() if path.is_dir())
+                self._loaded = True
+            dirty, self._dirty_sessions = self._dirty_sessions, set()
+            for session_id in sorted(dirty):
+                self._load_session(session_id)
+            if self._adjacency is None:
+                self._build()
+
+    def _build(self):
+        """Tüm session'ların ortak ağını kur; süzülmüş ağlar geçersiz olur"""
+        self._adjacency, self._metrics = self._compute(list(self._session_edges.values()))
+        self._views = {}
+
+    def _compute(self, parts: List[Tuple[Any, Any, Any]]) -> Tuple[Any, Dict[str, Any]]:
+        """Kenarları simetrik CSR matrise çevir (tekrar eden kenarda en büyük ağırlık) ve metrikleri hesapla"""
+        n = len(self._names)
+        if parts:
+            sources = np.concatenate([part[0] for part in parts])
+            targets = np.concatenate([part[1] for part in parts])
+            weights = np.concatenate([part[2] for part in parts])
+        else:
+            sources = targets = np.zeros(0, dtype=np.int64)
+            weights = np.zeros(0)
+        # Yönsüz: (min, max) çiftine indir, aynı çift için en büyük ağırlığı tut
+        low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+        keys = low * max(n, 1) + high
+        order = np.argsort(keys, kind="stable")
+        keys, weights = keys[order], weights[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.zeros(0, dtype=np.int64)
+        unique_keys = keys[starts]
+        max_weights = np.maximum.reduceat(weights, starts) if len(keys) else weights
+        rows, cols = unique_keys // max(n, 1), unique_keys % max(n, 1)
+
+        upper = sp.coo_matrix((max_weights, (rows, cols)), shape=(n, n))
+        adjacency = (upper + upper.T).tocsr()
+
+        degree = np.diff(adjacency.indptr)
+        component_count, labels = connected_components(adjacency, directed=False)
+        return adjacency, {
+            "degree": degree,
+            "strength": np.asarray(adjacency.sum(axis=1)).ravel(),
+            "pagerank": pagerank(adjacency),
+            "eigenvector": eigenvector_centrality(adjacency),
+            "component": labels,
+            "component_sizes": np.bincount(labels, minlength=component_count),
+        }
+
+    def _view(self, allowed: Optional[Callable[[str], bool]]) -> Tuple[Any, Dict[str, Any], bool]:
+        """Sadece izinli session'ların kenarlarından kurulan ağ (komşuluk, metrikler, süzüldü mü)
+
+        Başka istemcilerin session'ları sonuçlara ve merkezilik skorlarına
+        karışmaz; tüm session'lar izinliyse ortak ağ kullanılır.
+        """
+        if allowed is None:
+            return self._adjacency, self._metrics, False
+        keys = frozenset(key for key in self._session_edges if allowed(key.split("#", 1)[0]))
+        if len(keys) == len(self._session_edges):
+            return self._adjacency, self._metrics, False
+        view = self._views.get(keys)
+        if view is None:
+            if len(self._views) >= MAX_VIEWS:
+                self._views.clear()
+            view = self._views[keys] = self._compute([self._session_edges[key] for key in sorted(keys)])
+        return view[0], view[1], True
+
+    # --- Sorgu ---
+
+    def _node_info(self, index: int, metrics: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "url": self._urls[index],
+            "name": self._names[index],
+            "degree": int(metrics["degree"][index]),
+            "strength": round(float(metrics["strength"][index]), 3),
+            "pagerank": round(float(metrics["pagerank"][index]), 6),
+            "eigenvector": round(float(metrics["eigenvector"][index]), 6),
+            "component_size": int(metrics["component_sizes"][metrics["component"][index]]),
+        }
+
+    def central_around(self, profile_url: str, top_k: int = 10, hops: int = 1, metric: str = "pagerank",
+                       allowed: Optional[Callable[[str], bool]] = None) -> Optional[Dict[str, Any]]:
+        """profile_url'in hops adım çevresindeki en merkezi işbirlikçiler; profil ağda yoksa None
+
+        allowed verilirse sadece onun kabul ettiği session'ların kenarları kullanılır.
+        """
+        if metric not in CENTRALITY_METRICS:
+            raise ValueError(f"Bilinmeyen metrik: {metric} ({', '.join(CENTRALITY_METRICS)})")
+        self.refresh()
+        with self._lock:
+            adjacency, metrics, filtered = self._view(allowed)
+            center = self._node_of.get(profile_url)
+            if center is None or (filtered and not metrics["degree"][center]):
+                return None
+            # BFS: komşuluk matrisinin seyrek satır dilimleriyle
+            reached = np.zeros(len(self._names), dtype=bool)
+            reached[center] = True
+            frontier = np.array([center])
+            for _ in range(max(hops, 1)):
+                neighbors = adjacency[frontier].indices
+                new = np.unique(neighbors[~reached[neighbors]])
+                if not len(new):
+                    break
+                reached[new] = True
+                frontier = new
+            reached[center] = False
+            candidates = np.flatnonzero(reached)
+            scores = metrics[metric][candidates]
+            top = candidates[np.argsort(-scores, kind="stable")[:top_k]]
+            direct = adjacency[center]
+            direct_weights = dict(zip(direct.indices.tolist(), direct.data.tolist()))
+            results = []
+            for index in top:
+                info = self._node_info(int(index), metrics)
+                info["weight_to_profile"] = direct_weights.get(int(index))
+                results.append(info)
+            return {
+                "profile": self._node_info(center, metrics),
+                "neighborhood_size": int(len(candidates)),
+                "metric": metric,
+                "collaborators": results,
+            }
+
+    def stats(self, allowed: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+        self.refresh()
+        with self._lock:
+            adjacency, metrics, filtered = self._view(allowed)
+            sizes = metrics["component_sizes"]
+            nodes = len(self._names)
+            sessions = {key.split("#", 1)[0] for key in self._session_edges}
+            if allowed is not None:
+                sessions = {session_id for session_id in sessions if allowed(session_id)}
+            if filtered:
+                # Süzülmüş ağda sadece izinli kenarlara değen düğümler sayılır
+                connected = metrics["degree"] > 0
+                nodes = int(connected.sum())
+                sizes = sizes[np.unique(metrics["component"][connected])]
+            return {
+                "nodes": nodes,
+                "edges": int(adjacency.nnz // 2),
+                "sessions": len(sessions),
+                "components": int(len(sizes)),
+                "largest_component": int(sizes.max()) if len(sizes) else 0,
+            }
@@ -0,0 +1,270 @@
+"""
+Exporter - Session verilerini Parquet / Arrow IPC dosyalarına sütunlu olarak yazar
+
+Session'lar tek tek okunur ve kayıtlar batch_size'lık RecordBatch'ler halinde
+yazılır; bellekte aynı anda en fazla bir session'ın JSON'u ve bir batch bulunur.
+Tekrar eden metin sütunları (session_id, university, title, etiketler) sözlük
+kodlamalı yazılır, ham info metni dışa aktarılmaz.
+
+Kullanım:
+    PYTHONPATH=src python -m utils.exporter --output exports/ [--session ID ...] [--format arrow] [--per-session]
+"""
+
+import argparse
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow opsiyonel
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("parquet", "arrow")
+EXPORT_KINDS = ("profiles", "collaborators")
+
+DEFAULT_BATCH_SIZE = 10_000
+
+_KIND_FILES = {"profiles": "main_profile.json", "collaborators": "collaborators.json"}
+
+# (sütun, tip) - "dict" sözlük kodlamalı metin
+_COLUMNS = {
+    "profiles": [
+        ("session_id", "dict"), ("id", "int"), ("name", "str"), ("title", "dict"),
+        ("university", "dict"), ("header", "str"), ("email", "str"), ("url", "str"),
+        ("photo_url", "str"), ("green_label", "dict"), ("blue_label", "dict"), ("keywords", "str"),
+    ],
+    "collaborators": [
+        ("session_id", "dict"), ("id", "int"), ("name", "str"), ("title", "dict"),
+        ("green_label", "dict"), ("blue_label", "dict"), ("keywords", "str"), ("email", "str"),
+        ("url", "str"), ("photo_url", "str"), ("deleted", "bool"), ("weight", "float"),
+    ],
+}
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Dışa aktarma için pyarrow gerekli: pip install pyarrow")
+
+
+def _arrow_type(kind: str):
+    return {
+        "dict": pa.dictionary(pa.int32(), pa.string()),
+        "int": pa.int64(),
+        "str": pa.string(),
+        "bool": pa.bool_(),
+        "float": pa.float64(),
+    }[kind]
+
+
+def export_schema(kind: str):
+    """Kayıt türünün Arrow şeması"""
+    _require_pyarrow()
+    return pa.schema([(name, _arrow_type(column_type)) for name, column_type in _COLUMNS[kind]])
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float_or_none(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _flatten(kind: str, session_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON kaydını export sütunlarına dönüştür"""
+    row = {
+        "session_id": session_id,
+        "id": _int_or_none(record.get("id")),
+        "name": record.get("name") or None,
+        "title": record.get("title") or None,
+        "green_label": record.get("green_label") or None,
+        "blue_label": record.get("blue_label") or None,
+        "keywords": record.get("keywords") or None,
+        "email": record.get("email") or None,
+        "url": record.get("url") or None,
+        "photo_url": record.get("photoUrl") or None,
+    }
+    if kind == "profiles":
+        header = record.get("header") or ""
+        row["header"] = header or None
+        row["university"] = header.split("/")[0].strip() or None
+    else:
+        row["deleted"] = bool(record.get("deleted", False))
+        row["weight"] = _float_or_none(record.get("weight"))
+    return row
+
+
+def list_session_ids(sessions_path: Path) -> List[str]:
+    """Diskteki session ID'leri (isim sırasıyla)"""
+    if not sessions_path.exists():
+        return []
+    return sorted(path.name for path in sessions_path.iterdir() if path.is_dir())
+
+
+def iter_session_records(sessions_path: Path, kind: str,
+                         session_ids: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(session_id, kayıt) çiftlerini session session oku"""
+    for session_id in (session_ids if session_ids is not None else list_session_ids(sessions_path)):
+        path = sessions_path / session_id / _KIND_FILES[kind]
+        if not path.exists():
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Session okunamadı {path}: {e}")
+            continue
+        for record in data.get(kind, []):
+            yield session_id, record
+
+
+class _DictionaryEncoder:
+    """Batch'ler boyunca büyüyen ortak sözlük
+
+    Her batch önceki sözlüğün uzantısını kullanır; böylece Arrow IPC dosyasına
+    sözlük değişimi yerine delta yazılır ve Parquet'te kategori sırası tutarlı kalır.
+    """
+
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self._values: List[str] = []
+
+    def encode(self, values: Sequence[Optional[str]]):
+        indices = []
+        for value in values:
+            if value is None:
+                indices.append(None)
+                continue
+            index = self._index.get(value)
+            if index is None:
+                index = self._index[value] = len(self._values)
+                self._values.append(value)
+            indices.append(index)
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=pa.int32()), pa.array(self._values, type=pa.string())
+        )
+
+
+class _BatchWriter:
+    """Parquet veya Arrow IPC dosyasına RecordBatch yazan ince sarmalayıcı"""
+
+    def __init__(self, path: Path, kind: str, fmt: str):
+        self.path = path
+        self.kind = kind
+        self.schema = export_schema(kind)
+        self.rows = 0
+        self._encoders = {
+            name: _DictionaryEncoder() for name, column_type in _COLUMNS[kind] if column_type == "dict"
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(str(path), self.schema, compression="zstd")
+        else:
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self._writer = pa.ipc.new_file(str(path), self.schema, options=options)
+
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        arrays = []
+        for field in self.schema:
+            values = [row.get(field.name) for row in rows]
+            if field.name in self._encoders:
+                arrays.append(self._encoders[field.name].encode(values))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.rows += len(rows)
+
+    def close(self):
+        self._writer.close()
+
+
+def _write_kind(writer: "_BatchWriter", records: Iterable[Tuple[str, Dict[str, Any]]], batch_size: int):
+    rows: List[Dict[str, Any]] = []
+    for session_id, record in records:
+        rows.append(_flatten(writer.kind, session_id, record))
+        if len(rows) >= batch_size:
+            writer.write_rows(rows)
+            rows = []
+    writer.write_rows(rows)
+
+
+def export_sessions(sessions_path: Path, output_dir: Path, session_ids: Optional[Sequence[str]] = None,
+                    kinds: Sequence[str] = EXPORT_KINDS, fmt: str = "parquet", merge: bool = True,
+                    batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """Session'ları dışa aktar
+
+    merge=True: tür başına tek dosya (profiles.parquet, collaborators.parquet),
+    merge=False: session başına ayrı dosyalar (<session_id>_profiles.parquet).
+    """
+    _require_pyarrow()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Desteklenmeyen format: {fmt} ({', '.join(EXPORT_FORMATS)})")
+    unknown = [kind for kind in kinds if kind not in EXPORT_KINDS]
+    if unknown:
+        raise ValueError(f"Bilinmeyen kayıt türü: {', '.join(unknown)}")
+
+    sessions_path = Path(sessions_path)
+    output_dir = Path(output_dir)
+    session_ids = list(session_ids) if session_ids is not None else list_session_ids(sessions_path)
+    extension = "parquet" if fmt == "parquet" else "arrow"
+
+    files = []
+    for kind in kinds:
+        groups = [(kind, session_ids)] if merge else [(f"{session_id}_{kind}", [session_id]) for session_id in session_ids]
+        for stem, group in groups:
+            # Kaydı olmayan session'lar için boş dosya açma
+            if not merge and not (sessions_path / group[0] / _KIND_FILES[kind]).exists():
+                continue
+            writer = _BatchWriter(output_dir / f"{stem}.{extension}", kind, fmt)
+            try:
+                _write_kind(writer, iter_session_records(sessions_path, kind, group), batch_size)
+            finally:
+                writer.close()
+            files.append({"kind": kind, "path": str(writer.path), "rows": writer.rows})
+            logger.info(f"Dışa aktarıldı: {writer.path} ({writer.rows} satır)")
+
+    return {
+        "format": fmt,
+        "merged": merge,
+        "session_count": len(session_ids),
+        "output_dir": str(output_dir),
+        "files": files,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Session verilerini Parquet/Arrow olarak dışa aktar")
+    parser.add_argument("--sessions", default="data/sessions", help="Session dizini")
+    parser.add_argument("--output", help="Çıktı dizini (varsayılan: data/exports/<zaman>)")
+    parser.add_argument("--session", action="append", dest="session_ids", help="Sadece bu session (tekrarlanabilir)")
+    parser.add_argument("--kind", action="append", dest="kinds", choices=EXPORT_KINDS, help="Kayıt türü (tekrarlanabilir)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="parquet")
+    parser.add_argument("--per-session", action="store_true", help="Session başına ayrı dosya yaz")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    output = Path(args.output) if args.output else Path("data/exports") / f"{datetime.now():%Y%m%d_%H%M%S}"
+    result = export_sessions(
+        Path(args.sessions), output, args.session_ids, args.kinds or EXPORT_KINDS,
+        args.format, not args.per_session, args.batch_size
+    )
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
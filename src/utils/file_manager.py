@@ -1,11 +1,17 @@
 import os
 import json
+import shutil
+import uuid
+import asyncio
 import aiofiles
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime
 from pathlib import Path
 
+from .taxonomy import get_taxonomy
+from .logging_setup import HOT
+
 logger = logging.getLogger(__name__)
 
 class FileManager:
@@ -15,43 +21,36 @@ class FileManager:
         self.base_path = Path(base_path)
         self.sessions_path = self.base_path / "sessions"
         self.fields_path = self.base_path / "fields.json"
+        self.taxonomy = get_taxonomy(self.fields_path)
+        
+        # Kayıt dinleyicileri: listener(session_id, kind), kind = profiles | collaborators | collaborators_batch | deleted
+        self._save_listeners: List[Callable[[str, str], None]] = []
         
         # Dizinleri oluştur
         self.sessions_path.mkdir(parents=True, exist_ok=True)
     
+    def add_save_listener(self, listener: Callable[[str, str], None]):
+        """Session verisi yazıldığında çağrılacak dinleyici ekle"""
+        self._save_listeners.append(listener)
+    
+    def _notify_saved(self, session_id: str, kind: str):
+        for listener in self._save_listeners:
+            try:
+                listener(session_id, kind)
+            except Exception as e:
+                logger.warning(f"Kayıt dinleyicisi hatası: {e}")
+    
     async def load_fields(self) -> List[Dict[str, Any]]:
         """Fields.json dosyasını yükle"""
-        try:
-            async with aiofiles.open(self.fields_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                return json.loads(content)
-        except Exception as e:
-            logger.error(f"Fields.json yüklenemedi: {e}")
-            return []
+        return self.taxonomy.fields
     
     def get_field_name_by_id(self, field_id: int) -> Optional[str]:
         """Field ID'ye göre alan adını bul"""
-        try:
-            # Fields verilerini senkron olarak yükle
-            with open(self.fields_path, 'r', encoding='utf-8') as f:
-                fields_data = json.load(f)
-            
-            for field in fields_data:
-                if field['id'] == field_id:
-                    return field['name']
-            return None
-        except Exception as e:
-            logger.error(f"Field name lookup failed: {e}")
-            return None
+        return self.taxonomy.get_field_name(field_id)
     
-    def get_specialty_name_by_id(self, fields_data: List[Dict], field_id: int, specialty_id: int) -> Optional[str]:
+    def get_specialty_name_by_id(self, field_id: int, specialty_id: int) -> Optional[str]:
         """Specialty ID'ye göre uzmanlık adını bul"""
-        for field in fields_data:
-            if field['id'] == field_id:
-                for specialty in field['specialties']:
-                    if specialty['id'] == specialty_id:
-                        return specialty['name']
-        return None
+        return self.taxonomy.get_specialty_name(field_id, specialty_id)
     
     def get_session_dir(self, session_id: str) -> Path:
         """Session dizinini al"""
@@ -66,17 +65,29 @@ class FileManager:
                 session_dir.mkdir(parents=True, exist_ok=True)
                 logger.info(f"Session klasörü oluşturuldu: {session_dir}")
             else:
-                logger.info(f"Session klasörü zaten mevcut: {session_dir}")
+                logger.debug("Session klasörü zaten mevcut: %s", session_dir, extra=HOT)
             return session_dir
         except Exception as e:
             logger.error(f"Session klasörü oluşturulamadı: {e}")
             # Hata durumunda base path'i döndür
             return self.sessions_path
     
+    @staticmethod
+    async def _write_json(path: Path, data: Any):
+        """Okuyucular yarım yazılmış dosya görmesin: geçici dosyaya yaz, sonra değiştir"""
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            async with aiofiles.open(tmp_path, 'w', encoding='utf-8') as f:
+                await f.write(json.dumps(data, ensure_ascii=False, indent=2))
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    
     async def save_profiles(self, session_id: str, profiles: List[Dict[str, Any]]) -> bool:
         """Profil verilerini kaydet"""
         try:
-            logger.info(f"Profil verileri kaydediliyor: {session_id}, {len(profiles)} profil")
+            logger.info("Profil verileri kaydediliyor: %s, %d profil", session_id, len(profiles), extra=HOT)
             
             session_dir = await self.create_session_dir(session_id)
             profile_file = session_dir / "main_profile.json"
@@ -88,11 +99,11 @@ class FileManager:
                 "total_count": len(profiles)
             }
             
-            # Dosya yazma işlemi
-            async with aiofiles.open(profile_file, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, ensure_ascii=False, indent=2))
+            # Dosya yazma işlemi (quick_search ve durum sorguları yazım sırasında okuyabilir)
+            await self._write_json(profile_file, data)
             
-            logger.info(f"Profil verileri başarıyla kaydedildi: {profile_file}")
+            logger.info("Profil verileri başarıyla kaydedildi: %s", profile_file, extra=HOT)
+            self._notify_saved(session_id, "profiles")
             return True
         except Exception as e:
             logger.error(f"Profil verileri kaydedilemedi: {e}")
@@ -109,10 +120,10 @@ class FileManager:
             profile_file = session_dir / "main_profile.json"
             
             # Dosya yazma işlemi
-            async with aiofiles.open(profile_file, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(completed_data, ensure_ascii=False, indent=2))
+            await self._write_json(profile_file, completed_data)
             
             logger.info(f"Tamamlanmış profil verileri başarıyla kaydedildi: {profile_file}")
+            self._notify_saved(session_id, "profiles")
             return True
         except Exception as e:
             logger.error(f"Tamamlanmış profil verileri kaydedilemedi: {e}")
@@ -120,8 +131,9 @@ class FileManager:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return False
     
-    async def save_collaborators(self, session_id: str, collaborators: List[Dict[str, Any]]) -> bool:
-        """İşbirlikçi verilerini kaydet"""
+    async def save_collaborators(self, session_id: str, collaborators: List[Dict[str, Any]],
+                                 graph: Optional[Dict[str, Any]] = None) -> bool:
+        """İşbirlikçi verilerini kaydet (graph: merkez profil ve URL'li kenarlar)"""
         try:
             session_dir = await self.create_session_dir(session_id)
             collab_file = session_dir / "collaborators.json"
@@ -132,16 +144,100 @@ class FileManager:
                 "created_at": datetime.now().isoformat(),
                 "total_count": len(collaborators)
             }
+            if graph:
+                data.update(graph)
             
-            async with aiofiles.open(collab_file, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, ensure_ascii=False, indent=2))
+            await self._write_json(collab_file, data)
             
             logger.info(f"İşbirlikçi verileri kaydedildi: {len(collaborators)} işbirlikçi")
+            self._notify_saved(session_id, "collaborators")
             return True
         except Exception as e:
             logger.error(f"İşbirlikçi verileri kaydedilemedi: {e}")
             return False
     
+    async def save_collaborator_batch(self, session_id: str, batch_data: Dict[str, Any]) -> bool:
+        """Toplu işbirlikçi sonuçlarını kaydet (profil başına işbirlikçiler ve kenarlar)"""
+        try:
+            session_dir = await self.create_session_dir(session_id)
+            await self._write_json(session_dir / "collaborators_batch.json", batch_data)
+            self._notify_saved(session_id, "collaborators_batch")
+            return True
+        except Exception as e:
+            logger.error(f"Toplu işbirlikçi verileri kaydedilemedi: {e}")
+            return False
+    
+    def _collaborator_journal(self, session_id: str) -> Path:
+        return self.get_session_dir(session_id) / "collaborators.partial.jsonl"
+    
+    async def start_collaborator_journal(self, session_id: str, header: Dict[str, Any]) -> bool:
+        """Devam ettirilebilir işbirlikçi işi için günlüğü başlıkla (profil, grafik, hedefler) yeniden başlat"""
+        try:
+            session_dir = await self.create_session_dir(session_id)
+            async with aiofiles.open(session_dir / "collaborators.partial.jsonl", 'w', encoding='utf-8') as f:
+                await f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            return True
+        except Exception as e:
+            logger.error(f"İşbirlikçi günlüğü başlatılamadı: {e}")
+            return False
+    
+    async def append_collaborator_record(self, session_id: str, record: Dict[str, Any]) -> bool:
+        """Tamamlanan bir işbirlikçi kaydını günlüğe ekle (tek satır, çökmede öncekiler korunur)"""
+        try:
+            async with aiofiles.open(self._collaborator_journal(session_id), 'a', encoding='utf-8') as f:
+                await f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                await f.flush()
+            return True
+        except Exception as e:
+            logger.error(f"İşbirlikçi kaydı günlüğe eklenemedi: {e}")
+            return False
+    
+    async def load_collaborator_journal(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Günlüğü oku: {"header": ..., "records": [...]}; yoksa None
+        
+        Çökme anında yarım yazılmış son satır atlanır.
+        """
+        journal = self._collaborator_journal(session_id)
+        if not journal.exists():
+            return None
+        try:
+            async with aiofiles.open(journal, 'r', encoding='utf-8') as f:
+                lines = (await f.read()).splitlines()
+        except Exception as e:
+            logger.error(f"İşbirlikçi günlüğü okunamadı: {e}")
+            return None
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"İşbirlikçi günlüğünde bozuk satır atlandı: {session_id}")
+        if not entries:
+            return None
+        return {"header": entries[0], "records": entries[1:]}
+    
+    def clear_collaborator_journal(self, session_id: str):
+        """İş tamamlanınca günlüğü sil"""
+        self._collaborator_journal(session_id).unlink(missing_ok=True)
+    
+    async def delete_session(self, session_id: str) -> bool:
+        """Session dizinini tüm dosyalarıyla sil"""
+        session_dir = self.get_session_dir(session_id)
+        if not session_dir.is_dir():
+            return False
+        try:
+            await asyncio.to_thread(shutil.rmtree, session_dir)
+        except OSError as e:
+            logger.warning(f"Session silinemedi {session_id}: {e}")
+            return False
+        logger.info(f"Session silindi: {session_id}")
+        self._notify_saved(session_id, "deleted")
+        return True
+    
+    def clear_session_complete(self, session_id: str, file_type: str):
+        """Yeni iş başlarken önceki işin tamamlandı işaretini kaldır"""
+        (self.get_session_dir(session_id) / f"{file_type}_done.txt").unlink(missing_ok=True)
+    
     async def mark_session_complete(self, session_id: str, file_type: str) -> bool:
         """Session'ı tamamlandı olarak işaretle"""
         try:
@@ -152,6 +248,7 @@ class FileManager:
                 await f.write("completed")
             
             logger.info(f"Session {session_id} {file_type} tamamlandı olarak işaretlendi")
+            self._notify_saved(session_id, "profiles" if file_type == "main" else file_type)
             return True
         except Exception as e:
             logger.error(f"Session tamamlandı işaretlenemedi: {e}")
@@ -168,6 +265,8 @@ class FileManager:
                 file_path = session_dir / "main_profile.json"
             elif data_type == "collaborators":
                 file_path = session_dir / "collaborators.json"
+            elif data_type == "collaborators_batch":
+                file_path = session_dir / "collaborators_batch.json"
             else:
                 return None
             
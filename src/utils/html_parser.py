@@ -0,0 +1,238 @@
+"""
+HTML Parser - Tek bir page_source/HTTP gövdesinden çevrimdışı veri çıkarma
+
+WebDriver'a eleman eleman sormak yerine sayfanın HTML'i bir kez alınır ve
+lxml ile yerel olarak ayrıştırılır. Fonksiyonlar saf (yan etkisiz) olduğu için
+thread veya process pool içinde çalıştırılabilir ve kayıtlı HTML fixture'ları
+ile test edilebilir.
+"""
+
+import re
+from typing import Dict, List, Optional, Any
+from urllib.parse import urljoin
+
+from lxml import html as lxml_html
+
+DEFAULT_PHOTO_URL = "/default_photo.jpg"
+
+# Selenium'un .text çıktısında satır sonu üreten blok elemanlar
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+    "fieldset", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table",
+    "tbody", "thead", "tfoot", "tr", "ul",
+}
+_SKIP_TAGS = {"script", "style", "noscript", "template"}
+_WHITESPACE_RE = re.compile(r"[ \t\r\n\f\v]+")
+
+
+def _class_xpath(class_name: str) -> str:
+    """CSS sınıf seçicisinin XPath karşılığı"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def _collect_text(element, parts: List[str]):
+    """Elemanın görünen metnini blok sınırlarında satır sonu ekleyerek topla"""
+    tag = element.tag if isinstance(element.tag, str) else ""
+    if tag in _SKIP_TAGS:
+        return
+    if tag == "br":
+        parts.append("\n")
+        return
+
+    is_block = tag in _BLOCK_TAGS
+    if is_block:
+        parts.append("\n")
+    if tag and element.text:
+        parts.append(element.text)
+    for child in element:
+        _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+    if is_block:
+        parts.append("\n")
+
+
+def render_text(element) -> str:
+    """Selenium WebElement.text çıktısına yakın metin üret
+
+    Normal boşluklar satır içinde tek boşluğa indirilir, &nbsp; karakterleri ise
+    tarayıcıdaki gibi korunup normal boşluğa çevrilir.
+    """
+    if element is None:
+        return ""
+    parts: List[str] = []
+    _collect_text(element, parts)
+    lines = []
+    for line in "".join(parts).split("\n"):
+        line = _WHITESPACE_RE.sub(" ", line).replace("\xa0", " ").strip()
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _first(nodes):
+    return nodes[0] if nodes else None
+
+
+def _absolute(base_url: str, value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    return urljoin(base_url, value.strip()) if base_url else value.strip()
+
+
+def _parse_document(source: str):
+    return lxml_html.fromstring(source) if source and source.strip() else None
+
+
+def _find_profile_rows(document) -> List[Any]:
+    """Profil satırlarını scraper'daki sırayla aynı yöntemlerle bul"""
+    # Yöntem 1: authorInfo_ ile başlayan ID'ler
+    rows = document.xpath("//tr[starts-with(@id, 'authorInfo_')]")
+    # Yöntem 2: Tablo satırları
+    if not rows:
+        rows = document.xpath("//table//tbody/tr[td]")
+    # Yöntem 3: Link içeren satırlar
+    if not rows:
+        rows = document.xpath("//tr[.//a]")
+    return rows
+
+
+def extract_keywords(info: str, header: str, green_label: str, blue_label: str) -> str:
+    """Info metninin son satırından anahtar kelimeleri çıkar"""
+    label_text = f"{green_label}   {blue_label}"
+    keywords_text = info.replace(label_text, '').strip()
+    keywords_text = keywords_text.lstrip(';:,. \u000b\n\t')
+    lines = [l.strip() for l in keywords_text.split('\n') if l.strip()]
+    if not lines:
+        return ""
+    keywords_line = lines[-1]
+    if header.strip() == keywords_line or header.strip() in keywords_line:
+        return ""
+    keywords = [k.strip() for k in keywords_line.split(';') if k.strip()]
+    return " ; ".join(keywords) if keywords else ""
+
+
+def parse_profile_row(row, base_url: str = "", default_photo_url: str = DEFAULT_PHOTO_URL) -> Optional[Dict[str, Any]]:
+    """Arama sonucundaki tek bir satırı profil kaydına çevir"""
+    info_td = _first(row.xpath("./td[h6]"))
+    link = _first(row.xpath(".//a"))
+    if info_td is None or link is None:
+        return None
+
+    all_links = info_td.xpath(f".//a[{_class_xpath('anahtarKelime')}]")
+    green_label = render_text(all_links[0]) if len(all_links) > 0 else ''
+    blue_label = render_text(all_links[1]) if len(all_links) > 1 else ''
+
+    link_text = render_text(link)
+    url = _absolute(base_url, link.get("href"))
+
+    img = _first(row.xpath(".//img"))
+    img_src = _absolute(base_url, img.get("src")) if img is not None else None
+    if not img_src:
+        img_src = default_photo_url
+
+    info = render_text(info_td)
+    info_lines = info.splitlines()
+    if len(info_lines) > 1:
+        title = info_lines[0].strip()
+        name = info_lines[1].strip()
+    else:
+        title = link_text
+        name = link_text
+    header = info_lines[2].strip() if len(info_lines) > 2 else ''
+
+    email_link = _first(row.xpath(".//a[starts-with(@href, 'mailto')]"))
+    email = render_text(email_link).replace('[at]', '@') if email_link is not None else ''
+
+    return {
+        "name": name,
+        "title": title,
+        "url": url,
+        "info": info,
+        "photoUrl": img_src,
+        "header": header,
+        "green_label": green_label,
+        "blue_label": blue_label,
+        "keywords": extract_keywords(info, header, green_label, blue_label),
+        "email": email
+    }
+
+
+def parse_profile_rows(source: str, base_url: str = "", default_photo_url: str = DEFAULT_PHOTO_URL) -> List[Dict[str, Any]]:
+    """Arama sonuç sayfasındaki tüm profil satırlarını ayrıştır
+
+    Dönen kayıtlarda "id" alanı yoktur; ID'ler sayfalar arası tekilleştirme
+    yapan scraper tarafından verilir.
+    """
+    document = _parse_document(source)
+    if document is None:
+        return []
+    profiles = []
+    for row in _find_profile_rows(document):
+        profile = parse_profile_row(row, base_url, default_photo_url)
+        if profile:
+            profiles.append(profile)
+    return profiles
+
+
+def has_next_page(source: str) -> bool:
+    """Sayfalamada aktif sayfadan sonra bir sayfa var mı?"""
+    document = _parse_document(source)
+    if document is None:
+        return False
+    pagination = _first(document.xpath(f"//ul[{_class_xpath('pagination')}]"))
+    if pagination is None:
+        return False
+    lis = pagination.xpath("./li")
+    for index, li in enumerate(lis):
+        if li.xpath(f"self::li[{_class_xpath('active')}]"):
+            return index < len(lis) - 1 and bool(lis[index + 1].xpath(".//a"))
+    return False
+
+
+def parse_profile_page(source: str, base_url: str = "", default_photo_url: str = DEFAULT_PHOTO_URL) -> Optional[Dict[str, Any]]:
+    """Akademisyen profil sayfasını ayrıştır
+
+    Profil bilgisi (td[h6]) yoksa silinmiş profil kabul edilir ve None döner.
+    """
+    document = _parse_document(source)
+    if document is None:
+        return None
+    info_td = _first(document.xpath("//td[h6]"))
+    if info_td is None:
+        return None
+
+    info = render_text(info_td)
+    info_lines = info.splitlines()
+    title = info_lines[0].strip() if len(info_lines) > 1 else ''
+    name = info_lines[1].strip() if len(info_lines) > 1 else ''
+    header = info_lines[2].strip() if len(info_lines) > 2 else ''
+
+    green_span = _first(info_td.xpath(f".//span[{_class_xpath('label-success')}]"))
+    green_label = render_text(green_span) if green_span is not None else ''
+
+    # Anahtar kelimeler label-primary span'inden hemen sonra gelen düz metindir
+    blue_span = _first(info_td.xpath(f".//span[{_class_xpath('label-primary')}]"))
+    blue_label = render_text(blue_span) if blue_span is not None else ''
+    keywords_str = (blue_span.tail or '').strip() if blue_span is not None else ''
+
+    email_link = _first(info_td.xpath(".//a[starts-with(@href, 'mailto')]"))
+    email = render_text(email_link).replace('[at]', '@') if email_link is not None else ''
+
+    img = _first(document.xpath(f"//img[{_class_xpath('img-circle')}]"))
+    if img is None:
+        img = _first(document.xpath("//img[@id='imgPicture']"))
+    photo_url = _absolute(base_url, img.get("src")) if img is not None else None
+
+    return {
+        "name": name,
+        "title": title,
+        "info": info,
+        "header": header,
+        "green_label": green_label,
+        "blue_label": blue_label,
+        "keywords": keywords_str,
+        "photoUrl": photo_url or default_photo_url,
+        "email": email
+    }
@@ -0,0 +1,203 @@
+"""
+Logging Setup - Kuyruk tabanlı, örneklemeli ve yapılandırılmış (JSON) loglama
+
+Log kayıtları çağıran thread'de (event loop) sadece bir kuyruğa eklenir; stderr'e
+yazma işini QueueListener thread'i yapar. extra=HOT ile işaretlenen sıcak döngü
+logları çağrı noktası başına token bucket ile sınırlandırılır. session_id/page
+gibi alanlar contextvars üzerinden her kayda otomatik eklenir.
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
+
+from .metrics import metrics
+
+# Sıcak döngü loglarını işaretlemek için: logger.info(..., extra=HOT)
+HOT = {"hot": True}
+
+# Kayıtlara eklenen yapılandırılmış alanlar
+CONTEXT_FIELDS = ("session_id", "page")
+
+_log_context: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("yok_log_context", default={})
+
+_installed: Optional[Tuple[QueueHandler, QueueListener]] = None
+
+
+def set_log_context(**fields):
+    """Mevcut task/context için log alanlarını ayarla (örn. session_id, page)"""
+    context = dict(_log_context.get())
+    context.update(fields)
+    _log_context.set(context)
+
+
+class ContextFilter(logging.Filter):
+    """contextvars'taki alanları kayda ekler (açıkça verilen extra alanları ezmez)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _log_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class HotLogSampler(logging.Filter):
+    """HOT işaretli INFO/DEBUG kayıtlarını çağrı noktası başına token bucket ile sınırlar
+
+    Atlanan kayıt sayısı, geçen bir sonraki kayda "suppressed" alanı olarak eklenir.
+    WARNING ve üstü seviyeler asla atlanmaz.
+    """
+
+    def __init__(self, rate: float = 5.0, burst: int = 20):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.dropped = 0
+        self._buckets: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "hot", False) or record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # [token, son güncelleme, atlanan]
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                self.dropped += 1
+                return False
+            bucket[0] -= 1
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Kuyruk doluysa beklemek yerine kaydı atan QueueHandler"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Mesajı argümanlarla birleştir ama exc_info'yu koru
+
+        Standart prepare() traceback'i mesaja gömüp exc_info'yu siler; böylece JSON
+        formatı hatayı ayrı alana yazamazdı. Biçimlendirmeyi listener'daki formatter yapar.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+def _context_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    fields = {key: getattr(record, key) for key in CONTEXT_FIELDS if getattr(record, key, None) is not None}
+    if getattr(record, "suppressed", 0):
+        fields["suppressed"] = record.suppressed
+    return fields
+
+
+class TextFormatter(logging.Formatter):
+    """Varsayılan metin formatı + [session_id=... page=...] eki"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = _context_fields(record)
+        if fields:
+            text += " [" + " ".join(f"{key}={value}" for key, value in fields.items()) + "]"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """Tek satır JSON formatı"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **_context_fields(record),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def setup_logging(level: Optional[str] = None, log_format: Optional[str] = None,
+                  queue_size: Optional[int] = None) -> QueueListener:
+    """Root logger'ı kuyruk + stderr listener ile yapılandır
+
+    YOK_LOG_LEVEL, YOK_LOG_FORMAT (text/json), YOK_LOG_QUEUE_SIZE,
+    YOK_LOG_HOT_RATE (saniyede) ve YOK_LOG_HOT_BURST ortam değişkenleriyle ayarlanır.
+    """
+    global _installed
+    level = level or os.getenv("YOK_LOG_LEVEL", "INFO")
+    log_format = log_format or os.getenv("YOK_LOG_FORMAT", "text")
+    queue_size = queue_size or int(os.getenv("YOK_LOG_QUEUE_SIZE", "10000"))
+
+    root = logging.getLogger()
+    if _installed:
+        old_handler, old_listener = _installed
+        root.removeHandler(old_handler)
+        old_listener.stop()
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter() if log_format == "json" else TextFormatter())
+
+    log_queue: queue.Queue = queue.Queue(queue_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    sampler = HotLogSampler(
+        rate=float(os.getenv("YOK_LOG_HOT_RATE", "5")),
+        burst=int(os.getenv("YOK_LOG_HOT_BURST", "20"))
+    )
+    queue_handler.addFilter(sampler)
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+    _installed = (queue_handler, listener)
+
+    metrics.register_gauge("log_dropped", lambda: {"sampled": sampler.dropped, "queue_full": queue_handler.dropped})
+    return listener
+
+
+@atexit.register
+def shutdown_logging():
+    """Kuyrukta kalan kayıtları yazıp listener'ı durdur"""
+    global _installed
+    if _installed:
+        handler, listener = _installed
+        logging.getLogger().removeHandler(handler)
+        listener.stop()
+        _installed = None
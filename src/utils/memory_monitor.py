@@ -0,0 +1,268 @@
+"""
+Memory Monitor - Python heap (tracemalloc), Chrome süreç ağacı RSS'i ve session bazlı bellek dağılımı
+
+Chrome süreçleri chromedriver'ın alt süreçleri olarak açılır; bir driver'ın
+maliyeti chromedriver PID'sinden başlayan süreç ağacının toplam RSS'idir.
+psutil kuruluysa o kullanılır, yoksa Linux'ta /proc okunur.
+"""
+
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Any, Callable
+
+from .metrics import metrics
+
+try:
+    import psutil
+except ImportError:  # psutil opsiyonel
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Havuzda boşta bekleyen driver'ların işlem adı (bellekte sayılır, kapasitede sayılmaz)
+IDLE_OPERATION = "idle"
+
+
+def _page_size() -> int:
+    try:
+        return os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return 4096
+
+
+def _proc_children_map() -> Dict[int, List[int]]:
+    """/proc/*/stat dosyalarından ppid -> [pid] eşlemesini oluştur"""
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return children
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Süreç adı parantez içinde boşluk içerebilir, ppid son ')' sonrasındaki 2. alan
+        fields = stat.rsplit(")", 1)[-1].split()
+        if len(fields) > 1:
+            children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+
+def _proc_rss(pid: int) -> int:
+    """Tek bir sürecin RSS'ini byte olarak oku"""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * _page_size()
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def process_tree_pids(pid: int) -> List[int]:
+    """Bir sürecin kendisi ve tüm alt süreçlerinin PID'leri"""
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            return [pid] + [child.pid for child in process.children(recursive=True)]
+        except psutil.Error:
+            return []
+    if not os.path.exists(f"/proc/{pid}"):
+        return []
+    children = _proc_children_map()
+    pids, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        pids.append(current)
+        stack.extend(children.get(current, []))
+    return pids
+
+
+def process_rss(pid: int) -> int:
+    """Bir sürecin RSS'i (byte)"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return 0
+    return _proc_rss(pid)
+
+
+def process_tree_rss(pid: int) -> int:
+    """Süreç ağacının toplam RSS'i (byte)"""
+    return sum(process_rss(child) for child in process_tree_pids(pid))
+
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """dict/list/str gibi JSON benzeri yapıların yaklaşık derin boyutu (byte)"""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(key, seen) + estimate_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in obj)
+    return size
+
+
+class MemoryMonitor:
+    """Driver, session ve Python heap bellek kullanımını izler"""
+
+    def __init__(self):
+        self._drivers: Dict[int, Dict[str, Any]] = {}
+        self._session_sources: Dict[str, Callable[[], Dict[str, int]]] = {}
+        # YOK_DRIVER_MAX_RSS_MB aşılan driver'lar güvenli noktalarda yeniden başlatılır
+        max_rss_mb = os.getenv("YOK_DRIVER_MAX_RSS_MB")
+        self.max_driver_rss = int(float(max_rss_mb) * MB) if max_rss_mb else None
+        if os.getenv("YOK_TRACEMALLOC", "").lower() in ("1", "true", "yes"):
+            self.start_tracemalloc()
+
+    def start_tracemalloc(self, frames: int = 1):
+        """tracemalloc'u başlat (ek bellek ve CPU maliyeti vardır)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.info("tracemalloc başlatıldı")
+
+    def stop_tracemalloc(self):
+        """tracemalloc'u durdur"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("tracemalloc durduruldu")
+
+    def register_driver(self, driver, session_id: Optional[str] = None, operation: str = ""):
+        """Yeni açılan driver'ı session bilgisiyle kaydet"""
+        try:
+            pid = driver.service.process.pid
+        except AttributeError:
+            pid = None
+        self._drivers[id(driver)] = {
+            "pid": pid,
+            "session_id": session_id,
+            "operation": operation,
+            "started_at": time.time(),
+        }
+
+    def unregister_driver(self, driver):
+        """Kapatılan driver'ı kayıttan çıkar"""
+        self._drivers.pop(id(driver), None)
+
+    def driver_info(self, driver) -> Optional[Dict[str, Any]]:
+        """Kayıtlı driver bilgisini döndür"""
+        return self._drivers.get(id(driver))
+
+    def driver_rss(self, driver) -> int:
+        """Driver'ın chromedriver + Chrome süreç ağacı RSS'i (byte)"""
+        info = self._drivers.get(id(driver))
+        if not info or not info["pid"]:
+            return 0
+        return process_tree_rss(info["pid"])
+
+    def should_recycle(self, driver) -> bool:
+        """Driver RSS eşiği aştı mı?"""
+        if not self.max_driver_rss:
+            return False
+        rss = self.driver_rss(driver)
+        if rss > self.max_driver_rss:
+            logger.warning(f"Driver RSS eşiği aşıldı: {rss / MB:.1f} MB > {self.max_driver_rss / MB:.1f} MB")
+            return True
+        return False
+
+    def driver_count(self, operation: Optional[str] = None) -> int:
+        """Çalışan driver sayısı (operation verilirse sadece o işlemin driver'ları)
+
+        Havuzda boşta bekleyenler sadece operation=IDLE_OPERATION ile sayılır.
+        """
+        if operation is None:
+            return sum(1 for info in list(self._drivers.values()) if info["operation"] != IDLE_OPERATION)
+        return sum(1 for info in list(self._drivers.values()) if info["operation"] == operation)
+
+    def total_rss(self) -> int:
+        """Sunucu süreci + tüm driver süreç ağaçlarının toplam RSS'i (byte)"""
+        return sum(self._rss_gauge().values())
+
+    def register_session_source(self, name: str, collect: Callable[[], Dict[str, int]]):
+        """Session bazlı bellek kaynağı kaydet (collect: {session_id: byte} döndürür)"""
+        self._session_sources[name] = collect
+
+    def _driver_stats(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        drivers = []
+        for info in list(self._drivers.values()):
+            rss = process_tree_rss(info["pid"]) if info["pid"] else 0
+            drivers.append({
+                "pid": info["pid"],
+                "session_id": info["session_id"],
+                "operation": info["operation"],
+                "rss_mb": round(rss / MB, 2),
+                "process_count": len(process_tree_pids(info["pid"])) if info["pid"] else 0,
+                "age_seconds": round(now - info["started_at"], 1),
+            })
+        return drivers
+
+    def tracemalloc_stats(self, top: int = 10) -> Dict[str, Any]:
+        """En çok bellek ayıran satırlar"""
+        if not tracemalloc.is_tracing():
+            return {"tracing": False}
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        return {
+            "tracing": True,
+            "current_mb": round(current / MB, 2),
+            "peak_mb": round(peak / MB, 2),
+            "top": [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_kb": round(stat.size / 1024, 1),
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[:top]
+            ],
+        }
+
+    def report(self, top: int = 10) -> Dict[str, Any]:
+        """Sunucu, driver ve session bellek raporu"""
+        drivers = self._driver_stats()
+
+        sessions: Dict[str, Dict[str, float]] = {}
+        for driver in drivers:
+            if driver["session_id"]:
+                entry = sessions.setdefault(driver["session_id"], {})
+                entry["chrome_rss_mb"] = entry.get("chrome_rss_mb", 0) + driver["rss_mb"]
+        for name, collect in list(self._session_sources.items()):
+            try:
+                values = collect()
+            except Exception as e:
+                logger.warning(f"Bellek kaynağı okunamadı {name}: {e}")
+                continue
+            for session_id, size in values.items():
+                sessions.setdefault(session_id, {})[f"{name}_kb"] = round(size / 1024, 1)
+
+        return {
+            "server_rss_mb": round(process_rss(os.getpid()) / MB, 2),
+            "chrome_rss_mb": round(sum(driver["rss_mb"] for driver in drivers), 2),
+            "driver_max_rss_mb": round(self.max_driver_rss / MB, 2) if self.max_driver_rss else None,
+            "drivers": drivers,
+            "sessions": sessions,
+            "tracemalloc": self.tracemalloc_stats(top),
+        }
+
+    def _rss_gauge(self) -> Dict[str, float]:
+        chrome = sum(process_tree_rss(info["pid"]) for info in list(self._drivers.values()) if info["pid"])
+        return {"server": process_rss(os.getpid()), "chrome": chrome}
+
+
+# Global instance
+memory_monitor = MemoryMonitor()
+metrics.register_gauge("memory_rss_bytes", memory_monitor._rss_gauge)
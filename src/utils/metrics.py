@@ -0,0 +1,214 @@
+"""
+Metrics - Aşama bazlı süre ölçümü, histogramlar ve Prometheus text formatı
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Tuple, Callable, List
+
+logger = logging.getLogger(__name__)
+
+# Saniye cinsinden histogram kovaları (driver açılışı ve sayfalama dakikalar sürebilir)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Histogram:
+    """Sabit kovalı süre histogramı"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Son kova +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Kova sınırlarından yaklaşık yüzdelik değeri hesapla"""
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+        }
+
+
+class MetricsRegistry:
+    """Süreç içi histogram/sayaç/gauge kaydı"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Callable[[], Dict[LabelKey, float]]] = {}
+
+    def observe(self, name: str, value: float, **labels):
+        """Histograma bir gözlem ekle"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def increment(self, name: str, value: float = 1, **labels):
+        """Sayacı artır"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def register_gauge(self, name: str, collect: Callable[[], Dict[str, float]]):
+        """Okuma anında hesaplanan gauge kaydet (collect: {label_değeri: sayı} döndürür)"""
+        def collect_series():
+            return {(("name", label),): value for label, value in collect().items()}
+        with self._lock:
+            self._gauges[name] = collect_series
+
+    @contextmanager
+    def span(self, stage: str, operation: str = "", **labels):
+        """Bir aşamanın süresini stage_duration_seconds histogramına yaz"""
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.observe("stage_duration_seconds", elapsed, operation=operation, stage=stage, **labels)
+            if outcome == "error":
+                self.increment("stage_errors_total", operation=operation, stage=stage, **labels)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Tüm metrikleri JSON'a uygun sözlük olarak döndür"""
+        with self._lock:
+            histograms = {
+                name: [{"labels": dict(key), **histogram.snapshot()} for key, histogram in series.items()]
+                for name, series in self._histograms.items()
+            }
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            gauges = dict(self._gauges)
+        return {
+            "histograms": histograms,
+            "counters": counters,
+            "gauges": {
+                name: [{"labels": dict(key), "value": value} for key, value in collect().items()]
+                for name, collect in gauges.items()
+            },
+        }
+
+    def render_prometheus(self, prefix: str = "yok_") -> str:
+        """Prometheus text exposition formatında çıktı üret"""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in self._histograms.items():
+                metric = prefix + name
+                lines.append(f"# TYPE {metric} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, bucket_count in zip(self.buckets + (float("inf"),), histogram.counts):
+                        cumulative += bucket_count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{metric}_bucket{_format_labels(key, ('le', le))} {cumulative}")
+                    lines.append(f"{metric}_sum{_format_labels(key)} {histogram.sum}")
+                    lines.append(f"{metric}_count{_format_labels(key)} {histogram.count}")
+            for name, series in self._counters.items():
+                metric = prefix + name
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in series.items():
+                    lines.append(f"{metric}{_format_labels(key)} {value}")
+            gauges = dict(self._gauges)
+        for name, collect in gauges.items():
+            metric = prefix + name
+            lines.append(f"# TYPE {metric} gauge")
+            for key, value in collect().items():
+                lines.append(f"{metric}{_format_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Histogram ve sayaçları sıfırla"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """/metrics isteklerine Prometheus çıktısı döndürür"""
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+        payload = self.server.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1", registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """Prometheus /metrics endpoint'ini arka plan thread'inde başlat"""
+    server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    server.daemon_threads = True
+    server.registry = registry or metrics
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"Prometheus metrics endpoint: http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+# Global instance
+metrics = MetricsRegistry()
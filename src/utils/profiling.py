@@ -0,0 +1,213 @@
+"""
+Profiling - İsteğe bağlı, session bazlı profil kaydı (cProfile / örnekleme)
+
+İki mod desteklenir:
+- "cprofile": Deterministik profil, event loop thread'i için .pstats dosyası yazar.
+  Aynı anda yalnızca bir cProfile oturumu açılabilir; profil açıkken loop'ta
+  çalışan diğer coroutine'ler de kayda girer.
+- "sampling": Event loop ve asyncio worker thread'lerinin (to_thread ile
+  çalışan HTML ayrıştırma dahil) yığınlarını periyodik örnekler ve
+  speedscope (https://www.speedscope.app) JSON dosyası yazar. Düşük maliyetlidir;
+  aynı yığınlar tek kayıtta toplandığından bellek süreyle değil farklı yığın
+  sayısıyla büyür.
+"""
+
+import cProfile
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sampling")
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# cProfile thread başına tek bir profiler'a izin verir
+_cprofile_lock = threading.Lock()
+
+
+def resolve_profile_mode(requested: Optional[str] = None) -> Optional[str]:
+    """Tool argümanından veya YOK_PROFILE_MODE'dan profil modunu çöz"""
+    mode = (requested or os.getenv("YOK_PROFILE_MODE") or "").strip().lower()
+    if mode in ("", "off", "none", "false", "0"):
+        return None
+    if mode not in PROFILE_MODES:
+        logger.warning(f"Bilinmeyen profil modu '{mode}', profil kapalı")
+        return None
+    return mode
+
+
+class SamplingProfiler:
+    """sys._current_frames() ile çalışan, speedscope çıktılı örnekleme profiler'ı"""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL, thread_prefix: str = "asyncio"):
+        self.interval = interval
+        self.thread_prefix = thread_prefix
+        self._target_ident = threading.get_ident()
+        self._frames: List[Dict[str, Any]] = []
+        self._frame_ids: Dict[Tuple[str, str, int], int] = {}
+        # thread -> yığın -> toplam süre (aynı yığın tekrar eklenmez)
+        self._stacks: Dict[int, Dict[Tuple[int, ...], float]] = {}
+        self._sample_count = 0
+        self._thread_names: Dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _frame_id(self, frame) -> int:
+        code = frame.f_code
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        frame_id = self._frame_ids.get(key)
+        if frame_id is None:
+            frame_id = len(self._frames)
+            self._frame_ids[key] = frame_id
+            self._frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+        return frame_id
+
+    def _sampled_threads(self) -> Dict[int, str]:
+        threads = {self._target_ident: "event-loop"}
+        for thread in threading.enumerate():
+            if thread.name.startswith(self.thread_prefix) and thread.ident is not None:
+                threads[thread.ident] = thread.name
+        return threads
+
+    def _sample(self, weight: float):
+        threads = self._sampled_threads()
+        for ident, frame in sys._current_frames().items():
+            if ident not in threads:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_id(frame))
+                frame = frame.f_back
+            stack.reverse()
+            self._thread_names[ident] = threads[ident]
+            stacks = self._stacks.setdefault(ident, {})
+            key = tuple(stack)
+            stacks[key] = stacks.get(key, 0.0) + weight
+            self._sample_count += 1
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="yok-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    @property
+    def sample_count(self) -> int:
+        return self._sample_count
+
+    def to_speedscope(self, name: str) -> Dict[str, Any]:
+        """Örnekleri speedscope dosya formatına çevir (thread başına bir profil)
+
+        Her farklı yığın bir kez, toplam süresi ağırlık olarak yazılır; zaman
+        çizelgesi sırası korunmaz, "left heavy" ve "sandwich" görünümleri etkilenmez.
+        """
+        profiles = []
+        for ident, stacks in self._stacks.items():
+            samples = [list(stack) for stack in stacks]
+            weights = list(stacks.values())
+            profiles.append({
+                "type": "sampled",
+                "name": f"{name} [{self._thread_names.get(ident, ident)}]",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 6),
+                "samples": samples,
+                "weights": [round(weight, 6) for weight in weights],
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": self._frames},
+            "profiles": profiles,
+            "name": name,
+            "exporter": "yok-akademik-scraper",
+        }
+
+
+class SessionProfiler:
+    """Bir scrape görevini profilleyip çıktıyı session dizinine yazar"""
+
+    def __init__(self, mode: str, output_dir: Path, name: str, interval: Optional[float] = None):
+        self.mode = mode
+        self.output_dir = Path(output_dir)
+        self.name = name
+        self.interval = interval or float(os.getenv("YOK_PROFILE_INTERVAL", DEFAULT_SAMPLE_INTERVAL))
+        self.output_path: Optional[Path] = None
+        self._profiler = None
+        self._owns_lock = False
+
+    def start(self) -> bool:
+        """Profili başlat; cProfile meşgulse False döner"""
+        if self.mode == "cprofile":
+            if not _cprofile_lock.acquire(blocking=False):
+                logger.warning(f"Başka bir cProfile oturumu açık, {self.name} profillenmeyecek")
+                return False
+            self._owns_lock = True
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._profiler = SamplingProfiler(self.interval)
+            self._profiler.start()
+        logger.info(f"Profil başlatıldı: {self.name} ({self.mode})")
+        return True
+
+    def stop(self) -> Optional[Path]:
+        """Profili durdur ve dosyaya yaz"""
+        if self._profiler is None:
+            return None
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        try:
+            if self.mode == "cprofile":
+                self._profiler.disable()
+            else:
+                self._profiler.stop()
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            if self.mode == "cprofile":
+                self.output_path = self.output_dir / f"profile_{self.name}_{timestamp}.pstats"
+                self._profiler.dump_stats(str(self.output_path))
+            else:
+                self.output_path = self.output_dir / f"profile_{self.name}_{timestamp}.speedscope.json"
+                with open(self.output_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._profiler.to_speedscope(self.name), f)
+            logger.info(f"Profil kaydedildi: {self.output_path}")
+        except Exception as e:
+            logger.error(f"Profil kaydedilemedi: {e}")
+            self.output_path = None
+        finally:
+            self._profiler = None
+            if self._owns_lock:
+                self._owns_lock = False
+                _cprofile_lock.release()
+        return self.output_path
+
+
+@contextmanager
+def profile_session(mode: Optional[str], output_dir: Path, name: str):
+    """mode None ise hiçbir şey yapmaz, aksi halde bloğu profiller"""
+    if not mode:
+        yield None
+        return
+    profiler = SessionProfiler(mode, output_dir, name)
+    started = profiler.start()
+    try:
+        yield profiler
+    finally:
+        if started:
+            profiler.stop()
@@ -0,0 +1,104 @@
+"""
+Response - Tool cevaplarının kompakt serileştirilmesi, alan seçimi ve boyut sınırı
+
+Cevaplar girintisiz JSON olarak yazılır (orjson kuruluysa o kullanılır).
+Kayıt listeleri (profiles, preview_profiles, collaborators) istenen alanlara
+indirgenir; serileştirilmiş cevap YOK_MAX_RESPONSE_BYTES'ı aşarsa liste
+kısaltılır ve kaldığı yer next_cursor ile bildirilir.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson opsiyonel
+    orjson = None
+
+# Kayıt listesi taşıyan cevap anahtarları
+RECORD_KEYS = ("profiles", "preview_profiles", "collaborators")
+
+# fields verilmediğinde atılan alanlar (info; name/title/header'ın ham metin tekrarıdır)
+DEFAULT_EXCLUDED_FIELDS = ("info",)
+
+DEFAULT_MAX_RESPONSE_BYTES = 512 * 1024
+
+
+def max_response_bytes() -> int:
+    """Cevap boyutu sınırı (YOK_MAX_RESPONSE_BYTES, 0 = sınırsız)"""
+    return int(os.getenv("YOK_MAX_RESPONSE_BYTES", str(DEFAULT_MAX_RESPONSE_BYTES)))
+
+
+def dumps(obj: Any) -> str:
+    """Girintisiz JSON (Türkçe karakterler kaçışsız)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            # orjson'un desteklemediği tipler (örn. int olmayan dict anahtarları)
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _encoded_size(obj: Any) -> int:
+    return len(dumps(obj).encode("utf-8"))
+
+
+def select_fields(records: List[Dict[str, Any]], fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """Kayıtları istenen alanlara indirge; fields yoksa varsayılan hariç alanları at"""
+    if fields:
+        wanted = list(fields)
+        return [{key: record[key] for key in wanted if key in record} for record in records]
+    return [
+        {key: value for key, value in record.items() if key not in DEFAULT_EXCLUDED_FIELDS}
+        for record in records
+    ]
+
+
+def shape_response(result: Dict[str, Any], fields: Optional[Iterable[str]] = None,
+                   offset: int = 0, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """Kayıt listelerine alan seçimi uygula ve cevabı boyut sınırına sığdır
+
+    offset, listenin ilk kaydının tüm sonuçlardaki sırasıdır; kısaltma olursa
+    next_cursor = offset + dönen kayıt sayısı olur.
+    """
+    if not isinstance(result, dict):
+        return result
+    shaped = dict(result)
+    record_key = next((key for key in RECORD_KEYS if isinstance(shaped.get(key), list)), None)
+    if record_key is None:
+        return shaped
+    records = select_fields(shaped[record_key], fields)
+    shaped[record_key] = records
+
+    max_bytes = max_response_bytes() if max_bytes is None else max_bytes
+    if not max_bytes or _encoded_size(shaped) <= max_bytes:
+        return shaped
+
+    # Zarfın boyutu + kayıt başına boyut (virgül dahil) ile sığan kayıt sayısını bul
+    def _mark(kept: int):
+        shaped[record_key] = records[:kept]
+        shaped["truncated"] = True
+        shaped["returned_count"] = kept
+        shaped["next_cursor"] = offset + kept
+        shaped["truncation_note"] = (
+            f"Cevap {max_bytes} byte sınırını aştığı için {kept}/{len(records)} kayıt döndü; "
+            f"devamı için cursor={offset + kept} kullanın"
+        )
+
+    # Zarf boyutu için sayılar en fazla len(records) kadar basamak alır
+    _mark(len(records))
+    shaped[record_key] = []
+    budget = max_bytes - _encoded_size(shaped)
+    kept = 0
+    for record in records:
+        size = _encoded_size(record) + 1
+        if size > budget:
+            break
+        budget -= size
+        kept += 1
+
+    # Tek kayıt bile sığmıyorsa ilerleme için yine de bir kayıt döndür
+    _mark(max(kept, 1))
+    return shaped
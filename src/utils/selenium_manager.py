@@ -1,26 +1,133 @@
 import asyncio
+import base64
+import json
 import logging
-from typing import Optional
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Dict, List
 from selenium import webdriver  # Normal Selenium kullan (uyumluluk için)
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 import subprocess
 import os
-from contextlib import asynccontextmanager
+
+from .memory_monitor import IDLE_OPERATION, memory_monitor
 
 logger = logging.getLogger(__name__)
 
+# Gövdesi okunacak kaynak tipleri (görseller, fontlar vb. atlanır)
+BODY_RESOURCE_TYPES = {"Document", "XHR", "Fetch"}
+
+_FONT_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*"]
+_IMAGE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico", "*.bmp"]
+_TRACKER_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*yandex.ru*", "*clarity.ms*",
+]
+
+# Network.setBlockedURLs ile uygulanan adlandırılmış engelleme profilleri
+BLOCK_PRESETS: Dict[str, List[str]] = {
+    "none": [],
+    # Arama/sayfalama için sadece HTML ve sitenin kendi script'leri gerekir
+    "search-minimal": ["*.css", *_FONT_PATTERNS, *_IMAGE_PATTERNS, "*.svg", *_TRACKER_PATTERNS],
+    # İşbirlikçi grafiği D3 script'lerine, CSS'e ve SVG'ye ihtiyaç duyar
+    "graph": [*_FONT_PATTERNS, *_IMAGE_PATTERNS, *_TRACKER_PATTERNS],
+}
+
+# Varsayılan profili ezen ortam değişkeni; grafik driver'ı arama ayarından etkilenmez
+PRESET_ENV_VARS: Dict[str, str] = {"graph": "YOK_GRAPH_BLOCK_PRESET"}
+
+
+@dataclass
+class NetworkResponse:
+    """CDP'den yakalanan HTTP yanıtı"""
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    mime_type: str = ""
+    body: Optional[str] = None
+
+
+@dataclass
+class NetworkRequest:
+    """CDP'den yakalanan HTTP isteği"""
+    request_id: str
+    url: str
+    method: str = "GET"
+    resource_type: str = ""
+    response: Optional[NetworkResponse] = None
+    finished: bool = False
+    encoded_length: int = 0
+
+
+class DriverPool:
+    """Araçlar arasında paylaşılan boşta driver havuzu
+
+    İş biten driver kapatılmak yerine temizlenip buraya bırakılır; sonraki
+    get_driver çağrısı (hangi araçtan gelirse gelsin) Chrome açılışını
+    beklemeden onu alır. Boşta bekleyen driver sayısı YOK_DRIVER_POOL_SIZE ile
+    sınırlıdır, fazlası kapatılır.
+    """
+
+    def __init__(self, max_idle: Optional[int] = None):
+        if max_idle is None:
+            max_idle = int(os.getenv("YOK_DRIVER_POOL_SIZE", "2"))
+        self.max_idle = max(0, max_idle)
+        self._idle: List[webdriver.Chrome] = []
+        self._lock = threading.Lock()
+        self.reused = 0
+        self.created = 0
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    def take(self) -> Optional[webdriver.Chrome]:
+        """Boşta driver varsa al"""
+        with self._lock:
+            if not self._idle:
+                return None
+            self.reused += 1
+            return self._idle.pop()
+
+    def offer(self, driver: webdriver.Chrome) -> bool:
+        """Driver'ı havuza bırak; havuz doluysa False"""
+        with self._lock:
+            if len(self._idle) >= self.max_idle:
+                return False
+            self._idle.append(driver)
+            return True
+
+    def drain(self) -> List[webdriver.Chrome]:
+        """Boşta driver'ları havuzdan çıkar (kapatmak çağırana kalır)"""
+        with self._lock:
+            drivers, self._idle = self._idle, []
+            return drivers
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"idle": len(self._idle), "max_idle": self.max_idle, "created": self.created, "reused": self.reused}
+
+
 class SeleniumManager:
     """Asenkron Selenium WebDriver yöneticisi"""
     
-    def __init__(self):
+    def __init__(self, block_preset: str = "none", pool: Optional[DriverPool] = None):
         self._driver: Optional[webdriver.Chrome] = None
-        self._driver_pool = []
-        self._max_pool_size = 3
+        # Paylaşılan havuz verilmezse yöneticiye özel havuz
+        self.pool = pool if pool is not None else DriverPool()
+        self._network_requests: Dict[int, Dict[str, NetworkRequest]] = {}
+        self._closed_drivers = weakref.WeakSet()
+        # id(driver) -> thread'de süren driver çağrısı sayısı
+        self._busy: Dict[int, int] = {}
+        self._busy_lock = threading.Lock()
+        # YOK_BLOCK_PRESET arama driver'larının, YOK_GRAPH_BLOCK_PRESET grafik driver'larının
+        # profilini; YOK_EXTRA_BLOCKED_URLS ek desenleri belirler
+        self.block_preset = os.getenv(PRESET_ENV_VARS.get(block_preset, "YOK_BLOCK_PRESET"), block_preset)
+        self.extra_blocked_urls = [
+            pattern.strip() for pattern in os.getenv("YOK_EXTRA_BLOCKED_URLS", "").split(",") if pattern.strip()
+        ]
         
     def _get_chrome_version(self) -> str:
         """Chrome versiyonunu al"""
@@ -74,6 +181,9 @@ class SeleniumManager:
         }
         options.add_experimental_option("prefs", prefs)
         
+        # Network olaylarını CDP performance logları üzerinden yakala
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        
         logger.info("Creating Chrome driver...")
         
         try:
@@ -84,24 +194,137 @@ class SeleniumManager:
             raise e
         
         driver.set_window_size(1920, 1080)
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+        except Exception as e:
+            logger.warning(f"CDP Network etkinleştirilemedi: {e}")
+        return driver
+    
+    def get_blocked_urls(self, block_preset: Optional[str] = None) -> List[str]:
+        """Profil adına göre engellenecek URL desenlerini döndür"""
+        preset = block_preset or self.block_preset
+        if preset not in BLOCK_PRESETS:
+            logger.warning(f"Bilinmeyen engelleme profili: {preset}, engelleme yapılmayacak")
+            return list(self.extra_blocked_urls)
+        return BLOCK_PRESETS[preset] + self.extra_blocked_urls
+    
+    def apply_block_preset(self, driver: webdriver.Chrome, block_preset: Optional[str] = None) -> bool:
+        """Engelleme profilini CDP üzerinden driver'a uygula"""
+        try:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.get_blocked_urls(block_preset)})
+            return True
+        except Exception as e:
+            logger.warning(f"Engelleme profili uygulanamadı: {e}")
+            return False
+    
+    async def _new_driver(self) -> webdriver.Chrome:
+        # Chrome açılışı saniyeler sürer, event loop'u bloklamasın
+        driver = await asyncio.to_thread(self._create_driver)
+        self.pool.created += 1
         return driver
     
-    async def get_driver(self):
-        """WebDriver al"""
-        driver = self._create_driver()
+    async def prewarm(self, count: int = 1):
+        """Havuza hazır driver ekle (ilk aramada Chrome açılışı beklenmesin)"""
+        while len(self.pool) < min(count, self.pool.max_idle):
+            driver = await self._new_driver()
+            if not self.pool.offer(driver):
+                self._quit(driver)
+                break
+            # Boştaki driver da bellek raporunda ve toplam RSS'te görünür
+            memory_monitor.register_driver(driver, None, IDLE_OPERATION)
+            logger.info(f"Driver önceden hazırlandı (havuz: {len(self.pool)})")
+    
+    async def get_driver(self, block_preset: Optional[str] = None, session_id: Optional[str] = None,
+                         operation: str = ""):
+        """WebDriver al (havuzda hazır driver varsa onu kullan)"""
+        driver = self.pool.take()
+        if driver is None:
+            driver = await self._new_driver()
+        self._closed_drivers.discard(driver)
+        self.apply_block_preset(driver, block_preset)
+        memory_monitor.register_driver(driver, session_id, operation)
         return driver
     
-    async def close_driver(self, driver: webdriver.Chrome):
-        """WebDriver'ı kapat"""
+    def _reset_driver(self, driver: webdriver.Chrome):
+        """Havuza dönecek driver'dan önceki işin izlerini temizle"""
+        driver.get("about:blank")
+        driver.delete_all_cookies()
+        driver.get_log("performance")
+    
+    def _quit(self, driver: webdriver.Chrome):
+        memory_monitor.unregister_driver(driver)
         try:
             driver.quit()
         except Exception as e:
             logger.warning(f"Driver kapatılırken hata: {e}")
     
+    async def close_driver(self, driver: webdriver.Chrome):
+        """WebDriver'ı bırak: sağlamsa temizleyip havuza koy, değilse kapat"""
+        if driver in self._closed_drivers:
+            return
+        self._closed_drivers.add(driver)
+        self._network_requests.pop(id(driver), None)
+        # RSS eşiğini aşan ve iptal edilen bir çağrısı thread'de hâlâ süren driver havuza dönmez
+        # (/proc taraması event loop'u bloklamasın)
+        reusable = (self.pool.max_idle > 0 and not self._busy.get(id(driver))
+                    and not await asyncio.to_thread(memory_monitor.should_recycle, driver))
+        if reusable:
+            try:
+                await asyncio.to_thread(self._reset_driver, driver)
+            except Exception as e:
+                logger.debug(f"Driver temizlenemedi, kapatılacak: {e}")
+                reusable = False
+        if reusable and self.pool.offer(driver):
+            memory_monitor.register_driver(driver, None, IDLE_OPERATION)
+            return
+        self._quit(driver)
+    
+    async def shutdown(self):
+        """Havuzda bekleyen driver'ları kapat"""
+        for driver in self.pool.drain():
+            self._quit(driver)
+    
+    async def recycle_if_needed(self, driver: webdriver.Chrome, block_preset: Optional[str] = None) -> webdriver.Chrome:
+        """Driver RSS eşiğini (YOK_DRIVER_MAX_RSS_MB) aştıysa kapatıp yenisini döndür
+        
+        Sadece sayfa durumu kaybedilebilecek noktalarda (örn. iki ayrı profil
+        sayfası arasında) çağrılmalıdır.
+        """
+        if not await asyncio.to_thread(memory_monitor.should_recycle, driver):
+            return driver
+        info = memory_monitor.driver_info(driver) or {}
+        await self.close_driver(driver)
+        logger.info(f"Driver yeniden başlatıldı (session: {info.get('session_id')})")
+        return await self.get_driver(block_preset, info.get("session_id"), info.get("operation", ""))
+    
+    def _call(self, key: int, func: Callable, args: tuple, kwargs: dict) -> Any:
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._busy_lock:
+                remaining = self._busy.get(key, 1) - 1
+                if remaining:
+                    self._busy[key] = remaining
+                else:
+                    self._busy.pop(key, None)
+    
+    async def run(self, driver: webdriver.Chrome, func: Callable, *args, **kwargs) -> Any:
+        """Bloklayan driver çağrısını thread'de çalıştır
+        
+        WebDriverWait, find_element, page_source gibi çağrılar chromedriver'a
+        HTTP isteğidir ve saniyelerce sürebilir; event loop'u bloklamazlar ve
+        cancel_session beklemeden işi keser. Görev iptal edilse de thread çağrı
+        bitene kadar sürer; o sürede driver meşgul sayılır ve havuza dönmez.
+        """
+        key = id(driver)
+        with self._busy_lock:
+            self._busy[key] = self._busy.get(key, 0) + 1
+        return await asyncio.to_thread(self._call, key, func, args, kwargs)
+    
     async def navigate_to_page(self, driver: webdriver.Chrome, url: str, timeout: int = 10):
         """Sayfaya git ve yüklenmeyi bekle"""
         try:
-            driver.get(url)
+            await self.run(driver, driver.get, url)
             await asyncio.sleep(0.5)  # Sayfa yüklenme beklemesi çok kısaltıldı
             return True
         except Exception as e:
@@ -111,10 +334,8 @@ class SeleniumManager:
     async def wait_for_element(self, driver: webdriver.Chrome, by: By, value: str, timeout: int = 2):
         """Element için bekle ve element'i döndür"""
         try:
-            element = WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located((by, value))
-            )
-            return element
+            return await self.run(driver, WebDriverWait(driver, timeout).until,
+                                  EC.presence_of_element_located((by, value)))
         except Exception as e:
             logger.error(f"Element bulunamadı {by}={value}: {e}")
             return None
@@ -122,21 +343,22 @@ class SeleniumManager:
     async def wait_for_clickable(self, driver: webdriver.Chrome, by: By, value: str, timeout: int = 2):
         """Tıklanabilir element için bekle"""
         try:
-            WebDriverWait(driver, timeout).until(
-                EC.element_to_be_clickable((by, value))
-            )
+            await self.run(driver, WebDriverWait(driver, timeout).until, EC.element_to_be_clickable((by, value)))
             return True
         except Exception as e:
             logger.error(f"Tıklanabilir element bulunamadı {by}={value}: {e}")
             return False
     
+    @staticmethod
+    def _accept_cookies(driver: webdriver.Chrome):
+        WebDriverWait(driver, 5).until(
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(),'Tümünü Kabul Et')]"))
+        ).click()
+    
     async def handle_cookies(self, driver: webdriver.Chrome):
         """Çerez onayını dene"""
         try:
-            cookie_button = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(),'Tümünü Kabul Et')]"))
-            )
-            cookie_button.click()
+            await self.run(driver, self._accept_cookies, driver)
             logger.debug("Çerez onaylandı")
             return True
         except Exception:
@@ -146,23 +368,81 @@ class SeleniumManager:
     async def execute_script_safe(self, driver: webdriver.Chrome, script: str):
         """JavaScript'i güvenli şekilde çalıştır"""
         try:
-            return driver.execute_script(script)
+            return await self.run(driver, driver.execute_script, script)
         except Exception as e:
             logger.error(f"JavaScript çalıştırılamadı: {e}")
             return None
     
-    def get_network_requests(self, driver: webdriver.Chrome, url_filter: str = None):
-        """Network isteklerini al (simüle edilmiş)"""
+    def _get_network_store(self, driver: webdriver.Chrome) -> Dict[str, NetworkRequest]:
+        """Driver'a ait yakalanmış istekleri döndür"""
+        return self._network_requests.setdefault(id(driver), {})
+    
+    def _process_performance_logs(self, driver: webdriver.Chrome):
+        """Chrome performance loglarındaki Network olaylarını işle"""
+        store = self._get_network_store(driver)
+        for entry in driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method", "")
+            params = message.get("params", {})
+            request_id = params.get("requestId")
+            if not request_id:
+                continue
+            
+            if method == "Network.requestWillBeSent":
+                request = params.get("request", {})
+                store[request_id] = NetworkRequest(
+                    request_id=request_id,
+                    url=request.get("url", ""),
+                    method=request.get("method", "GET"),
+                    resource_type=params.get("type", "")
+                )
+            elif method == "Network.responseReceived" and request_id in store:
+                response = params.get("response", {})
+                store[request_id].response = NetworkResponse(
+                    status_code=response.get("status", 0),
+                    headers=response.get("headers", {}),
+                    mime_type=response.get("mimeType", "")
+                )
+            elif method == "Network.loadingFinished" and request_id in store:
+                store[request_id].finished = True
+                store[request_id].encoded_length = params.get("encodedDataLength", 0)
+    
+    def _load_response_body(self, driver: webdriver.Chrome, request: NetworkRequest):
+        """Network.getResponseBody ile yanıt gövdesini al"""
         try:
-            # Normal Selenium'da network monitoring yok, boş liste döndür
-            logger.info("Network monitoring simüle ediliyor")
-            return []
+            result = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request.request_id})
+            body = result.get("body", "")
+            if result.get("base64Encoded"):
+                body = base64.b64decode(body).decode("utf-8", errors="replace")
+            request.response.body = body
+        except Exception as e:
+            # Gövde artık tarayıcıda tutulmuyor olabilir
+            logger.debug(f"Response body alınamadı {request.url}: {e}")
+            request.response.body = ""
+    
+    def get_network_requests(self, driver: webdriver.Chrome, url_filter: str = None) -> List[NetworkRequest]:
+        """Son temizlemeden bu yana yakalanan, yüklenmesi bitmiş istekleri al"""
+        try:
+            self._process_performance_logs(driver)
+            requests = []
+            for request in self._get_network_store(driver).values():
+                if url_filter and url_filter not in request.url:
+                    continue
+                if not request.finished or not request.response:
+                    continue
+                if request.response.body is None and request.resource_type in BODY_RESOURCE_TYPES:
+                    self._load_response_body(driver, request)
+                requests.append(request)
+            return requests
         except Exception as e:
             logger.error(f"Network requests alınamadı: {e}")
             return []
     
     def get_last_request(self, driver: webdriver.Chrome, url_filter: str = None):
-        """Son network isteğini al (simüle edilmiş)"""
+        """Son network isteğini al"""
         try:
             requests = self.get_network_requests(driver, url_filter)
             if requests:
@@ -173,8 +453,9 @@ class SeleniumManager:
             return None
     
     def clear_network_requests(self, driver: webdriver.Chrome):
-        """Network isteklerini temizle (simüle edilmiş)"""
+        """Bekleyen logları boşalt ve yakalanmış istekleri temizle"""
         try:
-            logger.info("Network requests temizlendi (simüle)")
+            driver.get_log("performance")
+            self._network_requests.pop(id(driver), None)
         except Exception as e:
-            logger.error(f"Network requests temizlenemedi: {e}") 
\ No newline at end of file
+            logger.error(f"Network requests temizlenemedi: {e}")
@@ -0,0 +1,273 @@
+"""
+Similarity Index - Anahtar kelime ve etiketler üzerinden TF-IDF benzer akademisyen araması
+
+Her profil; anahtar kelime ifadeleri, bu ifadelerdeki kelimeler ve alan/uzmanlık
+etiketlerinden oluşan terimlerle temsil edilir. Terim sayıları seyrek (CSR)
+matriste tutulur, IDF ağırlıklı ve L2 normalize edilmiş matris üzerinde tek bir
+matris-vektör çarpımıyla kosinüs benzerliği hesaplanır.
+
+Yeni kaydedilen session'lar "kirli" işaretlenir; sorgu anında sadece bu
+session'lar diskten okunup tokenize edilir, matris bir kez yeniden kurulur.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .taxonomy import normalize_tr
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+except ImportError:  # numpy/scipy opsiyonel
+    np = None
+    sp = None
+
+logger = logging.getLogger(__name__)
+
+
+def profile_terms(profile: Dict[str, Any]) -> List[str]:
+    """Profilin terimleri: k:<ifade>, w:<kelime>, g:<alan etiketi>, b:<uzmanlık etiketi>"""
+    terms = []
+    for phrase in (profile.get("keywords") or "").split(";"):
+        phrase = normalize_tr(phrase)
+        if not phrase:
+            continue
+        terms.append(f"k:{phrase}")
+        terms.extend(f"w:{word}" for word in phrase.split() if len(word) > 2)
+    for prefix, key in (("g", "green_label"), ("b", "blue_label")):
+        label = normalize_tr(profile.get(key) or "")
+        if label:
+            terms.append(f"{prefix}:{label}")
+    return terms
+
+
+def profile_key(session_id: str, profile: Dict[str, Any]) -> str:
+    """Aynı akademisyen farklı session'larda tek kayıt olsun diye profil URL'i, yoksa session+id"""
+    return profile.get("url") or f"{session_id}#{profile.get('id')}"
+
+
+class SimilarityIndex:
+    """Session profilleri üzerinde artımlı güncellenen TF-IDF indeksi"""
+
+    def __init__(self, sessions_path: Path):
+        if np is None:
+            raise RuntimeError("Benzerlik araması için numpy ve scipy gerekli: pip install numpy scipy")
+        self.sessions_path = Path(sessions_path)
+        self._lock = threading.RLock()
+        self._vocab: Dict[str, int] = {}
+        # profil anahtarı -> satır ve (session_id, profil id) -> satır
+        self._row_of: Dict[str, int] = {}
+        self._session_profile_rows: Dict[Tuple[str, Any], int] = {}
+        self._docs: List[Dict[str, Any]] = []
+        # Satırı içeren session'lar: session_id -> o session'daki profil id (son kaydeden sonda)
+        self._row_owners: List[Dict[str, Any]] = []
+        self._row_terms: List[Any] = []
+        self._sessions: Dict[str, int] = {}
+        self._dirty_sessions: Set[str] = set()
+        self._matrix = None
+        self._idf = None
+        self._row_sessions = None
+        self._loaded = False
+
+    # --- Güncelleme ---
+
+    def mark_dirty(self, session_id: str):
+        """Session verisi değişti; bir sonraki sorguda yeniden okunacak"""
+        with self._lock:
+            self._dirty_sessions.add(session_id)
+
+    def add_profiles(self, session_id: str, profiles: List[Dict[str, Any]]):
+        """Profilleri ekle veya güncelle (aynı anahtar varsa satırı değiştirilir)"""
+        with self._lock:
+            self._sessions.setdefault(session_id, len(self._sessions))
+            for profile in profiles:
+                terms = profile_terms(profile)
+                if not terms:
+                    continue
+                key = profile_key(session_id, profile)
+                counts: Dict[int, int] = {}
+                for term in terms:
+                    column = self._vocab.setdefault(term, len(self._vocab))
+                    counts[column] = counts.get(column, 0) + 1
+                row_terms = (np.fromiter(counts.keys(), dtype=np.int32, count=len(counts)),
+                             np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+                doc = {
+                    "name": profile.get("name", ""),
+                    "title": profile.get("title", ""),
+                    "university": (profile.get("header") or "").split("/")[0].strip(),
+                    "url": profile.get("url", ""),
+                    "keywords": profile.get("keywords", ""),
+                }
+                row = self._row_of.get(key)
+                if row is None:
+                    row = self._row_of[key] = len(self._docs)
+                    self._docs.append(doc)
+                    self._row_terms.append(row_terms)
+                    self._row_owners.append({})
+                else:
+                    self._docs[row] = doc
+                    self._row_terms[row] = row_terms
+                    self._row_owners[row].pop(session_id, None)
+                self._row_owners[row][session_id] = profile.get("id")
+                self._session_profile_rows[(session_id, profile.get("id"))] = row
+            self._matrix = None
+
+    def _drop_session(self, session_id: str):
+        """Silinen session'ı satırlardan çıkar (başka session'ı kalmayan satır sonuç vermez)"""
+        for owners in self._row_owners:
+            owners.pop(session_id, None)
+        for key in [key for key in self._session_profile_rows if key[0] == session_id]:
+            del self._session_profile_rows[key]
+        self._matrix = None
+
+    def _load_session(self, session_id: str):
+        path = self.sessions_path / session_id / "main_profile.json"
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                profiles = json.load(f).get("profiles", [])
+        except (OSError, ValueError) as e:
+            logger.debug(f"Benzerlik indeksi session'ı okuyamadı {path}: {e}")
+            if not path.parent.exists():
+                self._drop_session(session_id)
+            return
+        self.add_profiles(session_id, profiles)
+
+    def refresh(self):
+        """İlk çağrıda tüm session'ları, sonra sadece kirli session'ları oku"""
+        with self._lock:
+            if not self._loaded:
+                if self.sessions_path.exists():
+                    self._dirty_sessions.update(path.name for path in self.sessions_path.iterdir() if path.is_dir())
+                self._loaded = True
+            dirty, self._dirty_sessions = self._dirty_sessions, set()
+            for session_id in sorted(dirty):
+                self._load_session(session_id)
+            if self._matrix is None:
+                self._build()
+
+    def _build(self):
+        """Satır terimlerinden IDF ağırlıklı, L2 normalize CSR matris kur"""
+        n_docs, n_terms = len(self._row_terms), len(self._vocab)
+        # Satır x session üyelik matrisi; filtre "izin verilen herhangi bir session" ile uygulanır
+        owner_counts = np.fromiter((len(owners) for owners in self._row_owners), dtype=np.int64, count=n_docs)
+        owner_codes = np.fromiter(
+            (self._sessions[name] for owners in self._row_owners for name in owners),
+            dtype=np.int32, count=int(owner_counts.sum())
+        )
+        self._row_sessions = sp.csr_matrix(
+            (np.ones(len(owner_codes), dtype=np.float32), owner_codes, np.concatenate(([0], np.cumsum(owner_counts)))),
+            shape=(n_docs, len(self._sessions))
+        )
+        if not n_docs:
+            self._matrix = sp.csr_matrix((0, n_terms), dtype=np.float32)
+            self._idf = np.zeros(n_terms, dtype=np.float32)
+            return
+        lengths = np.fromiter((len(columns) for columns, _ in self._row_terms), dtype=np.int64, count=n_docs)
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        indices = np.concatenate([columns for columns, _ in self._row_terms])
+        counts = np.concatenate([values for _, values in self._row_terms])
+
+        document_frequency = np.bincount(indices, minlength=n_terms)
+        self._idf = (np.log((1 + n_docs) / (1 + document_frequency)) + 1).astype(np.float32)
+        data = counts * self._idf[indices]
+        norms = np.sqrt(np.add.reduceat(data * data, indptr[:-1]))
+        data /= np.repeat(norms, lengths)
+        self._matrix = sp.csr_matrix((data, indices, indptr), shape=(n_docs, n_terms))
+
+    # --- Sorgu ---
+
+    def _query_vector(self, keywords: str):
+        counts: Dict[int, int] = {}
+        for term in profile_terms({"keywords": keywords}):
+            column = self._vocab.get(term)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+        if not counts:
+            return None
+        columns = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts)) * self._idf[columns]
+        values /= np.linalg.norm(values)
+        return sp.csr_matrix((values, columns, [0, len(columns)]), shape=(1, len(self._vocab)))
+
+    def _allowed_owner(self, row: int, session_filter: Optional[Callable[[str], bool]]) -> Optional[str]:
+        """Satırı içeren ve filtreden geçen son session (yoksa None)"""
+        for name in reversed(self._row_owners[row]):
+            if session_filter is None or session_filter(name):
+                return name
+        return None
+
+    def _result(self, row: int, session_filter: Optional[Callable[[str], bool]]) -> Dict[str, Any]:
+        """Satırın belgesi; session_id/id çağıranın erişebildiği session'dan"""
+        session_id = self._allowed_owner(row, session_filter)
+        return {"session_id": session_id, "id": self._row_owners[row].get(session_id), **self._docs[row]}
+
+    def find_row(self, session_id: str, profile_id: Optional[int] = None,
+                 profile_url: Optional[str] = None,
+                 session_filter: Optional[Callable[[str], bool]] = None) -> Optional[int]:
+        """Session + profil ID'si veya profil URL'inden matris satırı
+
+        Satır izin verilen (session_filter) hiçbir session'da yoksa None döner.
+        """
+        with self._lock:
+            if profile_url and profile_url in self._row_of:
+                row = self._row_of[profile_url]
+            else:
+                row = self._session_profile_rows.get((session_id, profile_id))
+            if row is None or self._allowed_owner(row, session_filter) is None:
+                return None
+            return row
+
+    def similar(self, session_id: Optional[str] = None, profile_id: Optional[int] = None,
+                profile_url: Optional[str] = None, keywords: Optional[str] = None,
+                top_k: int = 10, session_filter: Optional[Callable[[str], bool]] = None
+                ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Profile (veya serbest anahtar kelimelere) en benzer top_k akademisyen
+
+        session_filter verilirse sadece izin verilen session'lardaki profiller döner.
+        (sorgu profili, sonuçlar) döndürür; sorgu bulunamazsa (None, []).
+        """
+        self.refresh()
+        with self._lock:
+            query_doc = None
+            if keywords:
+                vector = self._query_vector(keywords)
+                exclude = None
+            else:
+                row = self.find_row(session_id, profile_id, profile_url, session_filter)
+                if row is None:
+                    return None, []
+                query_doc = self._result(row, session_filter)
+                vector = self._matrix[row]
+                exclude = row
+            if vector is None or not self._docs:
+                return query_doc, []
+
+            scores = (self._matrix @ vector.T).toarray().ravel()
+            if exclude is not None:
+                scores[exclude] = 0
+            # Satır, izin verilen session'lardan herhangi birinde varsa sonuç olabilir
+            allowed = np.ones(len(self._sessions), dtype=np.float32)
+            if session_filter is not None:
+                for name, code in self._sessions.items():
+                    allowed[code] = session_filter(name)
+            scores[(self._row_sessions @ allowed) == 0] = 0
+            k = min(top_k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return query_doc, [
+                {**self._result(row, session_filter), "score": round(float(scores[row]), 4)}
+                for row in top if scores[row] > 0
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "profiles": len(self._docs),
+                "terms": len(self._vocab),
+                "sessions": len(self._sessions),
+                "pending_sessions": len(self._dirty_sessions),
+                "nnz": int(self._matrix.nnz) if self._matrix is not None else None,
+            }
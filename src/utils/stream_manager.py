@@ -4,14 +4,19 @@ Stream Manager - Real-time MCP updates
 """
 
 import asyncio
+import hashlib
 import json
 import logging
+import os
 import time
-from typing import Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, Optional, Tuple
 from pathlib import Path
 import aiofiles
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+
+from .lru_cache import ByteLRUCache
+from .memory_monitor import memory_monitor, estimate_size
+from .metrics import metrics
+from .logging_setup import HOT, set_log_context
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +26,57 @@ class StreamManager:
     def __init__(self):
         self.active_streams: Dict[str, asyncio.Task] = {}
         self.callbacks: Dict[str, Callable] = {}
-        self.file_cache: Dict[str, str] = {}  # Cache for file contents
+        # (session_id, dosya türü) -> {signature, hash, data}; boyut ayrıştırılmış verinin bellek boyutudur
+        max_mb = float(os.getenv("YOK_STREAM_CACHE_MAX_MB", "64"))
+        self.file_cache = ByteLRUCache(int(max_mb * 1024 * 1024))
         self.observer = None
+        memory_monitor.register_session_source("stream_cache", self._cache_sizes)
+        metrics.register_gauge("stream_cache", self.cache_stats)
+        
+    def _cache_sizes(self) -> Dict[str, int]:
+        """Session başına file_cache boyutu (byte)"""
+        sizes: Dict[str, int] = {}
+        for (session_id, _), size in self.file_cache.sizes().items():
+            sizes[session_id] = sizes.get(session_id, 0) + size
+        return sizes
+    
+    def cache_stats(self) -> Dict[str, float]:
+        """file_cache istatistikleri"""
+        return {key: value for key, value in self.file_cache.stats().items() if value is not None}
+    
+    async def _load_file(self, session_id: str, kind: str, path: Path) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Session dosyasını önbellek üzerinden oku: (veri, değişti mi)
+        
+        mtime/boyut aynıysa dosya okunmaz; okunduysa içerik hash'i karşılaştırılır
+        ve sadece gerçekten değişen içerik yeniden ayrıştırılır.
+        """
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None, False
+        cache_key = (session_id, kind)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self.file_cache.get(cache_key)
+        if cached and cached["signature"] == signature:
+            return cached["data"], False
+        
+        async with aiofiles.open(path, 'rb') as f:
+            raw = await f.read()
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        if cached and cached["hash"] == digest:
+            cached["signature"] = signature
+            return cached["data"], False
+        
+        data = json.loads(raw)
+        entry = {"signature": signature, "hash": digest, "data": data}
+        # Ayrıştırılmış JSON metninden kat kat büyüktür; sınır gerçek bellek boyutuna uygulanır
+        self.file_cache.put(cache_key, entry, estimate_size(entry))
+        return data, True
+    
+    def evict_session(self, session_id: str):
+        """Session'a ait önbellek girdilerini at"""
+        for kind in ("main", "collaborators"):
+            self.file_cache.pop((session_id, kind))
         
     async def start_streaming(self, session_id: str, callback: Callable):
         """Start streaming for a session"""
@@ -39,14 +93,18 @@ class StreamManager:
         """Stop streaming for a session"""
         if session_id in self.active_streams:
             task = self.active_streams[session_id]
-            task.cancel()
+            # Stream kendi finally bloğundan kapatılıyorsa görevi iptal etme
+            if task is not asyncio.current_task():
+                task.cancel()
             del self.active_streams[session_id]
             if session_id in self.callbacks:
                 del self.callbacks[session_id]
+            self.evict_session(session_id)
             logger.info(f"Stopped streaming for session {session_id}")
             
     async def _stream_session(self, session_id: str):
         """Stream session updates"""
+        set_log_context(session_id=session_id)
         session_dir = Path(f"data/sessions/{session_id}")
         main_file = session_dir / "main_profile.json"
         collaborators_file = session_dir / "collaborators.json"
@@ -65,20 +123,15 @@ class StreamManager:
                 await asyncio.sleep(1)  # Check every second
                 
                 # Debug: Log file status
-                logger.info(f"Checking files for session {session_id}: main_file={main_file.exists()}, collab_file={collaborators_file.exists()}")
+                logger.debug("Checking files for session %s", session_id, extra=HOT)
                 
                 # Check main profiles
                 if main_file.exists():
                     try:
-                        async with aiofiles.open(main_file, 'r', encoding='utf-8') as f:
-                            content = await f.read()
-                            
                         # Check if file content has changed
-                        cache_key = f"{session_id}_main"
-                        if cache_key not in self.file_cache or self.file_cache[cache_key] != content:
-                            logger.info(f"File content changed for {session_id}, sending update")
-                            self.file_cache[cache_key] = content
-                            data = json.loads(content)
+                        data, changed = await self._load_file(session_id, "main", main_file)
+                        if changed:
+                            logger.info("File content changed for %s, sending update", session_id, extra=HOT)
                             
                             await self._send_update(session_id, {
                                 "type": "profiles",
@@ -88,8 +141,8 @@ class StreamManager:
                                 "status": "profiles_updated"
                             })
                             
-                            # If completed, stop streaming
-                            if data.get("status") == "completed":
+                            # Arama bittiyse (veya durdurulduysa) stream'i kapat
+                            if data.get("completed") or data.get("cancelled"):
                                 await self._send_update(session_id, {
                                     "type": "completed",
                                     "session_id": session_id,
@@ -98,7 +151,7 @@ class StreamManager:
                                 })
                                 break
                         else:
-                            logger.info(f"No file content change for {session_id}")
+                            logger.debug("No file content change for %s", session_id, extra=HOT)
                             
                     except Exception as e:
                         logger.error(f"Error reading main file: {e}")
@@ -106,15 +159,9 @@ class StreamManager:
                 # Check collaborators
                 if collaborators_file.exists():
                     try:
-                        async with aiofiles.open(collaborators_file, 'r', encoding='utf-8') as f:
-                            content = await f.read()
-                            
                         # Check if file content has changed
-                        cache_key = f"{session_id}_collaborators"
-                        if cache_key not in self.file_cache or self.file_cache[cache_key] != content:
-                            self.file_cache[cache_key] = content
-                            data = json.loads(content)
-                            
+                        data, changed = await self._load_file(session_id, "collaborators", collaborators_file)
+                        if changed:
                             await self._send_update(session_id, {
                                 "type": "collaborators",
                                 "session_id": session_id,
@@ -180,14 +227,12 @@ class StreamManager:
         
         if main_file.exists():
             try:
-                async with aiofiles.open(main_file, 'r', encoding='utf-8') as f:
-                    content = await f.read()
-                    data = json.loads(content)
-                    return {
-                        "session_id": session_id,
-                        "status": "available",
-                        "data": data
-                    }
+                data, _ = await self._load_file(session_id, "main", main_file)
+                return {
+                    "session_id": session_id,
+                    "status": "available",
+                    "data": data
+                }
             except Exception as e:
                 logger.error(f"Error reading updates: {e}")
                 return {
@@ -0,0 +1,84 @@
+"""
+Resource Subscriptions - Session resource URI'leri ve abonelere güncelleme bildirimi
+
+Her session'ın profilleri ve işbirlikçileri yok://sessions/{id}/profiles ve
+yok://sessions/{id}/collaborators olarak sunulur. Abone olan MCP oturumlarına
+yeni kayıt yazıldığında notifications/resources/updated gönderilir; aynı URI için
+bekleyen bir bildirim varken gelen kayıtlar tek bildirimde birleştirilir.
+"""
+
+import asyncio
+import logging
+import re
+import weakref
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SESSION_RESOURCE_KINDS = ("profiles", "collaborators")
+
+_SESSION_URI_RE = re.compile(r"^yok://sessions/([^/]+)/(profiles|collaborators)$")
+
+
+def session_resource_uri(session_id: str, kind: str) -> str:
+    """Session resource URI'si"""
+    return f"yok://sessions/{session_id}/{kind}"
+
+
+def parse_session_resource_uri(uri: str) -> Optional[Tuple[str, str]]:
+    """URI'den (session_id, kind) çıkar; session resource'u değilse None"""
+    match = _SESSION_URI_RE.match(str(uri))
+    if not match:
+        return None
+    return match.group(1), match.group(2)
+
+
+class ResourceSubscriptions:
+    """URI -> abone MCP oturumları (kapanan oturumlar WeakSet ile kendiliğinden düşer)"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, "weakref.WeakSet"] = {}
+        self._pending: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def subscribe(self, uri: str, session):
+        self._subscribers.setdefault(str(uri), weakref.WeakSet()).add(session)
+
+    def unsubscribe(self, uri: str, session):
+        subscribers = self._subscribers.get(str(uri))
+        if subscribers is not None:
+            subscribers.discard(session)
+            if not subscribers:
+                del self._subscribers[str(uri)]
+
+    def subscribers(self, uri: str) -> List:
+        return list(self._subscribers.get(str(uri), ()))
+
+    async def notify(self, uri: str):
+        """Abonelere resources/updated gönder"""
+        self._pending.discard(str(uri))
+        for session in self.subscribers(uri):
+            try:
+                await session.send_resource_updated(uri)
+            except Exception as e:
+                # Bağlantısı kopmuş oturum
+                logger.debug(f"Resource bildirimi gönderilemedi {uri}: {e}")
+                self.unsubscribe(uri, session)
+
+    def notify_soon(self, uri: str):
+        """Abone varsa bildirimi event loop'a planla (bekleyen bildirim varsa birleştir)"""
+        uri = str(uri)
+        if uri in self._pending or not self._subscribers.get(uri):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._pending.add(uri)
+        task = loop.create_task(self.notify(uri))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+# Global instance
+resource_subscriptions = ResourceSubscriptions()
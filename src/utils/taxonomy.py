@@ -0,0 +1,169 @@
+"""
+Field Taxonomy - fields.json için indeksli, bellek içi alan/uzmanlık sözlüğü
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Türkçe karakterleri ASCII karşılıklarına indir (arama için)
+_TR_FOLD = str.maketrans({
+    "ı": "i", "ğ": "g", "ü": "u", "ş": "s", "ö": "o", "ç": "c",
+    "â": "a", "î": "i", "û": "u",
+})
+
+
+def normalize_tr(text: str) -> str:
+    """Türkçe kurallarına göre küçült, aksanları kaldır, boşlukları sadeleştir"""
+    if not text:
+        return ""
+    # Python'un lower() fonksiyonu İ/I harflerini Türkçe kurallarına göre çevirmez
+    lowered = text.replace("İ", "i").replace("I", "ı").lower()
+    return " ".join(lowered.translate(_TR_FOLD).split())
+
+
+class FieldTaxonomy:
+    """Alan/uzmanlık verisini bir kez yükleyip indeksler, dosya değişince yeniden yükler"""
+
+    def __init__(self, fields_path: Path, check_interval: float = 1.0):
+        self.fields_path = Path(fields_path)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime_ns: Optional[int] = None
+        self._last_check = 0.0
+        self._fields: List[Dict[str, Any]] = []
+        self._fields_by_id: Dict[int, Dict[str, Any]] = {}
+        self._specialties: Dict[Tuple[int, int], str] = {}
+        self._field_ids_by_name: Dict[str, int] = {}
+        self._specialty_ids_by_name: Dict[str, List[Tuple[int, int]]] = {}
+
+    def _ensure_loaded(self):
+        """Gerekirse (ilk kullanım veya mtime değişimi) dosyayı yeniden yükle"""
+        now = time.monotonic()
+        if self._mtime_ns is not None and now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            self._last_check = now
+            try:
+                mtime_ns = os.stat(self.fields_path).st_mtime_ns
+            except OSError as e:
+                if self._mtime_ns is None:
+                    logger.error(f"Fields.json bulunamadı: {e}")
+                    self._mtime_ns = -1
+                return
+            if mtime_ns == self._mtime_ns:
+                return
+            self._load(mtime_ns)
+
+    def _load(self, mtime_ns: int):
+        """Dosyayı oku ve indeksleri oluştur"""
+        try:
+            with open(self.fields_path, 'r', encoding='utf-8') as f:
+                fields_data = json.load(f)
+        except Exception as e:
+            logger.error(f"Fields.json yüklenemedi: {e}")
+            return
+
+        fields_by_id = {}
+        specialties = {}
+        field_ids_by_name = {}
+        specialty_ids_by_name: Dict[str, List[Tuple[int, int]]] = {}
+        for field in fields_data:
+            field_id = field['id']
+            fields_by_id[field_id] = field
+            field_ids_by_name[normalize_tr(field['name'])] = field_id
+            for specialty in field.get('specialties', []):
+                key = (field_id, specialty['id'])
+                specialties[key] = specialty['name']
+                specialty_ids_by_name.setdefault(normalize_tr(specialty['name']), []).append(key)
+
+        # İndeksleri tek seferde değiştir, okuyucular yarım veri görmesin
+        self._fields = fields_data
+        self._fields_by_id = fields_by_id
+        self._specialties = specialties
+        self._field_ids_by_name = field_ids_by_name
+        self._specialty_ids_by_name = specialty_ids_by_name
+        self._mtime_ns = mtime_ns
+        logger.info(f"Alan sözlüğü yüklendi: {len(fields_by_id)} alan, {len(specialties)} uzmanlık")
+
+    @property
+    def fields(self) -> List[Dict[str, Any]]:
+        """Ham alan listesini döndür"""
+        self._ensure_loaded()
+        return self._fields
+
+    def get_field_name(self, field_id: int) -> Optional[str]:
+        """Field ID'ye göre alan adını bul"""
+        self._ensure_loaded()
+        field = self._fields_by_id.get(field_id)
+        return field['name'] if field else None
+
+    def get_specialty_name(self, field_id: int, specialty_id: int) -> Optional[str]:
+        """(Field ID, Specialty ID) çiftine göre uzmanlık adını bul"""
+        self._ensure_loaded()
+        return self._specialties.get((field_id, specialty_id))
+
+    def get_specialties(self, field_id: int) -> List[Dict[str, Any]]:
+        """Bir alanın uzmanlık listesini döndür"""
+        self._ensure_loaded()
+        field = self._fields_by_id.get(field_id)
+        return list(field.get('specialties', [])) if field else []
+
+    def find_field_id(self, name: str) -> Optional[int]:
+        """Alan adına göre ID bul (Türkçe normalizasyonlu tam eşleşme)"""
+        self._ensure_loaded()
+        return self._field_ids_by_name.get(normalize_tr(name))
+
+    def find_specialty_ids(self, name: str) -> List[Tuple[int, int]]:
+        """Uzmanlık adına göre (field_id, specialty_id) çiftlerini bul"""
+        self._ensure_loaded()
+        return list(self._specialty_ids_by_name.get(normalize_tr(name), []))
+
+    def search(self, query: str, limit: int = 20) -> Dict[str, List[Dict[str, Any]]]:
+        """Alan ve uzmanlık adlarında kısmi eşleşme ara"""
+        self._ensure_loaded()
+        needle = normalize_tr(query)
+        fields = []
+        specialties = []
+        if not needle:
+            return {"fields": fields, "specialties": specialties}
+
+        for norm_name, field_id in self._field_ids_by_name.items():
+            if needle in norm_name:
+                fields.append({"field_id": field_id, "name": self._fields_by_id[field_id]['name']})
+        for norm_name, keys in self._specialty_ids_by_name.items():
+            if needle not in norm_name:
+                continue
+            for field_id, specialty_id in keys:
+                specialties.append({
+                    "field_id": field_id,
+                    "field_name": self._fields_by_id[field_id]['name'],
+                    "specialty_id": specialty_id,
+                    "name": self._specialties[(field_id, specialty_id)]
+                })
+
+        # Tam eşleşmeler önce gelsin
+        fields.sort(key=lambda item: normalize_tr(item["name"]) != needle)
+        specialties.sort(key=lambda item: normalize_tr(item["name"]) != needle)
+        return {"fields": fields[:limit], "specialties": specialties[:limit]}
+
+
+_taxonomies: Dict[Path, FieldTaxonomy] = {}
+_taxonomies_lock = threading.Lock()
+
+
+def get_taxonomy(fields_path: Path) -> FieldTaxonomy:
+    """Aynı dosya için paylaşılan FieldTaxonomy örneğini döndür"""
+    key = Path(fields_path).resolve()
+    with _taxonomies_lock:
+        taxonomy = _taxonomies.get(key)
+        if taxonomy is None:
+            taxonomy = FieldTaxonomy(key)
+            _taxonomies[key] = taxonomy
+        return taxonomy
@@ -0,0 +1,237 @@
+"""
+Watchlist - Zamanlanmış olarak yenilenen sabit akademisyen listeleri
+
+Her watchlist isim veya profil URL'lerinden oluşur ve cron benzeri bir
+takvimle (dakika saat gün ay haftanın-günü) çalışır. Listeler
+data/watchlists/watchlists.json'da, her çalıştırmanın anlık görüntüsü ve
+önceki görüntüye göre farkı data/watchlists/<id>/ altında tutulur.
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta, time as dt_time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+# (alan adı, en küçük, en büyük); haftanın gününde 7 de Pazar'dır
+CRON_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+WATCHLIST_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Farkı hesaplanan profil alanları
+DIFF_FIELDS = ("name", "title", "header", "green_label", "blue_label", "keywords", "email", "photoUrl", "deleted")
+
+# Saklanan çalıştırma farkı sayısı
+MAX_RUN_HISTORY = 50
+
+
+def _parse_cron_field(text: str, low: int, high: int) -> set:
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Geçersiz adım: {step_text}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"Aralık dışı değer: {part} ({low}-{high})")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """Beş alanlı cron ifadesi; haftanın günü 0=Pazar (7 de Pazar kabul edilir)"""
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        fields = CRON_ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron ifadesi 5 alan içermeli: {expression!r}")
+        try:
+            self.minutes, self.hours, self.days, self.months, self.weekdays = (
+                _parse_cron_field(text, low, high) for text, (_, low, high) in zip(fields, CRON_FIELDS)
+            )
+        except ValueError as e:
+            raise ValueError(f"Geçersiz cron ifadesi {expression!r}: {e}") from None
+        if 7 in self.weekdays:
+            self.weekdays = (self.weekdays - {7}) | {0}
+        # Standart cron: gün ve haftanın günü ikisi de kısıtlıysa biri eşleşmesi yeter
+        self._day_restricted = fields[2] != "*"
+        self._weekday_restricted = fields[4] != "*"
+
+    def _day_matches(self, day: datetime) -> bool:
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def next_after(self, after: datetime) -> datetime:
+        """after'dan sonraki ilk eşleşen dakika"""
+        current = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = current + timedelta(days=366 * 5)
+        while current < limit:
+            if not self._day_matches(current):
+                current = datetime.combine(current.date() + timedelta(days=1), dt_time())
+                continue
+            if current.hour not in self.hours:
+                current = current.replace(minute=0) + timedelta(hours=1)
+                continue
+            if current.minute not in self.minutes:
+                current += timedelta(minutes=1)
+                continue
+            return current
+        raise ValueError(f"Cron ifadesi hiç eşleşmiyor: {self.expression!r}")
+
+
+def parse_window(text: Optional[str]) -> Optional[Tuple[dt_time, dt_time]]:
+    """"HH:MM-HH:MM" yoğun olmayan saat aralığı; boş veya "*" ise kısıt yok"""
+    if not text or text.strip() == "*":
+        return None
+    start, end = (dt_time.fromisoformat(part.strip()) for part in text.split("-", 1))
+    return start, end
+
+
+def in_window(window: Optional[Tuple[dt_time, dt_time]], now: datetime) -> bool:
+    """now pencere içinde mi? (gece yarısını aşan pencereler desteklenir)"""
+    if window is None:
+        return True
+    start, end = window
+    current = now.time()
+    if start <= end:
+        return start <= current < end
+    return current >= start or current < end
+
+
+def diff_snapshots(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, Any]:
+    """İki anlık görüntü arasındaki profil ve işbirlikçi farkları"""
+    old = old or {"profiles": {}, "collaborators": {}}
+    old_profiles, new_profiles = old.get("profiles", {}), new.get("profiles", {})
+    changed = {}
+    for url in new_profiles.keys() & old_profiles.keys():
+        fields = {
+            field: [old_profiles[url].get(field), new_profiles[url].get(field)]
+            for field in DIFF_FIELDS
+            if (old_profiles[url].get(field) or "") != (new_profiles[url].get(field) or "")
+        }
+        if fields:
+            changed[url] = fields
+
+    collaborator_changes = {}
+    old_collaborators = old.get("collaborators", {})
+    for url, collaborators in new.get("collaborators", {}).items():
+        if url not in old_collaborators:
+            continue
+        before = {item["url"]: item for item in old_collaborators[url] if item.get("url")}
+        after = {item["url"]: item for item in collaborators if item.get("url")}
+        added = [after[key] for key in after.keys() - before.keys()]
+        removed = [before[key] for key in before.keys() - after.keys()]
+        if added or removed:
+            collaborator_changes[url] = {"added": added, "removed": removed}
+
+    return {
+        "profiles_added": sorted(new_profiles.keys() - old_profiles.keys()),
+        "profiles_removed": sorted(old_profiles.keys() - new_profiles.keys()),
+        "profiles_changed": changed,
+        "collaborators": collaborator_changes,
+    }
+
+
+def has_changes(diff: Dict[str, Any]) -> bool:
+    return any(diff.get(key) for key in ("profiles_added", "profiles_removed", "profiles_changed", "collaborators"))
+
+
+class WatchlistStore:
+    """Watchlist tanımları, son anlık görüntüler ve çalıştırma farkları"""
+
+    def __init__(self, base_path: Path):
+        self.base_path = Path(base_path)
+        self.index_path = self.base_path / "watchlists.json"
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _write_json(path: Path, data: Any):
+        """Yarım yazılmış dosya kalmasın: geçici dosyaya yaz, sonra değiştir"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_json(path: Path, default: Any = None) -> Any:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return self._read_json(self.index_path, {})
+
+    def get(self, watchlist_id: str) -> Optional[Dict[str, Any]]:
+        return self.load_all().get(watchlist_id)
+
+    def save(self, watchlist: Dict[str, Any]):
+        with self._lock:
+            watchlists = self._read_json(self.index_path, {})
+            watchlists[watchlist["id"]] = watchlist
+            self._write_json(self.index_path, watchlists)
+
+    def update(self, watchlist_id: str, **fields):
+        """Tanımın sadece verilen alanlarını güncelle (silinmişse bir şey yapma)"""
+        with self._lock:
+            watchlists = self._read_json(self.index_path, {})
+            if watchlist_id in watchlists:
+                watchlists[watchlist_id].update(fields)
+                self._write_json(self.index_path, watchlists)
+
+    def delete(self, watchlist_id: str) -> bool:
+        with self._lock:
+            watchlists = self._read_json(self.index_path, {})
+            if watchlists.pop(watchlist_id, None) is None:
+                return False
+            self._write_json(self.index_path, watchlists)
+            return True
+
+    def _dir(self, watchlist_id: str) -> Path:
+        return self.base_path / watchlist_id
+
+    def load_snapshot(self, watchlist_id: str) -> Optional[Dict[str, Any]]:
+        return self._read_json(self._dir(watchlist_id) / "snapshot.json")
+
+    def save_run(self, watchlist_id: str, snapshot: Dict[str, Any], run: Dict[str, Any]):
+        """Yeni anlık görüntüyü ve çalıştırma farkını kaydet, eski farkları buda"""
+        run_dir = self._dir(watchlist_id) / "runs"
+        self._write_json(run_dir / f"{run['started_at'].replace(':', '')}.json", run)
+        self._write_json(self._dir(watchlist_id) / "snapshot.json", snapshot)
+        for old in sorted(run_dir.glob("*.json"))[:-MAX_RUN_HISTORY]:
+            old.unlink(missing_ok=True)
+
+    def list_runs(self, watchlist_id: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """En yeni çalıştırmalar (yeniden eskiye)"""
+        run_dir = self._dir(watchlist_id) / "runs"
+        if not run_dir.exists():
+            return []
+        paths = sorted(run_dir.glob("*.json"), reverse=True)[:limit]
+        return [run for run in (self._read_json(path) for path in paths) if run]
@@ -0,0 +1,119 @@
+"""
+Ortak test yardımcıları: Chrome açmayan sahte Selenium yöneticisi ve işbirlikçi scraper fabrikası
+"""
+
+import asyncio
+
+import pytest
+
+from src.tools.collaborator_scraper import CollaboratorScraperTool
+from src.utils.file_manager import FileManager
+
+PROFILE_URL = "http://yok.test/ayse"
+TARGETS = [{"name": f"K{i}", "href": f"http://yok.test/k{i}", "weight": 1} for i in range(1, 6)]
+
+
+class FakeElement:
+    def click(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def send_keys(self, *args):
+        pass
+
+
+class FakeDriver:
+    def find_element(self, *args):
+        return FakeElement()
+
+
+class FakeSeleniumManager:
+    """Açılan/kapanan driver sayısını tutar; bekleme çağrıları hemen başarılı döner"""
+
+    def __init__(self):
+        self.opened = 0
+        self.closed = 0
+
+    async def get_driver(self, **kwargs):
+        self.opened += 1
+        return FakeDriver()
+
+    async def close_driver(self, driver):
+        self.closed += 1
+
+    async def navigate_to_page(self, driver, url, timeout=10):
+        return True
+
+    async def wait_for_clickable(self, *args, **kwargs):
+        return True
+
+    async def wait_for_element(self, *args, **kwargs):
+        return True
+
+    async def handle_cookies(self, driver):
+        pass
+
+    async def recycle_if_needed(self, driver, block_preset=None):
+        return driver
+
+    async def run(self, driver, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+
+@pytest.fixture
+def make_collaborator_scraper(tmp_path):
+    """Sahte grafik ve profil sayfalarıyla CollaboratorScraperTool üretir
+
+    graphs: profil URL'i -> hedef listesi (verilmezse her profil için TARGETS);
+    broken: grafiği okunamayan profiller; center_url: grafiğin merkez düğüm linki
+    (sayfa istenenden farklı yazılmış URL döndürebilir); block_at: bu sıradaki
+    işbirlikçide takılır ve scraper.blocked set edilir.
+    """
+
+    def factory(graphs=None, broken=(), center_url=None, block_at=None, delay=0):
+        scraper = CollaboratorScraperTool(
+            selenium_manager=FakeSeleniumManager(), file_manager=FileManager(base_path=str(tmp_path))
+        )
+        scraper.collaborator_delay = 0
+        scraper.graph_reads = 0
+        scraper.visited = []
+        scraper.visited_urls = []
+        scraper.blocked = asyncio.Event()
+
+        async def extract_graph(driver, profile_url):
+            scraper.graph_reads += 1
+            if profile_url in broken:
+                raise Exception("İşbirlikçi grafiği yüklenemedi")
+            targets = list(TARGETS) if graphs is None else [
+                {"name": name.upper(), "href": f"http://yok.test/{name}" if name else "", "weight": 1}
+                for name in graphs[profile_url]
+            ]
+            return targets, {"profile_url": center_url or profile_url, "profile_name": "AYŞE", "edges": []}
+
+        async def extract_collaborator(driver, obj, idx):
+            if idx == block_at:
+                scraper.blocked.set()
+                await asyncio.sleep(60)
+            await asyncio.sleep(delay)
+            scraper.visited.append(idx)
+            if obj["href"]:
+                scraper.visited_urls.append(obj["href"])
+            return {"id": idx, "name": obj["name"], "url": obj["href"], "deleted": not obj["href"],
+                    "weight": obj["weight"]}
+
+        scraper._extract_graph_collaborators = extract_graph
+        scraper._extract_collaborator_data = extract_collaborator
+        return scraper
+
+    return factory
+
+
+@pytest.fixture
+def session_dir(tmp_path):
+    """PROFILE_URL profilini içeren "s1" session'ı"""
+    session = tmp_path / "sessions" / "s1"
+    session.mkdir(parents=True)
+    (session / "main_profile.json").write_text('{"profiles": [{"id": 1, "url": "%s"}]}' % PROFILE_URL)
+    return tmp_path
@@ -0,0 +1,114 @@
+"""
+Session iptali ve son tarih testleri
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.models.schemas import SearchRequest
+from src.tools import collaborator_scraper as collaborator_module
+from src.tools.profile_scraper import ProfileScraperTool
+from src.utils.file_manager import FileManager
+from tests.conftest import PROFILE_URL, FakeSeleniumManager
+
+# Araçlar modülleri "utils." altından import eder; aynı kayıt örneğini kullan
+session_tasks = collaborator_module.session_tasks
+
+
+class TestCollaboratorCancellation:
+    @pytest.mark.asyncio
+    async def test_cancel_saves_partial_and_resumes(self, session_dir, make_collaborator_scraper):
+        scraper = make_collaborator_scraper(block_at=3)
+        await scraper.get_collaborators(session_id="s1", profile_url=PROFILE_URL)
+        await scraper.blocked.wait()
+        assert [job["operation"] for job in session_tasks.active("s1")] == ["collaborators"]
+
+        assert session_tasks.cancel("s1") == ["collaborators"]
+        result = await scraper._jobs["s1"]
+        assert result["status"] == "cancelled"
+        assert result["cancel_reason"] == "cancelled"
+        assert [item["id"] for item in result["collaborators"]] == [1, 2]
+        # Driver beklemedeyken bırakılır
+        assert scraper.selenium_manager.closed == 1
+        assert session_tasks.active("s1") == []
+
+        session = session_dir / "sessions" / "s1"
+        saved = json.loads((session / "collaborators.json").read_text())
+        assert saved["cancelled"] is True
+        assert saved["total_count"] == 2
+        assert not (session / "collaborators_done.txt").exists()
+        assert (session / "collaborators.partial.jsonl").exists()
+
+        # Aynı çağrı günlükten devam eder
+        restarted = make_collaborator_scraper()
+        resumed = await restarted.get_collaborators(session_id="s1", profile_url=PROFILE_URL, wait=True)
+        assert resumed["status"] == "completed"
+        assert restarted.visited == [3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_job_after_completed_profile_resumes(self, session_dir, make_collaborator_scraper):
+        other_url = "http://yok.test/mehmet"
+        completed = await make_collaborator_scraper().get_collaborators(
+            session_id="s1", profile_url=other_url, wait=True
+        )
+        assert completed["total_count"] == 5
+
+        scraper = make_collaborator_scraper(block_at=3)
+        await scraper.get_collaborators(session_id="s1", profile_url=PROFILE_URL)
+        await scraper.blocked.wait()
+        session_tasks.cancel("s1")
+        assert (await scraper._jobs["s1"])["total_count"] == 2
+        # Önceki profilin tamamlandı işareti yarıda kalan işi "completed" göstermez
+        assert not (session_dir / "sessions" / "s1" / "collaborators_done.txt").exists()
+
+        restarted = make_collaborator_scraper()
+        resumed = await restarted.get_collaborators(session_id="s1", profile_url=PROFILE_URL, wait=True)
+        assert resumed["status"] == "completed"
+        assert resumed["total_count"] == 5
+        assert restarted.visited == [3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_deadline_stops_job(self, session_dir, make_collaborator_scraper):
+        scraper = make_collaborator_scraper(delay=0.02)
+        result = await scraper.get_collaborators(
+            session_id="s1", profile_url=PROFILE_URL, wait=True, deadline_seconds=0.01
+        )
+        assert result["status"] == "cancelled"
+        assert result["cancel_reason"] == "deadline"
+        assert scraper.visited == [1]
+        assert scraper.get_job_progress("s1")["status"] == "cancelled"
+
+    def test_cancel_without_running_job(self):
+        assert session_tasks.cancel("bos") == []
+
+
+class TestProfileSearchCancellation:
+    @pytest.mark.asyncio
+    async def test_cancel_marks_partial_profiles(self, tmp_path):
+        selenium_manager = FakeSeleniumManager()
+        scraper = ProfileScraperTool(selenium_manager=selenium_manager, file_manager=FileManager(base_path=str(tmp_path)))
+        blocked = asyncio.Event()
+
+        async def scrape_profiles(driver, request, session_id, selected_field, selected_specialties):
+            profiles = [{"id": 1, "name": "AYŞE", "url": "http://yok.test/ayse"}]
+            scraper._in_flight_profiles[session_id] = profiles
+            await scraper.file_manager.save_profiles(session_id, profiles)
+            blocked.set()
+            await asyncio.sleep(60)
+
+        scraper._scrape_profiles = scrape_profiles
+        task = asyncio.create_task(scraper._async_scrape_profiles(SearchRequest(name="ayşe"), "q1", None, []))
+        await blocked.wait()
+        assert session_tasks.cancel("q1") == ["profile_search"]
+        await task
+
+        assert selenium_manager.closed == 1
+        saved = json.loads((tmp_path / "sessions" / "q1" / "main_profile.json").read_text())
+        assert saved["cancelled"] is True
+        assert saved["completed"] is False
+        assert len(saved["profiles"]) == 1
+        status = await scraper.check_scraping_status("q1")
+        assert status["status"] == "cancelled"
+        assert status["profiles_found"] == 1
@@ -0,0 +1,94 @@
+"""
+Ortak yazarlık ağı testleri
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from src.utils.coauthor_graph import CoauthorGraph
+
+
+def _save(sessions_path, session_id, profile_url, collaborators, edges=()):
+    session_dir = sessions_path / session_id
+    session_dir.mkdir(parents=True, exist_ok=True)
+    data = {
+        "profile_url": profile_url,
+        "profile_name": profile_url.upper(),
+        "collaborators": [{"name": url.upper(), "url": url, "weight": weight} for url, weight in collaborators],
+        "edges": [{"source": source, "target": target, "weight": weight} for source, target, weight in edges],
+    }
+    (session_dir / "collaborators.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+class TestCoauthorGraph:
+    def test_merge_sessions_and_rank_neighbors(self, tmp_path):
+        # a'nın ağı: b, c, d; b aynı zamanda c ve e ile çalışıyor
+        _save(tmp_path, "s1", "a", [("b", 3), ("c", 1), ("d", 1)], edges=[("b", "c", 2)])
+        _save(tmp_path, "s2", "b", [("a", 2), ("c", 2), ("e", 1)])
+        _save(tmp_path, "s3", "x", [("y", 1)])
+        graph = CoauthorGraph(tmp_path)
+
+        stats = graph.stats()
+        assert stats["nodes"] == 7
+        # a-b iki session'da görülür, en büyük ağırlık (3) tutulur
+        assert stats["edges"] == 6
+        assert stats["components"] == 2
+        assert stats["largest_component"] == 5
+
+        result = graph.central_around("a", top_k=2)
+        assert result["profile"]["degree"] == 3
+        assert [item["url"] for item in result["collaborators"]] == ["b", "c"]
+        assert result["collaborators"][0]["weight_to_profile"] == 3
+
+        two_hops = graph.central_around("a", hops=2, metric="degree")
+        assert {item["url"] for item in two_hops["collaborators"]} == {"b", "c", "d", "e"}
+
+        assert graph.central_around("unknown") is None
+
+    def test_incremental_refresh(self, tmp_path):
+        _save(tmp_path, "s1", "a", [("b", 1)])
+        graph = CoauthorGraph(tmp_path)
+        assert graph.stats()["edges"] == 1
+
+        _save(tmp_path, "s1", "a", [("b", 1), ("c", 1)])
+        assert graph.stats()["edges"] == 1
+        graph.mark_dirty("s1")
+        assert graph.stats()["edges"] == 2
+
+    def test_empty_graph(self, tmp_path):
+        graph = CoauthorGraph(tmp_path)
+        assert graph.stats()["nodes"] == 0
+        with pytest.raises(ValueError):
+            graph.central_around("a", metric="betweenness")
+
+    def test_batch_results_are_included(self, tmp_path):
+        _save(tmp_path, "s1", "a", [("b", 1)])
+        batch = {"profiles": [
+            {"profile_url": "c", "status": "completed", "collaborators": [{"url": "d", "weight": 2}], "edges": []},
+            {"profile_url": "e", "status": "failed"},
+        ]}
+        (tmp_path / "s1" / "collaborators_batch.json").write_text(json.dumps(batch), encoding="utf-8")
+        graph = CoauthorGraph(tmp_path)
+        assert graph.stats()["edges"] == 2
+        assert graph.stats()["sessions"] == 1
+        assert graph.central_around("c")["collaborators"][0]["url"] == "d"
+
+    def test_allowed_sessions_only(self, tmp_path):
+        _save(tmp_path, "s1", "a", [("b", 1), ("c", 1)])
+        _save(tmp_path, "s2", "b", [("a", 5), ("e", 1)])
+        graph = CoauthorGraph(tmp_path)
+        only_s1 = lambda session_id: session_id == "s1"
+
+        result = graph.central_around("a", hops=2, allowed=only_s1)
+        assert {item["url"] for item in result["collaborators"]} == {"b", "c"}
+        assert result["collaborators"][0]["weight_to_profile"] == 1
+        # Başka istemcinin session'ında kalan profil görünmez
+        assert graph.central_around("e", allowed=only_s1) is None
+        assert graph.stats(only_s1) == {
+            "nodes": 3, "edges": 2, "sessions": 1, "components": 1, "largest_component": 3,
+        }
+        assert graph.central_around("e", allowed=lambda session_id: True) is not None
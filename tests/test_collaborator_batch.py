@@ -0,0 +1,90 @@
+"""
+Toplu işbirlikçi işi testleri
+"""
+
+import json
+
+import pytest
+
+from src.tools.collaborator_batch import CollaboratorBatchTool
+
+# Profil -> işbirlikçileri; k2 ve k3 birden çok profilin altında görünür
+GRAPHS = {
+    "http://yok.test/p1": ["k1", "k2", "k3"],
+    "http://yok.test/p2": ["k2", "k3", "k4"],
+    "http://yok.test/p3": ["k3", ""],
+}
+
+
+@pytest.fixture
+def make_batch(make_collaborator_scraper):
+    def factory(**kwargs):
+        return CollaboratorBatchTool(make_collaborator_scraper(graphs=GRAPHS, **kwargs), concurrency=2)
+    return factory
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    session = tmp_path / "sessions" / "s1"
+    session.mkdir(parents=True)
+    profiles = [{"id": i, "name": f"P{i}", "url": f"http://yok.test/p{i}"} for i in (1, 2, 3)]
+    (session / "main_profile.json").write_text(json.dumps({"profiles": profiles}))
+    return tmp_path
+
+
+class TestCollaboratorBatch:
+    @pytest.mark.asyncio
+    async def test_batch_shares_drivers_and_dedups_details(self, sessions, make_batch):
+        batch = make_batch()
+        result = await batch.start_batch("s1", "all", wait=True)
+
+        assert result["status"] == "completed"
+        assert [entry["profile_id"] for entry in result["profiles"]] == [1, 2, 3]
+        # İki işçi, iki driver; her işbirlikçi sayfası bir kez
+        assert batch.selenium_manager.opened == batch.selenium_manager.closed == 2
+        assert sorted(batch.scraper.visited_urls) == ["http://yok.test/k1", "http://yok.test/k2",
+                                                 "http://yok.test/k3", "http://yok.test/k4"]
+        assert result["job"]["detail_fetches"] == 4
+        assert result["job"]["detail_reused"] == 3
+        # Tekrar kullanılan kayıt, profilin kendi sırası ve ağırlığıyla döner
+        p2 = result["profiles"][1]["collaborators"]
+        assert [(item["id"], item["url"]) for item in p2] == [
+            (1, "http://yok.test/k2"), (2, "http://yok.test/k3"), (3, "http://yok.test/k4")
+        ]
+
+        saved = json.loads((sessions / "sessions" / "s1" / "collaborators_batch.json").read_text())
+        assert saved["completed"] is True
+        assert len(saved["profiles"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_rerun_retries_only_failed_profiles(self, sessions, make_batch):
+        first = await make_batch(broken={"http://yok.test/p2"}).start_batch("s1", [1, 2, 99], wait=True)
+        assert first["job"]["profiles_failed"] == 1
+        assert first["job"]["missing_ids"] == [99]
+
+        batch = make_batch()
+        second = await batch.start_batch("s1", [1, 2], wait=True)
+        assert second["job"]["profiles_resumed"] == 1
+        assert [entry["status"] for entry in second["profiles"]] == ["completed", "completed"]
+        # p1'in işbirlikçileri önceki çalıştırmadan kullanılır, sadece k4 yeni ziyaret edilir
+        assert batch.scraper.visited_urls == ["http://yok.test/k4"]
+
+    @pytest.mark.asyncio
+    async def test_center_url_does_not_replace_requested_url(self, sessions, make_batch):
+        center = "http://yok.test/merkez?lang=tr"
+        first = await make_batch(center_url=center).start_batch("s1", [1, 2], wait=True)
+        assert [entry["profile_url"] for entry in first["profiles"]] == ["http://yok.test/p1", "http://yok.test/p2"]
+        assert {entry["center_url"] for entry in first["profiles"]} == {center}
+
+        # Devam istenen URL ile eşleşir: tamamlanan profiller yeniden çekilmez, kayıtlar tekrarlanmaz
+        batch = make_batch(center_url=center)
+        second = await batch.start_batch("s1", [1, 2], wait=True)
+        assert second["job"]["profiles_resumed"] == 2
+        assert batch.scraper.graph_reads == 0
+        saved = json.loads((sessions / "sessions" / "s1" / "collaborators_batch.json").read_text())
+        assert len(saved["profiles"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_session(self, make_batch):
+        result = await make_batch().start_batch("yok", "all")
+        assert result["status"] == "failed"
@@ -0,0 +1,94 @@
+"""
+Arka plan ve devam ettirilebilir işbirlikçi işi testleri
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from tests.conftest import PROFILE_URL
+
+
+class TestCollaboratorJobs:
+    @pytest.mark.asyncio
+    async def test_background_job_and_saved_result(self, session_dir, make_collaborator_scraper):
+        scraper = make_collaborator_scraper()
+        started = await scraper.get_collaborators(session_id="s1", profile_url=PROFILE_URL)
+        assert started["status"] == "running"
+
+        await scraper._jobs["s1"]
+        progress = scraper.get_job_progress("s1")
+        assert progress["status"] == "completed"
+        assert (progress["processed"], progress["total"]) == (5, 5)
+        assert not (session_dir / "sessions" / "s1" / "collaborators.partial.jsonl").exists()
+        assert not (session_dir / "sessions" / "temp_session").exists()
+
+        # Biten iş için tekrar çağrı scrape etmeden kaydı döndürür
+        result = await scraper.get_collaborators(session_id="s1", profile_url=PROFILE_URL)
+        assert result["status"] == "completed"
+        assert result["total_count"] == 5
+        assert scraper.visited == [1, 2, 3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_interrupted_job_resumes_from_journal(self, session_dir, make_collaborator_scraper):
+        scraper = make_collaborator_scraper(block_at=3)
+        await scraper.get_collaborators(session_id="s1", profile_url=PROFILE_URL)
+        await scraper.blocked.wait()
+        # Sunucu çökmesi: iş yarıda kesilir
+        scraper._jobs["s1"].cancel()
+        await asyncio.sleep(0)
+        assert scraper.visited == [1, 2]
+
+        restarted = make_collaborator_scraper()
+        result = await restarted.get_collaborators(session_id="s1", profile_url=PROFILE_URL, wait=True)
+        assert result["status"] == "completed"
+        assert restarted.graph_reads == 0
+        assert restarted.visited == [3, 4, 5]
+        assert [item["id"] for item in result["collaborators"]] == [1, 2, 3, 4, 5]
+        assert restarted.get_job_progress("s1")["resumed_from"] == 2
+
+    @pytest.mark.asyncio
+    async def test_other_profile_rejected_while_running(self, session_dir, make_collaborator_scraper):
+        scraper = make_collaborator_scraper(block_at=1)
+        await scraper.get_collaborators(session_id="s1", profile_url=PROFILE_URL)
+        await scraper.blocked.wait()
+        result = await scraper.get_collaborators(session_id="s1", profile_url="http://yok.test/baska")
+        assert result["status"] == "failed"
+        scraper._jobs["s1"].cancel()
+
+    @pytest.mark.asyncio
+    async def test_prefetch_hit_does_not_overwrite_running_job(self, session_dir, make_collaborator_scraper):
+        scraper = make_collaborator_scraper(block_at=2)
+        await scraper.get_collaborators(session_id="s1", profile_url=PROFILE_URL)
+        await scraper.blocked.wait()
+        other = "http://yok.test/baska"
+        entry = {"collaborators": [{"name": "X", "url": f"{other}/x"}], "graph": {"profile_url": other},
+                 "fetched_at": time.time()}
+        scraper.prefetch_cache.put(other, entry, 1)
+
+        result = await scraper.get_collaborators(session_id="s1", profile_url=other)
+        assert result["status"] == "failed"
+        saved = await scraper.file_manager.load_session_data("s1", "collaborators")
+        assert (saved or {}).get("requested_url") != other
+        assert not (await scraper.file_manager.get_session_status("s1")).get("collaborators_completed")
+        scraper._jobs["s1"].cancel()
+
+    @pytest.mark.asyncio
+    async def test_profile_without_collaborators_completes(self, session_dir, make_collaborator_scraper):
+        scraper = make_collaborator_scraper(graphs={PROFILE_URL: []})
+        result = await scraper.get_collaborators(session_id="s1", profile_url=PROFILE_URL, wait=True)
+        assert result["status"] == "completed"
+        assert result["total_count"] == 0
+        assert scraper.get_job_progress("s1")["status"] == "completed"
+
+        # Boş sonuç da tamamlanmış sayılır, grafik tekrar okunmaz
+        again = await scraper.get_collaborators(session_id="s1", profile_url=PROFILE_URL)
+        assert again["status"] == "completed"
+        assert scraper.graph_reads == 1
+
+    @pytest.mark.asyncio
+    async def test_unreadable_graph_fails(self, session_dir, make_collaborator_scraper):
+        scraper = make_collaborator_scraper(broken=(PROFILE_URL,))
+        await scraper.get_collaborators(session_id="s1", profile_url=PROFILE_URL, wait=True)
+        assert scraper.get_job_progress("s1")["status"] == "failed"
@@ -0,0 +1,123 @@
+"""
+İşbirlikçi önceden çekme testleri
+"""
+
+import asyncio
+
+import pytest
+
+from src.tools.collaborator_prefetcher import CollaboratorPrefetcher
+from src.tools.collaborator_scraper import CollaboratorScraperTool
+from src.utils.file_manager import FileManager
+
+
+def _profiles(count):
+    return [{"id": i, "name": f"P{i}", "url": f"http://yok.test/p{i}"} for i in range(1, count + 1)]
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    scraper = CollaboratorScraperTool(file_manager=FileManager(base_path=str(tmp_path)))
+    scraper.fetched = []
+    scraper.delay = 0
+    scraper.result = "ok"
+
+    async def fake_fetch(profile_url, session_id=None, operation="collaborators", strict=False):
+        scraper.fetched.append((profile_url, operation))
+        await asyncio.sleep(scraper.delay)
+        if scraper.result == "error":
+            raise Exception("İşbirlikçi grafiği yüklenemedi")
+        if scraper.result == "empty":
+            return [], {"profile_url": profile_url, "edges": []}
+        return [{"name": "X", "url": f"{profile_url}/x", "weight": 1}], {"profile_url": profile_url, "edges": []}
+
+    scraper.fetch_collaborators = fake_fetch
+    return scraper
+
+
+class TestCollaboratorPrefetcher:
+    @pytest.mark.asyncio
+    async def test_prefetch_after_first_profiles(self, scraper):
+        file_manager = scraper.file_manager
+        prefetcher = CollaboratorPrefetcher(scraper, top_k=2, trigger_count=3, max_rss_mb=0)
+        file_manager.add_save_listener(
+            lambda session_id, kind: kind == "profiles" and prefetcher.on_profiles_saved(session_id)
+        )
+
+        await file_manager.save_profiles("s1", _profiles(2))
+        await asyncio.sleep(0.05)
+        assert scraper.fetched == []
+
+        await file_manager.save_profiles("s1", _profiles(3))
+        for _ in range(50):
+            if len(scraper.fetched) == 2 and not scraper.prefetch_tasks:
+                break
+            await asyncio.sleep(0.01)
+        assert [url for url, _ in scraper.fetched] == ["http://yok.test/p1", "http://yok.test/p2"]
+        assert {operation for _, operation in scraper.fetched} == {"prefetch"}
+
+        # Takip eden çağrı scrape etmeden önbellekten döner ve session'a kaydeder
+        result = await scraper.get_collaborators(session_id="s1", profile_id=2)
+        assert result["prefetched"] is True
+        assert result["total_count"] == 1
+        assert len(scraper.fetched) == 2
+        saved = await file_manager.load_session_data("s1", "collaborators")
+        assert saved["profile_url"] == "http://yok.test/p2"
+
+    @pytest.mark.asyncio
+    async def test_follow_up_waits_for_running_prefetch(self, scraper):
+        await scraper.file_manager.save_profiles("s1", _profiles(1))
+        prefetcher = CollaboratorPrefetcher(scraper, top_k=1, max_rss_mb=0)
+        scraper.delay = 0.2
+        running = asyncio.create_task(prefetcher.prefetch_urls("s1", ["http://yok.test/p1"]))
+        await asyncio.sleep(0.05)
+
+        result = await scraper.get_collaborators(session_id="s1", profile_url="http://yok.test/p1")
+        assert result["prefetched"] is True
+        assert len(scraper.fetched) == 1
+        assert await running == {"fetched": 1}
+
+    @pytest.mark.asyncio
+    async def test_memory_pressure_cancels_prefetch(self, scraper):
+        prefetcher = CollaboratorPrefetcher(scraper, top_k=1, max_rss_mb=0, check_interval=0.01)
+        scraper.delay = 5
+        running = asyncio.create_task(prefetcher.prefetch_urls("s1", ["http://yok.test/p1"]))
+        await asyncio.sleep(0.05)
+        assert scraper.prefetch_tasks
+
+        # Eşik süreç RSS'inin altına çekilince izleyici önceden çekmeyi iptal eder
+        prefetcher.max_rss = 1
+        assert await asyncio.wait_for(running, 2) == {"cancelled": 1}
+        assert prefetcher.last_cancel_reason == "memory"
+        assert scraper.get_prefetched("http://yok.test/p1") is None
+
+        # Baskı sürerken yeni önceden çekme başlatılmaz
+        assert await prefetcher.prefetch_urls("s1", ["http://yok.test/p2"]) == {"skipped_memory": 1}
+
+    @pytest.mark.asyncio
+    async def test_only_errors_pause_prefetch(self, scraper):
+        prefetcher = CollaboratorPrefetcher(scraper, top_k=1, max_rss_mb=0)
+        scraper.result = "empty"
+        assert await prefetcher.prefetch_urls("s1", ["http://yok.test/p1"]) == {"empty": 1}
+        assert prefetcher.stats()["paused_seconds"] == 0
+
+        scraper.result = "error"
+        assert await prefetcher.prefetch_urls("s1", ["http://yok.test/p2"]) == {"failed": 1}
+        assert await prefetcher.prefetch_urls("s1", ["http://yok.test/p3"]) == {"skipped_rate": 1}
+
+    @pytest.mark.asyncio
+    async def test_skipped_trigger_is_retried(self, scraper):
+        file_manager = scraper.file_manager
+        prefetcher = CollaboratorPrefetcher(scraper, top_k=1, trigger_count=1, max_rss_mb=0)
+        await file_manager.save_profiles("s1", _profiles(1))
+
+        # Kapasite doluyken hiçbir şey başlatılmaz, session tetiklenmiş sayılmaz
+        prefetcher.max_drivers = 0
+        await prefetcher._check_session("s1")
+        assert scraper.fetched == []
+        assert "s1" not in prefetcher._triggered
+
+        prefetcher.max_drivers = 2
+        await prefetcher._check_session("s1")
+        assert [url for url, _ in scraper.fetched] == ["http://yok.test/p1"]
+        assert "s1" in prefetcher._triggered
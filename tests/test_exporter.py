@@ -0,0 +1,71 @@
+"""
+Parquet/Arrow dışa aktarma testleri
+"""
+
+import json
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from src.utils.exporter import export_sessions
+
+
+def _write_session(sessions_path, session_id, profile_count, collaborators=None):
+    session_dir = sessions_path / session_id
+    session_dir.mkdir(parents=True)
+    profiles = [
+        {
+            "id": i, "name": f"Akademisyen {i}", "title": "Prof. Dr." if i % 2 else "Doç. Dr.",
+            "header": ("ORTA DOĞU TEKNİK ÜNİVERSİTESİ" if i % 3 else "İSTANBUL TEKNİK ÜNİVERSİTESİ") + "/MÜHENDİSLİK",
+            "green_label": "Mühendislik Temel Alanı", "blue_label": "Bilgisayar Bilimleri",
+            "keywords": "makine öğrenmesi ; veri madenciliği", "email": f"a{i}@uni.edu.tr",
+            "url": f"https://akademik.yok.gov.tr/{i}", "photoUrl": "", "info": "uzun metin " * 20,
+        }
+        for i in range(profile_count)
+    ]
+    (session_dir / "main_profile.json").write_text(json.dumps({"profiles": profiles}), encoding="utf-8")
+    if collaborators is not None:
+        (session_dir / "collaborators.json").write_text(json.dumps({"collaborators": collaborators}), encoding="utf-8")
+
+
+class TestExporter:
+    def test_merged_parquet_export(self, tmp_path):
+        sessions = tmp_path / "sessions"
+        _write_session(sessions, "session_a", 25, [{"id": 1, "name": "Ortak", "weight": 3, "deleted": False}])
+        _write_session(sessions, "session_b", 7)
+
+        result = export_sessions(sessions, tmp_path / "out", batch_size=4)
+
+        files = {entry["kind"]: entry for entry in result["files"]}
+        assert files["profiles"]["rows"] == 32
+        assert files["collaborators"]["rows"] == 1
+        table = pq.read_table(files["profiles"]["path"])
+        assert table.num_rows == 32
+        assert "info" not in table.column_names
+        assert pa.types.is_dictionary(table.schema.field("university").type)
+        assert set(table.column("session_id").to_pylist()) == {"session_a", "session_b"}
+        assert set(table.column("university").to_pylist()) == {"ORTA DOĞU TEKNİK ÜNİVERSİTESİ", "İSTANBUL TEKNİK ÜNİVERSİTESİ"}
+        assert pq.read_table(files["collaborators"]["path"]).column("weight").to_pylist() == [3.0]
+
+    def test_per_session_arrow_export(self, tmp_path):
+        sessions = tmp_path / "sessions"
+        _write_session(sessions, "session_a", 9)
+        _write_session(sessions, "session_b", 3)
+
+        result = export_sessions(sessions, tmp_path / "out", kinds=["profiles", "collaborators"],
+                                 fmt="arrow", merge=False, batch_size=2)
+
+        # Kaydı olmayan collaborators için dosya açılmaz
+        assert sorted(entry["path"].rsplit("/", 1)[-1] for entry in result["files"]) == [
+            "session_a_profiles.arrow", "session_b_profiles.arrow"
+        ]
+        with pa.ipc.open_file(result["files"][0]["path"]) as reader:
+            table = reader.read_all()
+        assert table.num_rows == 9
+        assert table.column("title").to_pylist()[:2] == ["Doç. Dr.", "Prof. Dr."]
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            export_sessions(tmp_path, tmp_path / "out", fmt="csv")
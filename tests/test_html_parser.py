@@ -0,0 +1,51 @@
+from pathlib import Path
+from src.utils.html_parser import parse_profile_rows, parse_profile_page, has_next_page, render_text
+from lxml import html as lxml_html
+
+FIXTURES = Path(__file__).parent / "fixtures"
+BASE_URL = "https://akademik.yok.gov.tr/AkademikArama/"
+
+class TestHtmlParser:
+    """Çevrimdışı HTML ayrıştırma test sınıfı"""
+
+    def test_render_text(self):
+        """Selenium .text benzeri metin üretme testi"""
+        element = lxml_html.fromstring("<td><h6>PROF</h6>  A   B&nbsp;&nbsp;C<br>D</td>")
+        assert render_text(element) == "PROF\nA B  C\nD"
+
+    def test_parse_profile_rows(self):
+        """Arama sonucu satırlarını ayrıştırma testi"""
+        source = (FIXTURES / "search_results.html").read_text(encoding="utf-8")
+        profiles = parse_profile_rows(source, BASE_URL)
+        assert len(profiles) == 2
+
+        first = profiles[0]
+        assert first["name"] == "AHMET YILMAZ"
+        assert first["title"] == "PROFESÖR"
+        assert first["url"] == BASE_URL + "AkademisyenGorevOgrenimBilgileri?sira=1001"
+        assert first["green_label"] == "Mühendislik Temel Alanı"
+        assert first["blue_label"] == "Bilgisayar Bilimleri ve Mühendisliği"
+        assert first["keywords"] == "Yapay Zeka ; Makine Öğrenmesi ; Veri Madenciliği"
+        assert first["email"] == "ahmet.yilmaz@metu.edu.tr"
+
+        second = profiles[1]
+        assert second["name"] == "AYŞE KAYA"
+        assert second["photoUrl"] == "/default_photo.jpg"
+        assert second["keywords"] == ""
+        assert has_next_page(source)
+
+    def test_parse_profile_page(self):
+        """Profil sayfasını ayrıştırma testi"""
+        source = (FIXTURES / "profile_page.html").read_text(encoding="utf-8")
+        profile = parse_profile_page(source, BASE_URL + "view/viewAuthor.jsp")
+        assert profile["name"] == "MEHMET DEMİR"
+        assert profile["header"] == "EGE ÜNİVERSİTESİ/FEN FAKÜLTESİ/MATEMATİK BÖLÜMÜ"
+        assert profile["blue_label"] == "Matematik"
+        assert profile["keywords"] == "Topoloji ; Cebir"
+        assert profile["email"] == "mehmet.demir@ege.edu.tr"
+        assert profile["photoUrl"] == BASE_URL + "view/AkademisyenFoto?foto=2001"
+
+    def test_parse_deleted_profile_page(self):
+        """Profil bilgisi olmayan sayfa testi"""
+        assert parse_profile_page("<html><body><p>Bulunamadı</p></body></html>") is None
+        assert parse_profile_rows("") == []
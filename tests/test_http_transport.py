@@ -0,0 +1,124 @@
+import asyncio
+import json
+import httpx
+import socket
+import pytest
+import pytest_asyncio
+import uvicorn
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+
+import server
+from utils.client_registry import session_ownership
+from utils.file_manager import FileManager
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest_asyncio.fixture
+async def http_server():
+    """max_sessions=2 ile yerel HTTP server başlat"""
+    port = _free_port()
+    config = uvicorn.Config(
+        server.create_http_app(max_sessions=2), host="127.0.0.1", port=port,
+        log_level="warning", log_config=None
+    )
+    uvicorn_server = uvicorn.Server(config)
+    task = asyncio.create_task(uvicorn_server.serve())
+    while not uvicorn_server.started:
+        await asyncio.sleep(0.01)
+    yield f"http://127.0.0.1:{port}/mcp"
+    uvicorn_server.should_exit = True
+    await task
+
+class TestHttpTransport:
+    """Streamable HTTP transport test sınıfı"""
+
+    @pytest.mark.asyncio
+    async def test_list_tools_and_session_isolation(self, http_server):
+        """Yerel istemci tool listesini alır, başka istemcinin session'ına erişemez"""
+        async with streamable_http_client(http_server) as (read, write, get_session_id):
+            async with ClientSession(read, write) as client:
+                await client.initialize()
+                tools = await client.list_tools()
+                assert "quick_search" in {tool.name for tool in tools.tools}
+
+                session_ownership.claim("session_owned_by_other", "other-client")
+                session_ownership.claim("session_mine", get_session_id())
+
+                denied = await client.call_tool("get_full_results", {"session_id": "session_owned_by_other"})
+                assert "bu istemciye ait değil" in denied.content[0].text
+
+                allowed = await client.call_tool("get_full_results", {"session_id": "session_mine"})
+                assert "bu istemciye ait değil" not in allowed.content[0].text
+
+                # Açık listeyle dışa aktarma da başkasının session'ını vermez
+                exported = await client.call_tool(
+                    "export_sessions", {"session_ids": ["session_mine", "session_owned_by_other"]}
+                )
+                assert "session_owned_by_other bu istemciye ait değil" in exported.content[0].text
+
+    @pytest.mark.asyncio
+    async def test_concurrent_clients_and_session_limit(self, http_server):
+        """İki istemci aynı anda çalışır, üçüncüsü session sınırına takılır"""
+        async def connect_and_hold(ready: asyncio.Event, release: asyncio.Event):
+            async with streamable_http_client(http_server) as (read, write, _):
+                async with ClientSession(read, write) as client:
+                    await client.initialize()
+                    result = await client.call_tool("resolve_fields", {"field_id": 99999})
+                    ready.set()
+                    await release.wait()
+                    return json.loads(result.content[0].text)
+
+        release = asyncio.Event()
+        ready = [asyncio.Event(), asyncio.Event()]
+        holders = [asyncio.create_task(connect_and_hold(event, release)) for event in ready]
+        await asyncio.wait_for(asyncio.gather(*(event.wait() for event in ready)), 10)
+
+        async with httpx.AsyncClient() as http:
+            response = await http.post(
+                http_server,
+                headers={"Accept": "application/json, text/event-stream", "Content-Type": "application/json"},
+                json={
+                    "jsonrpc": "2.0", "id": 1, "method": "initialize",
+                    "params": {"protocolVersion": "2025-06-18", "capabilities": {},
+                               "clientInfo": {"name": "third", "version": "1.0"}}
+                }
+            )
+        assert response.status_code == 503
+
+        release.set()
+        results = await asyncio.gather(*holders)
+        assert all(result["status"] == "failed" for result in results)
+
+    @pytest.mark.asyncio
+    async def test_session_resource_subscription(self, http_server, tmp_path, monkeypatch):
+        """Abone istemci yeni profiller yazılınca resources/updated alır ve resource'u okur"""
+        file_manager = FileManager(base_path=str(tmp_path))
+        file_manager.add_save_listener(server.handle_session_saved)
+        monkeypatch.setattr(server, "_file_manager", file_manager)
+        uri = "yok://sessions/session_resource_test/profiles"
+        updated = asyncio.Event()
+
+        async def on_message(message):
+            if getattr(getattr(message, "root", None), "method", None) == "notifications/resources/updated":
+                updated.set()
+
+        async with streamable_http_client(http_server) as (read, write, _):
+            async with ClientSession(read, write, message_handler=on_message) as client:
+                init = await client.initialize()
+                assert init.capabilities.resources.subscribe is True
+                await file_manager.save_profiles("session_resource_test", [])
+                await client.subscribe_resource(uri)
+
+                await file_manager.save_profiles("session_resource_test", [{"id": 1, "name": "Ayşe"}])
+                await asyncio.wait_for(updated.wait(), 5)
+
+                listed = await client.list_resources()
+                assert uri in {str(resource.uri) for resource in listed.resources}
+                content = await client.read_resource(uri)
+                data = json.loads(content.contents[0].text)
+                assert data["profiles"] == [{"id": 1, "name": "Ayşe"}]
+                assert data["completed"] is False
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import logging
+import pytest
+from src.utils.logging_setup import (
+    HOT, HotLogSampler, ContextFilter, JsonFormatter, set_log_context, setup_logging, shutdown_logging
+)
+
+def _record(msg="mesaj", level=logging.INFO, lineno=10, **extra):
+    record = logging.LogRecord("yok.test", level, "scraper.py", lineno, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+class TestLoggingSetup:
+    """Loglama altyapısı test sınıfı"""
+
+    def test_hot_sampler(self):
+        """HOT kayıtlar burst sonrası atlanır, sayısı sonraki kayda eklenir"""
+        sampler = HotLogSampler(rate=0.0, burst=2)
+        results = [sampler.filter(_record(**HOT)) for _ in range(5)]
+        assert results == [True, True, False, False, False]
+        assert sampler.dropped == 3
+        # İşaretsiz kayıtlar ve uyarılar asla atlanmaz
+        assert sampler.filter(_record(lineno=11))
+        assert sampler.filter(_record(level=logging.WARNING, **HOT))
+
+        sampler.rate = 1e12
+        passed = _record(**HOT)
+        assert sampler.filter(passed)
+        assert passed.suppressed == 3
+
+    @pytest.mark.asyncio
+    async def test_context_is_per_task(self):
+        """session_id/page alanları task'a özeldir"""
+        context_filter = ContextFilter()
+
+        async def scrape(session_id):
+            set_log_context(session_id=session_id)
+            await asyncio.sleep(0)
+            set_log_context(page=2)
+            record = _record()
+            context_filter.filter(record)
+            return record
+
+        first, second = await asyncio.gather(
+            asyncio.create_task(scrape("s1")), asyncio.create_task(scrape("s2"))
+        )
+        assert (first.session_id, first.page) == ("s1", 2)
+        assert second.session_id == "s2"
+
+    def test_json_output_through_queue(self, capsys):
+        """Kuyruk listener'ı JSON satırları yazar"""
+        root = logging.getLogger()
+        previous_level = root.level
+        setup_logging(level="INFO", log_format="json")
+        try:
+            logging.getLogger("yok.test").info("Profil eklendi: %s", "Ayşe", extra={"session_id": "s1", "page": 3})
+        finally:
+            shutdown_logging()
+            root.setLevel(previous_level)
+        line = capsys.readouterr().err.strip().splitlines()[-1]
+        payload = json.loads(line)
+        assert payload["message"] == "Profil eklendi: Ayşe"
+        assert payload["session_id"] == "s1" and payload["page"] == 3
+        assert payload["logger"] == "yok.test"
+
+    def test_json_formatter_exception(self):
+        """Hata bilgisi JSON'a eklenir"""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("yok.test", logging.ERROR, "x.py", 1, "hata", None, __import__("sys").exc_info())
+        payload = json.loads(JsonFormatter().format(record))
+        assert "ValueError: boom" in payload["exc_info"]
+
+    def test_json_exception_through_queue(self, capsys):
+        """Kuyruktan geçen kayıtta traceback mesaja değil exc_info alanına yazılır"""
+        root = logging.getLogger()
+        previous_level = root.level
+        setup_logging(level="INFO", log_format="json")
+        try:
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logging.getLogger("yok.test").exception("Scraping hatası: %s", "x")
+        finally:
+            shutdown_logging()
+            root.setLevel(previous_level)
+        payload = json.loads(capsys.readouterr().err.strip().splitlines()[-1])
+        assert payload["message"] == "Scraping hatası: x"
+        assert "ValueError: boom" in payload["exc_info"]
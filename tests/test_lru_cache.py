@@ -0,0 +1,82 @@
+import asyncio
+import json
+import pytest
+from src.utils.lru_cache import ByteLRUCache
+from src.utils.stream_manager import StreamManager
+
+class TestByteLRUCache:
+    """ByteLRUCache test sınıfı"""
+
+    def test_evicts_least_recently_used(self):
+        """Byte sınırı aşılınca en eski girdi atılır"""
+        cache = ByteLRUCache(max_bytes=100)
+        cache.put("a", 1, 40)
+        cache.put("b", 2, 40)
+        assert cache.get("a") == 1  # a artık en yeni
+        cache.put("c", 3, 40)
+        assert "b" not in cache
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        stats = cache.stats()
+        assert stats["bytes"] == 80
+        assert stats["evictions"] == 1
+
+    def test_oversized_and_replace(self):
+        """Sınırdan büyük girdi alınmaz, güncelleme boyutu düzeltir"""
+        cache = ByteLRUCache(max_bytes=100)
+        cache.put("a", 1, 60)
+        cache.put("a", 2, 30)
+        assert cache.current_bytes == 30
+        cache.put("big", 3, 101)
+        assert "big" not in cache
+        assert cache.pop("a") == 2
+        assert cache.current_bytes == 0
+
+class TestStreamManagerCache:
+    """StreamManager dosya önbelleği test sınıfı"""
+
+    @pytest.mark.asyncio
+    async def test_load_file_detects_changes_and_evicts(self, tmp_path):
+        """Değişiklik hash ile algılanır, stream durunca girdiler atılır"""
+        manager = StreamManager()
+        path = tmp_path / "main_profile.json"
+        path.write_text(json.dumps({"profiles": [1]}), encoding="utf-8")
+
+        data, changed = await manager._load_file("s1", "main", path)
+        assert changed and data == {"profiles": [1]}
+        _, changed = await manager._load_file("s1", "main", path)
+        assert not changed
+
+        # Aynı içerik yeniden yazılırsa değişiklik sayılmaz
+        path.write_text(json.dumps({"profiles": [1]}), encoding="utf-8")
+        _, changed = await manager._load_file("s1", "main", path)
+        assert not changed
+
+        path.write_text(json.dumps({"profiles": [1, 2]}), encoding="utf-8")
+        data, changed = await manager._load_file("s1", "main", path)
+        assert changed and data["profiles"] == [1, 2]
+        # Boyut dosya byte'ı değil, ayrıştırılmış verinin bellek boyutudur
+        assert manager._cache_sizes()["s1"] > path.stat().st_size
+
+        manager.evict_session("s1")
+        assert manager.cache_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_stops_and_evicts_on_completed(self, tmp_path, monkeypatch):
+        """main_profile.json completed olunca stream kapanır ve önbellek boşalır"""
+        monkeypatch.chdir(tmp_path)
+        session_dir = tmp_path / "data" / "sessions" / "s1"
+        session_dir.mkdir(parents=True)
+        (session_dir / "main_profile.json").write_text(
+            json.dumps({"profiles": [{"id": 1}], "completed": True}), encoding="utf-8"
+        )
+        manager = StreamManager()
+        updates = []
+
+        async def callback(message):
+            updates.append(message["type"])
+
+        await manager.start_streaming("s1", callback)
+        await asyncio.wait_for(manager.active_streams["s1"], timeout=5)
+        assert updates == ["status", "profiles", "completed"]
+        assert "s1" not in manager.active_streams
+        assert manager.cache_stats()["entries"] == 0
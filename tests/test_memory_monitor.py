@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+import time
+import pytest
+from unittest.mock import Mock
+from src.utils.memory_monitor import MemoryMonitor, process_tree_pids, process_tree_rss, estimate_size
+from src.utils.selenium_manager import SeleniumManager
+
+def _fake_driver(pid):
+    driver = Mock()
+    driver.service.process.pid = pid
+    return driver
+
+class TestMemoryMonitor:
+    """MemoryMonitor test sınıfı"""
+
+    @pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="/proc gerekli")
+    def test_process_tree_rss(self):
+        """Alt süreçler ağaç RSS'ine dahil edilir"""
+        parent = subprocess.Popen([
+            sys.executable, "-c",
+            "import subprocess, time; subprocess.Popen(['sleep', '5']); time.sleep(5)"
+        ])
+        try:
+            for _ in range(50):
+                if len(process_tree_pids(parent.pid)) > 1:
+                    break
+                time.sleep(0.05)
+            assert len(process_tree_pids(parent.pid)) >= 2
+            assert process_tree_rss(parent.pid) > 0
+        finally:
+            parent.kill()
+            parent.wait()
+
+    def test_estimate_size(self):
+        """Derin boyut tahmini iç içe yapıları sayar"""
+        small = [{"name": "a"}]
+        large = [{"name": "a" * 10000}]
+        assert estimate_size(large) > estimate_size(small) + 9000
+
+    def test_session_attribution(self):
+        """Driver ve kaynaklar session'a göre raporlanır"""
+        monitor = MemoryMonitor()
+        driver = _fake_driver(os.getpid())
+        monitor.register_driver(driver, "session_a", "collaborators")
+        monitor.register_session_source("stream_cache", lambda: {"session_a": 2048, "session_b": 1024})
+
+        report = monitor.report(top=3)
+        assert report["drivers"][0]["session_id"] == "session_a"
+        assert report["sessions"]["session_a"]["stream_cache_kb"] == 2.0
+        assert report["sessions"]["session_b"] == {"stream_cache_kb": 1.0}
+        if os.path.exists("/proc/self/statm"):
+            assert report["sessions"]["session_a"]["chrome_rss_mb"] > 0
+
+        monitor.unregister_driver(driver)
+        assert monitor.report()["drivers"] == []
+
+    @pytest.mark.asyncio
+    async def test_recycle_if_needed(self, monkeypatch):
+        """RSS eşiği aşılınca driver yenilenir ve eskisi kapatılır"""
+        from src.utils import selenium_manager as selenium_module
+        monitor = MemoryMonitor()
+        monitor.max_driver_rss = 1
+        monkeypatch.setattr(selenium_module, "memory_monitor", monitor)
+
+        manager = SeleniumManager()
+        old_driver, new_driver = _fake_driver(os.getpid()), _fake_driver(os.getpid())
+        manager._create_driver = Mock(side_effect=[old_driver, new_driver])
+
+        driver = await manager.get_driver(session_id="session_a", operation="collaborators")
+        driver = await manager.recycle_if_needed(driver)
+        assert driver is new_driver
+        old_driver.quit.assert_called_once()
+        assert monitor.driver_info(new_driver)["session_id"] == "session_a"
+
+        # Aynı driver'ı tekrar kapatmak quit'i yeniden çağırmaz
+        await manager.close_driver(old_driver)
+        old_driver.quit.assert_called_once()
@@ -0,0 +1,43 @@
+import pytest
+from src.utils.metrics import MetricsRegistry, Histogram
+
+class TestMetrics:
+    """MetricsRegistry test sınıfı"""
+
+    def test_histogram_quantiles(self):
+        """Histogram yüzdelik testi"""
+        histogram = Histogram(buckets=(0.1, 1.0, 10.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 4
+        assert snapshot["p50"] == 1.0
+        assert snapshot["p95"] == 10.0
+        assert snapshot["max"] == 5.0
+
+    def test_span_records_duration_and_errors(self):
+        """Span süre ve hata kaydı testi"""
+        registry = MetricsRegistry()
+        with registry.span("navigate", operation="profile_search"):
+            pass
+        with pytest.raises(RuntimeError):
+            with registry.span("navigate", operation="profile_search"):
+                raise RuntimeError("boom")
+
+        snapshot = registry.snapshot()
+        series = snapshot["histograms"]["stage_duration_seconds"]
+        assert series[0]["labels"] == {"operation": "profile_search", "stage": "navigate"}
+        assert series[0]["count"] == 2
+        assert snapshot["counters"]["stage_errors_total"][0]["value"] == 1
+
+    def test_render_prometheus(self):
+        """Prometheus text formatı testi"""
+        registry = MetricsRegistry(buckets=(1.0,))
+        registry.observe("stage_duration_seconds", 0.5, stage="save_profiles")
+        registry.register_gauge("cache_bytes", lambda: {"file_cache": 42})
+        text = registry.render_prometheus()
+        assert '# TYPE yok_stage_duration_seconds histogram' in text
+        assert 'yok_stage_duration_seconds_bucket{stage="save_profiles",le="1.0"} 1' in text
+        assert 'yok_stage_duration_seconds_bucket{stage="save_profiles",le="+Inf"} 1' in text
+        assert 'yok_stage_duration_seconds_count{stage="save_profiles"} 1' in text
+        assert 'yok_cache_bytes{name="file_cache"} 42' in text
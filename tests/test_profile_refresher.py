@@ -0,0 +1,125 @@
+"""
+Artımlı profil yenileme testleri
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from src.tools.profile_refresher import ProfileRefreshTool
+from src.utils.file_manager import FileManager
+
+PROFILE_PAGE = (Path(__file__).parent / "fixtures" / "profile_page.html").read_text(encoding="utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    pages = {}
+    requests = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        page = self.pages.get(self.path)
+        if page is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = f'"{hash(page)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def profile_server():
+    _Handler.pages = {
+        "/a": PROFILE_PAGE,
+        "/b": PROFILE_PAGE.replace("MEHMET DEMİR", "AYŞE KAYA"),
+        "/maintenance": "<html><body>Bakım çalışması</body></html>",
+    }
+    _Handler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestProfileRefreshTool:
+    @pytest.mark.asyncio
+    async def test_refresh_updates_only_changed_profiles(self, tmp_path, profile_server):
+        file_manager = FileManager(base_path=str(tmp_path))
+        profiles = [
+            {"id": 1, "name": "MEHMET DEMİR", "url": f"{profile_server}/a"},
+            {"id": 2, "name": "AYŞE KAYA", "url": f"{profile_server}/b"},
+            {"id": 3, "name": "SİLİNMİŞ", "url": f"{profile_server}/gone"},
+        ]
+        await file_manager.save_completed_profiles("s1", {"profiles": profiles, "completed": True})
+        await file_manager.mark_session_complete("s1", "main")
+        refresher = ProfileRefreshTool(file_manager=file_manager, concurrency=2, interval=0)
+
+        first = await refresher.refresh_session("s1", wait=True)
+        assert first["status"] == "completed"
+        assert first["counts"] == {"baselined": 2, "deleted": 1}
+
+        # Sadece b değişti; a koşullu istekle 304 döner, silinmiş profil değişmez
+        _Handler.pages["/b"] = _Handler.pages["/b"].replace("Topoloji ; Cebir", "Topoloji ; Analiz")
+        second = await refresher.refresh_session("s1", wait=True)
+        assert second["counts"] == {"not_modified": 1, "changed": 1, "unchanged": 1}
+
+        saved = (await file_manager.load_session_data("s1", "profiles"))["profiles"]
+        assert saved[0]["title"] == "DOKTOR ÖĞRETİM ÜYESİ"
+        assert "changed_at" not in saved[0]
+        assert saved[1]["keywords"] == "Topoloji ; Analiz"
+        assert saved[1]["changed_fields"] == ["keywords"]
+        assert saved[1]["changed_at"]
+        assert saved[2]["deleted"] is True
+
+    @pytest.mark.asyncio
+    async def test_unparseable_page_is_failed_not_deleted(self, tmp_path, profile_server):
+        file_manager = FileManager(base_path=str(tmp_path))
+        profiles = [{"id": 1, "name": "MEHMET DEMİR", "url": f"{profile_server}/maintenance", "content_hash": "x"}]
+        await file_manager.save_completed_profiles("s1", {"profiles": profiles, "completed": True})
+        await file_manager.mark_session_complete("s1", "main")
+        refresher = ProfileRefreshTool(file_manager=file_manager, interval=0)
+
+        result = await refresher.refresh_session("s1", wait=True)
+        assert result["counts"] == {"failed": 1}
+        saved = (await file_manager.load_session_data("s1", "profiles"))["profiles"][0]
+        assert "deleted" not in saved
+        assert "changed_at" not in saved
+        # ETag saklanmaz: sonraki yenileme 304 ile atlanmaz
+        assert "etag" not in saved
+
+    @pytest.mark.asyncio
+    async def test_requests_are_spaced(self, tmp_path, profile_server):
+        file_manager = FileManager(base_path=str(tmp_path))
+        profiles = [{"id": i, "url": f"{profile_server}/a"} for i in range(3)]
+        await file_manager.save_completed_profiles("s1", {"profiles": profiles, "completed": True})
+        await file_manager.mark_session_complete("s1", "main")
+        refresher = ProfileRefreshTool(file_manager=file_manager, concurrency=3, interval=0.1)
+
+        started = time.monotonic()
+        await refresher.refresh_session("s1", wait=True)
+        assert time.monotonic() - started >= 0.2
+
+    @pytest.mark.asyncio
+    async def test_incomplete_session_is_rejected(self, tmp_path):
+        file_manager = FileManager(base_path=str(tmp_path))
+        await file_manager.save_profiles("s1", [{"id": 1, "url": "http://127.0.0.1:9/x"}])
+        result = await ProfileRefreshTool(file_manager=file_manager).refresh_session("s1")
+        assert result["status"] == "failed"
@@ -0,0 +1,64 @@
+import json
+import pstats
+import time
+from src.utils.profiling import resolve_profile_mode, profile_session, SamplingProfiler, SessionProfiler
+
+def _busy(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+class TestProfiling:
+    """Session profiler test sınıfı"""
+
+    def test_resolve_profile_mode(self, monkeypatch):
+        """Argüman ve ortam değişkeni çözümleme testi"""
+        monkeypatch.delenv("YOK_PROFILE_MODE", raising=False)
+        assert resolve_profile_mode(None) is None
+        assert resolve_profile_mode("Sampling") == "sampling"
+        assert resolve_profile_mode("flamegraph") is None
+        monkeypatch.setenv("YOK_PROFILE_MODE", "cprofile")
+        assert resolve_profile_mode(None) == "cprofile"
+        assert resolve_profile_mode("off") is None
+
+    def test_sampling_writes_speedscope(self, tmp_path):
+        """Örnekleme profili speedscope JSON yazar"""
+        with profile_session("sampling", tmp_path, "profile_search") as profiler:
+            _busy(0.1)
+        data = json.loads(profiler.output_path.read_text(encoding="utf-8"))
+        assert profiler.output_path.name.endswith(".speedscope.json")
+        profile = data["profiles"][0]
+        assert profile["type"] == "sampled"
+        assert len(profile["samples"]) == len(profile["weights"]) > 0
+        names = {frame["name"] for frame in data["shared"]["frames"]}
+        assert "_busy" in names
+
+    def test_sampling_aggregates_identical_stacks(self):
+        """Aynı yığın tekrar eklenmez, süresi toplanır"""
+        profiler = SamplingProfiler()
+        for _ in range(50):
+            profiler._sample(0.01)
+        profile = profiler.to_speedscope("test")["profiles"][0]
+        assert profiler.sample_count == 50
+        assert len(profile["samples"]) == 1
+        assert profile["weights"] == [0.5]
+
+    def test_cprofile_writes_pstats_and_is_exclusive(self, tmp_path):
+        """cProfile .pstats yazar ve aynı anda tek oturum açılır"""
+        with profile_session("cprofile", tmp_path, "collaborators") as profiler:
+            second = SessionProfiler("cprofile", tmp_path, "other")
+            assert second.start() is False
+            _busy(0.01)
+        stats = pstats.Stats(str(profiler.output_path))
+        assert any(func[2] == "_busy" for func in stats.stats)
+        # Kilit bırakıldıktan sonra yeni oturum açılabilir
+        third = SessionProfiler("cprofile", tmp_path, "again")
+        assert third.start() is True
+        assert third.stop().exists()
+
+    def test_disabled_is_noop(self, tmp_path):
+        """Mod yoksa dosya yazılmaz"""
+        with profile_session(None, tmp_path, "profile_search") as profiler:
+            pass
+        assert profiler is None
+        assert list(tmp_path.iterdir()) == []
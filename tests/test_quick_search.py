@@ -0,0 +1,107 @@
+"""
+quick_search erken dönüş testleri
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+
+from src.tools import profile_scraper as profile_module
+from src.utils.file_manager import FileManager
+from src.utils.selenium_manager import NetworkRequest, NetworkResponse
+from tests.conftest import FakeElement, FakeSeleniumManager
+
+SEARCH_PAGE = (Path(__file__).parent / "fixtures" / "search_results.html").read_text(encoding="utf-8")
+SEARCH_URL = "https://akademik.yok.gov.tr/AkademikArama/AkademisyenArama"
+
+
+class _StaleRow(FakeElement):
+    """Sayfa değişince bayatlayan sonuç satırı"""
+
+    def is_enabled(self):
+        raise StaleElementReferenceException()
+
+
+class _NextLink(FakeElement):
+    def __init__(self, manager):
+        self.manager = manager
+
+    def click(self):
+        self.manager.page += 1
+
+
+class _SearchSeleniumManager(FakeSeleniumManager):
+    """Her sayfada fixture'daki iki satırı (sayfaya özgü URL'lerle) ağ yanıtı olarak verir
+
+    Son sayfadan sonra sayfalama ya bitmiş görünür ya da (block) takılır.
+    """
+
+    def __init__(self, pages, block):
+        super().__init__()
+        self.pages = pages
+        self.block = block
+        self.page = 0
+
+    def get_network_requests(self, driver, url_filter=None):
+        if self.page >= self.pages:
+            return []
+        body = SEARCH_PAGE.replace("authorInfo_100", f"authorInfo_{self.page + 1}00").replace(
+            "sira=100", f"sira={self.page + 1}00"
+        )
+        return [NetworkRequest(str(self.page), f"{SEARCH_URL}?page={self.page + 1}",
+                               response=NetworkResponse(200, mime_type="text/html", body=body))]
+
+    def clear_network_requests(self, driver):
+        pass
+
+    async def wait_for_element(self, driver, by, value, timeout=2):
+        if value == "aramaTerim":
+            return FakeElement()
+        if self.page + 1 < self.pages:
+            return _NextLink(self) if "pagination" in value else _StaleRow()
+        if self.block:
+            await asyncio.sleep(60)
+        return None
+
+
+def _make_scraper(tmp_path, pages, block=True):
+    """Gerçek _scrape_profiles'ı sayfa başına iki profille çalıştırır; block ise son sayfadan sonra takılır"""
+    scraper = profile_module.ProfileScraperTool(
+        selenium_manager=_SearchSeleniumManager(pages, block), file_manager=FileManager(base_path=str(tmp_path))
+    )
+    scraper.tab_delay = 0
+    return scraper
+
+
+class TestQuickSearch:
+    @pytest.mark.asyncio
+    async def test_returns_when_min_profiles_arrive(self, tmp_path):
+        scraper = _make_scraper(tmp_path, pages=2)
+        started = time.monotonic()
+        result = await scraper.quick_search_profiles("ayşe", min_profiles=3, timeout=5, owner="c1")
+        assert time.monotonic() - started < 2
+        assert profile_module.session_ownership.owner(result["session_id"]) == "c1"
+        assert result["success"] is True
+        assert result["preview_count"] == 3
+        assert result["completed"] is False
+        assert scraper._result_waiters == {}
+        profile_module.session_tasks.cancel(result["session_id"])
+
+    @pytest.mark.asyncio
+    async def test_returns_when_scrape_completes_early(self, tmp_path):
+        scraper = _make_scraper(tmp_path, pages=1, block=False)
+        result = await scraper.quick_search_profiles("ayşe", min_profiles=10, timeout=5)
+        assert result["success"] is True
+        assert result["total_found"] == 2
+        assert result["completed"] is True
+
+    @pytest.mark.asyncio
+    async def test_timeout_without_profiles(self, tmp_path):
+        scraper = _make_scraper(tmp_path, pages=0)
+        result = await scraper.quick_search_profiles("ayşe", timeout=0.05)
+        assert result["success"] is False
+        assert result["session_id"]
+        profile_module.session_tasks.cancel(result["session_id"])
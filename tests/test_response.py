@@ -0,0 +1,53 @@
+"""
+Response yardımcıları testleri
+"""
+
+import json
+
+from src.utils.response import dumps, select_fields, shape_response
+
+
+def _profiles(count):
+    return [
+        {"id": i, "name": f"Prof. Dr. Ayşe {i}", "email": f"a{i}@uni.edu.tr", "info": "Ayşe\nProfesör\nÜniversite " * 5}
+        for i in range(count)
+    ]
+
+
+class TestResponse:
+    def test_dumps_is_compact_and_keeps_unicode(self):
+        text = dumps({"name": "Şule Öztürk", "items": [1, 2]})
+        assert "\n" not in text
+        assert "Şule Öztürk" in text
+        assert json.loads(text) == {"name": "Şule Öztürk", "items": [1, 2]}
+
+    def test_info_dropped_by_default(self):
+        records = select_fields(_profiles(2))
+        assert all("info" not in record for record in records)
+        assert records[0]["name"] == "Prof. Dr. Ayşe 0"
+
+    def test_fields_selector(self):
+        records = select_fields(_profiles(2), ["name", "missing"])
+        assert records == [{"name": "Prof. Dr. Ayşe 0"}, {"name": "Prof. Dr. Ayşe 1"}]
+
+    def test_small_response_untouched(self):
+        result = shape_response({"success": True, "profiles": _profiles(3)}, max_bytes=100_000)
+        assert len(result["profiles"]) == 3
+        assert "truncated" not in result
+
+    def test_truncation_with_cursor(self):
+        result = shape_response({"success": True, "profiles": _profiles(200)}, offset=50, max_bytes=2000)
+        assert result["truncated"] is True
+        assert 0 < result["returned_count"] < 200
+        assert result["next_cursor"] == 50 + result["returned_count"]
+        assert len(dumps(result).encode("utf-8")) <= 2000
+        assert result["profiles"][0]["id"] == 0
+
+    def test_truncation_always_makes_progress(self):
+        result = shape_response({"collaborators": [{"name": "x" * 500}]}, max_bytes=100)
+        assert result["returned_count"] == 1
+        assert result["next_cursor"] == 1
+
+    def test_non_record_results_pass_through(self):
+        result = {"histograms": {"a": 1}}
+        assert shape_response(result, max_bytes=1) == result
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from src.utils.selenium_manager import DriverPool, SeleniumManager
+
+def _log(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+class TestNetworkCapture:
+    """CDP performance log tabanlı network yakalama test sınıfı"""
+
+    def test_get_network_requests(self):
+        """Yanıt ve gövde yakalama testi"""
+        driver = Mock()
+        driver.get_log.side_effect = [[
+            _log("Network.requestWillBeSent", requestId="1", type="Document",
+                 request={"url": "https://akademik.yok.gov.tr/AkademikArama/Ara", "method": "GET"}),
+            _log("Network.responseReceived", requestId="1",
+                 response={"status": 200, "headers": {}, "mimeType": "text/html"}),
+            _log("Network.loadingFinished", requestId="1", encodedDataLength=512),
+            _log("Network.requestWillBeSent", requestId="2", type="Image",
+                 request={"url": "https://akademik.yok.gov.tr/logo.png", "method": "GET"}),
+        ], []]
+        driver.execute_cdp_cmd.return_value = {"body": "<tr id='authorInfo_1'></tr>", "base64Encoded": False}
+
+        manager = SeleniumManager()
+        requests = manager.get_network_requests(driver, "AkademikArama")
+        assert len(requests) == 1
+        assert requests[0].response.status_code == 200
+        assert requests[0].response.body == "<tr id='authorInfo_1'></tr>"
+        assert requests[0].encoded_length == 512
+
+        # Gövde bir kez okunur, sonraki çağrılarda tekrar istenmez
+        assert manager.get_network_requests(driver, "AkademikArama")[0].request_id == "1"
+        driver.execute_cdp_cmd.assert_called_once()
+
+    def test_clear_network_requests(self):
+        """Temizleme testi"""
+        driver = Mock()
+        driver.get_log.return_value = []
+        manager = SeleniumManager()
+        manager._get_network_store(driver)["1"] = Mock()
+        manager.clear_network_requests(driver)
+        assert manager.get_network_requests(driver) == []
+
+class TestDriverPool:
+    """Önceden hazırlanan driver havuzu test sınıfı"""
+
+    @pytest.mark.asyncio
+    async def test_prewarm_and_reuse(self):
+        """Hazır driver ilk get_driver çağrısında kullanılır"""
+        manager = SeleniumManager(pool=DriverPool(max_idle=2))
+        warm, fresh, spare = Mock(), Mock(), Mock()
+        manager._create_driver = Mock(side_effect=[warm, fresh, spare])
+
+        await manager.prewarm(1)
+        assert await manager.get_driver() is warm
+        assert await manager.get_driver() is fresh
+
+        await manager.prewarm(1)
+        await manager.shutdown()
+        spare.quit.assert_called_once()
+        assert len(manager.pool) == 0
+
+    @pytest.mark.asyncio
+    async def test_closed_driver_is_shared_between_managers(self):
+        """Bir aracın bıraktığı driver diğer aracın get_driver'ında kullanılır"""
+        pool = DriverPool(max_idle=1)
+        search = SeleniumManager(block_preset="search-minimal", pool=pool)
+        graph = SeleniumManager(block_preset="graph", pool=pool)
+        first, second = Mock(), Mock()
+        search._create_driver = Mock(side_effect=[first, second])
+        graph._create_driver = Mock(side_effect=AssertionError("havuz kullanılmadı"))
+
+        driver = await search.get_driver()
+        await search.close_driver(driver)
+        first.quit.assert_not_called()
+        first.delete_all_cookies.assert_called_once()
+
+        assert await graph.get_driver() is first
+        first.execute_cdp_cmd.assert_called_with("Network.setBlockedURLs", {"urls": graph.get_blocked_urls()})
+        assert pool.stats["reused"] == 1
+
+        # Havuz doluyken bırakılan driver kapatılır
+        other = await search.get_driver()
+        await graph.close_driver(first)
+        await search.close_driver(other)
+        other.quit.assert_called_once()
+        await graph.shutdown()
+        first.quit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_cancellable_and_busy_driver_is_not_pooled(self):
+        """Thread'de süren çağrı event loop'u bloklamaz; iptal edilen çağrının driver'ı havuza dönmez"""
+        manager = SeleniumManager(pool=DriverPool(max_idle=1))
+        manager._create_driver = Mock(side_effect=[Mock(), Mock()])
+        driver = await manager.get_driver()
+        release = threading.Event()
+
+        call = asyncio.create_task(manager.run(driver, release.wait, 5))
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        assert time.monotonic() - started < 0.5
+
+        await manager.close_driver(driver)
+        driver.quit.assert_called_once()
+        assert len(manager.pool) == 0
+        release.set()
+
+        # Çağrısı bitmiş driver havuza döner
+        other = await manager.get_driver()
+        assert await manager.run(other, lambda: "ok") == "ok"
+        await manager.close_driver(other)
+        assert len(manager.pool) == 1
+
+    @pytest.mark.asyncio
+    async def test_pooled_drivers_stay_in_memory_accounting(self, monkeypatch):
+        """Havuzdaki driver'lar "idle" olarak kayıtlı kalır, kapasiteye sayılmaz"""
+        from src.utils import selenium_manager as selenium_module
+        from src.utils.memory_monitor import MemoryMonitor
+        monitor = MemoryMonitor()
+        monkeypatch.setattr(selenium_module, "memory_monitor", monitor)
+        manager = SeleniumManager(pool=DriverPool(max_idle=2))
+        warm, fresh = Mock(), Mock()
+        manager._create_driver = Mock(side_effect=[warm, fresh])
+
+        await manager.prewarm(1)
+        assert monitor.driver_info(warm)["operation"] == "idle"
+        assert monitor.driver_count() == 0
+
+        driver = await manager.get_driver(session_id="s1", operation="profile_search")
+        assert monitor.driver_info(driver)["session_id"] == "s1"
+        assert monitor.driver_count() == 1
+
+        await manager.close_driver(driver)
+        info = monitor.driver_info(driver)
+        assert (info["session_id"], info["operation"]) == (None, "idle")
+        assert monitor.driver_count("idle") == 1
+
+        await manager.shutdown()
+        assert monitor.driver_info(warm) is None
+        assert monitor.driver_count("idle") == 0
+
+class TestBlockPresets:
+    """Engelleme profili ortam değişkenleri test sınıfı"""
+
+    def test_search_override_does_not_touch_graph(self, monkeypatch):
+        monkeypatch.setenv("YOK_BLOCK_PRESET", "none")
+        assert SeleniumManager(block_preset="search-minimal").block_preset == "none"
+        assert SeleniumManager(block_preset="graph").block_preset == "graph"
+
+        monkeypatch.setenv("YOK_GRAPH_BLOCK_PRESET", "none")
+        assert SeleniumManager(block_preset="graph").block_preset == "none"
@@ -0,0 +1,23 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+class TestServerStartup:
+    """Server açılış test sınıfı"""
+
+    def test_import_is_lazy(self):
+        """server importu Selenium'u yüklemez ve tool oluşturmaz"""
+        snippet = (
+            "import json, sys, server; "
+            "print(json.dumps({'selenium': 'selenium' in sys.modules, "
+            "'tool': server._profile_scraper is not None}))"
+        )
+        env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+        output = subprocess.run(
+            [sys.executable, "-c", snippet], env=env, capture_output=True, text=True, check=True
+        ).stdout
+        assert json.loads(output.strip().splitlines()[-1]) == {"selenium": False, "tool": False}
@@ -0,0 +1,98 @@
+"""
+Benzerlik indeksi testleri
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from src.utils.similarity import SimilarityIndex, profile_terms
+
+
+def _save(sessions_path, session_id, profiles):
+    session_dir = sessions_path / session_id
+    session_dir.mkdir(parents=True, exist_ok=True)
+    (session_dir / "main_profile.json").write_text(json.dumps({"profiles": profiles}), encoding="utf-8")
+
+
+def _profile(profile_id, keywords, blue_label="Bilgisayar Bilimleri", url=None):
+    return {
+        "id": profile_id, "name": f"Akademisyen {profile_id}", "header": "ODTÜ/MÜHENDİSLİK",
+        "green_label": "Mühendislik Temel Alanı", "blue_label": blue_label,
+        "keywords": keywords, "url": url or f"https://akademik.yok.gov.tr/{profile_id}",
+    }
+
+
+class TestSimilarityIndex:
+    def test_profile_terms_normalize_turkish(self):
+        terms = profile_terms({"keywords": "Makine Öğrenmesi ; Yapay Zeka", "green_label": "MÜHENDİSLİK"})
+        assert "k:makine ogrenmesi" in terms
+        assert "w:ogrenmesi" in terms
+        assert "g:muhendislik" in terms
+
+    def test_top_k_ranking(self, tmp_path):
+        _save(tmp_path, "session_a", [
+            _profile(1, "makine öğrenmesi ; derin öğrenme ; bilgisayarlı görü"),
+            _profile(2, "derin öğrenme ; bilgisayarlı görü ; görüntü işleme"),
+            _profile(3, "osmanlı tarihi ; arşivcilik", blue_label="Tarih"),
+            _profile(4, "makine öğrenmesi ; doğal dil işleme"),
+        ])
+        index = SimilarityIndex(tmp_path)
+
+        query, similar = index.similar("session_a", profile_id=1, top_k=2)
+
+        assert query["id"] == 1
+        assert [profile["id"] for profile in similar] == [2, 4]
+        assert similar[0]["score"] >= similar[1]["score"] > 0
+
+        _, by_keywords = index.similar(keywords="osmanlı tarihi", top_k=1)
+        assert by_keywords[0]["id"] == 3
+
+    def test_incremental_update_and_session_filter(self, tmp_path):
+        _save(tmp_path, "session_a", [_profile(1, "kuantum hesaplama ; kriptografi")])
+        index = SimilarityIndex(tmp_path)
+        assert index.similar("session_a", profile_id=1)[1] == []
+
+        _save(tmp_path, "session_b", [_profile(7, "kriptografi ; ağ güvenliği")])
+        index.mark_dirty("session_b")
+        _, similar = index.similar("session_a", profile_id=1)
+        assert [profile["id"] for profile in similar] == [7]
+        assert index.stats()["sessions"] == 2
+
+        _, filtered = index.similar("session_a", profile_id=1, session_filter=lambda session_id: session_id == "session_a")
+        assert filtered == []
+
+    def test_same_url_is_deduplicated_across_sessions(self, tmp_path):
+        _save(tmp_path, "session_a", [_profile(1, "kriptografi", url="https://x/1")])
+        _save(tmp_path, "session_b", [_profile(5, "kriptografi", url="https://x/1")])
+        index = SimilarityIndex(tmp_path)
+        index.refresh()
+        assert index.stats()["profiles"] == 1
+        assert index.similar("session_b", profile_id=5)[0]["session_id"] == "session_b"
+
+    def test_shared_profile_filtered_by_any_allowed_session(self, tmp_path):
+        _save(tmp_path, "session_a", [_profile(1, "kriptografi"), _profile(2, "kriptografi", url="https://x/2")])
+        _save(tmp_path, "session_b", [_profile(9, "kriptografi", url="https://x/2")])
+        index = SimilarityIndex(tmp_path)
+        only_a = lambda session_id: session_id == "session_a"
+
+        # session_b aynı profili sonra kaydetse de session_a sahibi sonucu görür, kendi id'siyle
+        _, similar = index.similar("session_a", profile_id=1, session_filter=only_a)
+        assert [(profile["session_id"], profile["id"]) for profile in similar] == [("session_a", 2)]
+
+        # URL ile sorgu da filtreye tabidir
+        only_c = lambda session_id: session_id == "session_c"
+        assert index.similar(profile_url="https://x/2", session_filter=only_c) == (None, [])
+        query, _ = index.similar(profile_url="https://x/2", session_filter=only_a)
+        assert (query["session_id"], query["id"]) == ("session_a", 2)
+
+        # Silinen session'ın profilleri yalnızca o session'daysa sonuçtan düşer
+        (tmp_path / "session_a" / "main_profile.json").unlink()
+        (tmp_path / "session_a").rmdir()
+        index.mark_dirty("session_a")
+        _, similar = index.similar(profile_url="https://x/2")
+        assert similar == []
+        assert index.similar(profile_url="https://x/2")[0]["session_id"] == "session_b"
@@ -0,0 +1,49 @@
+"""
+Resource subscription testleri
+"""
+
+import asyncio
+
+import pytest
+
+from src.utils.subscriptions import ResourceSubscriptions, parse_session_resource_uri, session_resource_uri
+
+
+class FakeSession:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.updates = []
+
+    async def send_resource_updated(self, uri):
+        if self.fail:
+            raise ConnectionError("kapalı")
+        self.updates.append(uri)
+
+
+class TestSubscriptions:
+    def test_uri_roundtrip(self):
+        uri = session_resource_uri("session_1", "collaborators")
+        assert parse_session_resource_uri(uri) == ("session_1", "collaborators")
+        assert parse_session_resource_uri("yok://taxonomy/fields") is None
+        assert parse_session_resource_uri("yok://sessions/x/other") is None
+
+    @pytest.mark.asyncio
+    async def test_notify_soon_coalesces_and_drops_broken_sessions(self):
+        subscriptions = ResourceSubscriptions()
+        uri = session_resource_uri("session_1", "profiles")
+        good, broken = FakeSession(), FakeSession(fail=True)
+        subscriptions.subscribe(uri, good)
+        subscriptions.subscribe(uri, broken)
+
+        for _ in range(5):
+            subscriptions.notify_soon(uri)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert good.updates == [uri]
+        assert subscriptions.subscribers(uri) == [good]
+
+    def test_notify_without_subscribers_is_noop(self):
+        subscriptions = ResourceSubscriptions()
+        subscriptions.notify_soon(session_resource_uri("session_1", "profiles"))
+        assert not subscriptions._pending
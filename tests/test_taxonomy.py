@@ -0,0 +1,57 @@
+import json
+import os
+import pytest
+from src.utils.taxonomy import FieldTaxonomy, normalize_tr
+
+class TestFieldTaxonomy:
+    """FieldTaxonomy test sınıfı"""
+
+    @pytest.fixture
+    def fields_file(self, tmp_path):
+        path = tmp_path / "fields.json"
+        path.write_text(json.dumps([
+            {"id": 1, "name": "Eğitim Bilimleri Temel Alanı", "specialties": [
+                {"id": 1, "name": "Açık ve Uzaktan Eğitim"},
+                {"id": 2, "name": "İngiliz Dili Eğitimi"}
+            ]},
+            {"id": 2, "name": "Mühendislik Temel Alanı", "specialties": [
+                {"id": 1, "name": "Bilgisayar Mühendisliği"}
+            ]}
+        ]), encoding="utf-8")
+        return path
+
+    def test_normalize_tr(self):
+        """Türkçe normalizasyon testi"""
+        assert normalize_tr("İNGİLİZ  Dili") == "ingiliz dili"
+        assert normalize_tr("IŞIK") == "isik"
+        assert normalize_tr("Mühendislik") == "muhendislik"
+
+    def test_lookups(self, fields_file):
+        """ID ve isim indeksleri testi"""
+        taxonomy = FieldTaxonomy(fields_file)
+        assert taxonomy.get_field_name(2) == "Mühendislik Temel Alanı"
+        assert taxonomy.get_field_name(99) is None
+        assert taxonomy.get_specialty_name(1, 2) == "İngiliz Dili Eğitimi"
+        assert taxonomy.get_specialty_name(2, 2) is None
+        assert taxonomy.find_field_id("MUHENDISLIK TEMEL ALANI") == 2
+        assert taxonomy.find_specialty_ids("ingiliz dili egitimi") == [(1, 2)]
+
+    def test_search(self, fields_file):
+        """Kısmi eşleşme arama testi"""
+        taxonomy = FieldTaxonomy(fields_file)
+        result = taxonomy.search("egitim")
+        assert [f["field_id"] for f in result["fields"]] == [1]
+        assert {s["specialty_id"] for s in result["specialties"]} == {1, 2}
+
+    def test_reload_on_mtime_change(self, fields_file):
+        """Dosya değişince yeniden yükleme testi"""
+        taxonomy = FieldTaxonomy(fields_file, check_interval=0)
+        assert taxonomy.get_field_name(3) is None
+
+        data = json.loads(fields_file.read_text(encoding="utf-8"))
+        data.append({"id": 3, "name": "Sağlık Bilimleri Temel Alanı", "specialties": []})
+        fields_file.write_text(json.dumps(data), encoding="utf-8")
+        stat = fields_file.stat()
+        os.utime(fields_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert taxonomy.get_field_name(3) == "Sağlık Bilimleri Temel Alanı"
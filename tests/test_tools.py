@@ -1,7 +1,12 @@
 import pytest
 import asyncio
+import json
+from pathlib import Path
 from unittest.mock import Mock, AsyncMock
 from src.tools.profile_scraper import ProfileScraperTool
+from src.utils.html_parser import parse_profile_rows
+from src.utils.selenium_manager import NetworkRequest, NetworkResponse
+from tests.conftest import FakeDriver, FakeSeleniumManager
 from src.tools.collaborator_scraper import CollaboratorScraperTool
 from src.models.schemas import SearchRequest, CollaboratorRequest
 
@@ -30,6 +35,24 @@ class TestProfileScraperTool:
         assert "Java" in keywords
         assert "C++" in keywords
 
+    @pytest.mark.asyncio
+    async def test_json_search_response_is_decoded(self, profile_scraper):
+        """JSON içinde kaçışlı gelen satırlar ağ yanıtı yolunda da ayrıştırılır"""
+        html = (Path(__file__).parent / "fixtures" / "search_results.html").read_text(encoding="utf-8")
+        url = "https://akademik.yok.gov.tr/AkademikArama/AkademisyenArama?page=1"
+        request = NetworkRequest("1", url, response=NetworkResponse(
+            200, mime_type="application/json", body=json.dumps({"d": {"html": html}})
+        ))
+        manager = FakeSeleniumManager()
+        manager.get_network_requests = lambda driver, pattern: [request]
+        profile_scraper.selenium_manager = manager
+        
+        page_source, page_url = await profile_scraper._wait_for_search_response(FakeDriver(), timeout=0)
+        assert page_url == url
+        rows = parse_profile_rows(page_source, page_url, profile_scraper.default_photo_url)
+        assert rows
+        assert rows == profile_scraper._extract_profile_from_request(request)
+
 class TestCollaboratorScraperTool:
     """CollaboratorScraperTool test sınıfı"""
     
@@ -57,6 +80,37 @@ class TestCollaboratorScraperTool:
         url = await collaborator_scraper._get_profile_url_by_id("test_session", 3)
         assert url is None
 
+    @pytest.mark.asyncio
+    async def test_extract_graph_collaborators(self, collaborator_scraper):
+        """Grafik veri setinden işbirlikçi çıkarma testi"""
+        graph = {
+            "nodes": [
+                {"index": 0, "name": "MERKEZ", "href": "https://example.com/center"},
+                {"index": 1, "name": "B", "href": "https://example.com/b"},
+                {"index": 2, "name": "C", "href": ""}
+            ],
+            "edges": [
+                {"source": 0, "target": 1, "weight": 3},
+                {"source": 2, "target": 0, "weight": 1},
+                {"source": 1, "target": 2, "weight": 5}
+            ]
+        }
+        collaborator_scraper.selenium_manager.execute_script_safe = AsyncMock(return_value=graph)
+        
+        result, graph = await collaborator_scraper._extract_graph_collaborators(None, "https://example.com/center")
+        assert result == [
+            {"name": "B", "href": "https://example.com/b", "weight": 3},
+            {"name": "C", "href": "", "weight": 1}
+        ]
+        # Linksiz düğümlerin kenarları grafiğe alınmaz
+        assert graph == {
+            "profile_url": "https://example.com/center",
+            "profile_name": "MERKEZ",
+            "edges": [{"source": "https://example.com/center", "target": "https://example.com/b", "weight": 3}]
+        }
+        # Tek script çağrısı yeterli olmalı
+        assert collaborator_scraper.selenium_manager.execute_script_safe.await_count == 1
+
 class TestSchemas:
     """Pydantic modelleri test sınıfı"""
     
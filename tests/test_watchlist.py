@@ -0,0 +1,164 @@
+"""
+Watchlist zamanlama ve fark testleri
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.tools.profile_scraper import ProfileScraperTool
+from src.tools.watchlist_runner import WatchlistRunner
+from src.utils.file_manager import FileManager
+from src.utils.watchlist import CronSchedule, diff_snapshots, in_window, parse_window
+from tests.conftest import FakeSeleniumManager
+
+
+class TestCronSchedule:
+    @pytest.mark.parametrize("expression, expected", [
+        ("*/15 * * * *", datetime(2026, 10, 19, 10, 15)),
+        ("0 3 * * 1", datetime(2026, 10, 26, 3, 0)),
+        ("@daily", datetime(2026, 10, 20, 0, 0)),
+        ("30 2 1 * 7", datetime(2026, 10, 25, 2, 30)),
+        ("0 0 29 2 *", datetime(2028, 2, 29, 0, 0)),
+        ("5-10/5 9-17 * 1,6 *", datetime(2027, 1, 1, 9, 5)),
+    ])
+    def test_next_after(self, expression, expected):
+        # 19 Ekim 2026 Pazartesi
+        assert CronSchedule(expression).next_after(datetime(2026, 10, 19, 10, 7)) == expected
+
+    @pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "0 0 31 2 *", "*/0 * * * *"])
+    def test_invalid(self, expression):
+        with pytest.raises(ValueError):
+            CronSchedule(expression).next_after(datetime(2026, 1, 1))
+
+    def test_window_across_midnight(self):
+        window = parse_window("22:00-05:30")
+        assert in_window(window, datetime(2026, 1, 1, 23, 0))
+        assert in_window(window, datetime(2026, 1, 1, 5, 0))
+        assert not in_window(window, datetime(2026, 1, 1, 12, 0))
+        assert in_window(parse_window("*"), datetime(2026, 1, 1, 12, 0))
+
+
+def test_diff_snapshots():
+    old = {
+        "profiles": {"a": {"title": "DR"}, "b": {"title": "DOÇ"}},
+        "collaborators": {"a": [{"url": "x"}, {"url": "y"}]},
+    }
+    new = {
+        "profiles": {"a": {"title": "PROF"}, "c": {"title": "DR"}},
+        "collaborators": {"a": [{"url": "y"}, {"url": "z"}], "c": [{"url": "x"}]},
+    }
+    diff = diff_snapshots(old, new)
+    assert diff["profiles_added"] == ["c"]
+    assert diff["profiles_removed"] == ["b"]
+    assert diff["profiles_changed"] == {"a": {"title": ["DR", "PROF"]}}
+    assert diff["collaborators"] == {"a": {"added": [{"url": "z"}], "removed": [{"url": "x"}]}}
+
+
+class _FakeRefresher:
+    def __init__(self):
+        self.titles = {}
+
+    async def refresh_profile(self, profile, now):
+        profile["title"] = self.titles.get(profile["url"], "DR")
+        return "changed"
+
+
+class _FakeProfileScraper:
+    async def search_and_wait(self, name, max_results=10, owner=None, discard=False):
+        return "session_x", [{"id": 1, "name": name, "url": "http://yok.test/ayse"}]
+
+
+class _FakeCollaboratorScraper:
+    def __init__(self):
+        self.collaborators = {"http://yok.test/ayse": ["http://yok.test/x"], "http://yok.test/mehmet": []}
+
+    async def fetch_collaborators(self, profile_url, session_id=None, operation="collaborators"):
+        return [{"name": url, "url": url, "weight": 1} for url in self.collaborators[profile_url]], {}
+
+
+class TestWatchlistRunner:
+    @pytest.fixture
+    def runner(self, tmp_path):
+        self.refresher = _FakeRefresher()
+        self.collaborator_scraper = _FakeCollaboratorScraper()
+        return WatchlistRunner(
+            FileManager(base_path=str(tmp_path)), self.refresher,
+            _FakeProfileScraper, lambda: self.collaborator_scraper, interval=0, window="01:00-05:00"
+        )
+
+    @pytest.mark.asyncio
+    async def test_runs_store_diff_against_previous_snapshot(self, runner):
+        saved = runner.save_watchlist("ekip", ["AYŞE KAYA", "http://yok.test/mehmet"], "0 3 * * *")
+        assert saved["success"]
+
+        first = await runner.run_watchlist("ekip")
+        assert first["baseline"] is True
+        assert first["diff"]["profiles_added"] == ["http://yok.test/ayse", "http://yok.test/mehmet"]
+
+        self.refresher.titles["http://yok.test/ayse"] = "PROF"
+        self.collaborator_scraper.collaborators["http://yok.test/ayse"] = ["http://yok.test/x", "http://yok.test/y"]
+        second = await runner.run_watchlist("ekip")
+        assert second["changed"] is True
+        assert second["diff"]["profiles_changed"] == {"http://yok.test/ayse": {"title": ["DR", "PROF"]}}
+        assert [item["url"] for item in second["diff"]["collaborators"]["http://yok.test/ayse"]["added"]] == [
+            "http://yok.test/y"
+        ]
+        # Boş dönen işbirlikçi listesi hata sayılır, fark üretmez
+        assert second["counts"]["collaborators_failed"] == 1
+
+        history = runner.history("ekip")["runs"]
+        assert [run["started_at"] for run in history] == [second["started_at"], first["started_at"]]
+        assert runner.list_watchlists()["watchlists"][0]["last_status"] == "changed"
+
+    @pytest.mark.asyncio
+    async def test_schedule_runs_only_inside_window(self, runner):
+        runner.save_watchlist("ekip", ["http://yok.test/ayse"], "0 3 * * *")
+        runner.store.update("ekip", next_run="2026-10-19T03:00:00")
+
+        assert await runner.run_due(datetime(2026, 10, 19, 12, 0)) == []
+        assert await runner.run_due(datetime(2026, 10, 20, 1, 30)) == ["ekip"]
+        assert runner.store.get("ekip")["next_run"] == "2026-10-20T03:00:00"
+        assert await runner.run_due(datetime(2026, 10, 20, 1, 31)) == []
+
+    def test_invalid_definitions(self, runner):
+        assert runner.save_watchlist("../x", ["a"], "@daily")["status"] == "failed"
+        assert runner.save_watchlist("ekip", [], "@daily")["status"] == "failed"
+        assert runner.save_watchlist("ekip", ["a"], "bad")["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_watchlists_belong_to_creating_client(self, runner):
+        runner.save_watchlist("ekip", ["http://yok.test/ayse"], "@daily", owner="c1")
+        denied = "bu istemciye ait değil"
+
+        assert runner.list_watchlists(owner="c2")["watchlists"] == []
+        assert denied in runner.save_watchlist("ekip", ["http://yok.test/x"], "@daily", owner="c2")["error"]
+        assert denied in runner.delete_watchlist("ekip", owner="c2")["error"]
+        assert denied in (await runner.run_watchlist("ekip", owner="c2"))["error"]
+        assert denied in runner.history("ekip", owner="c2")["error"]
+        assert runner.store.get("ekip")["entries"] == ["http://yok.test/ayse"]
+
+        # Sahibi ve zamanlayıcı (owner verilmez) erişebilir
+        assert [w["id"] for w in runner.list_watchlists(owner="c1")["watchlists"]] == ["ekip"]
+        assert (await runner.run_watchlist("ekip"))["success"]
+        assert runner.delete_watchlist("ekip", owner="c1")["success"]
+
+
+class TestWatchlistSearchSession:
+    @pytest.mark.asyncio
+    async def test_search_session_is_deleted_after_reading(self, tmp_path):
+        file_manager = FileManager(base_path=str(tmp_path))
+        saved = []
+        file_manager.add_save_listener(lambda session_id, kind: saved.append(kind))
+        scraper = ProfileScraperTool(selenium_manager=FakeSeleniumManager(), file_manager=file_manager)
+
+        async def scrape_profiles(driver, request, session_id, selected_field, selected_specialties):
+            profiles = [{"id": 1, "name": request.name, "url": "http://yok.test/ayse"}]
+            await file_manager.save_profiles(session_id, profiles)
+            return profiles
+
+        scraper._scrape_profiles = scrape_profiles
+        session_id, found = await scraper.search_and_wait("AYŞE KAYA", owner="watchlist", discard=True)
+        assert [profile["url"] for profile in found] == ["http://yok.test/ayse"]
+        assert not (tmp_path / "sessions" / session_id).exists()
+        assert saved[-1] == "deleted"